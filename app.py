@@ -2,7 +2,31 @@ import streamlit as st
 import pandas as pd
 import datetime
 import io
-import re
+import time
+
+from scheduler.blocks import split_block_cells
+from scheduler.classview import WIDE_SCHOOL, class_grade, class_window, group_classes_by_grade
+from scheduler.diagnosis import diagnose
+from scheduler.electives import block_electives, blocks_to_subject_rows, choices_from_frame, merge_block_rows
+from scheduler.exams import schedule_exams
+from scheduler.events import DEFAULT_EVENTS, compile_events
+from scheduler.eventlog import EventLog
+from scheduler.export import export_workbook
+from scheduler.metrics import (DEFAULT_MAX_DAILY, class_metrics_frame, quality_frames, quality_metrics,
+                               scorecard_frame, teacher_metrics_frame)
+from scheduler.history import EditJournal, cell_diffs
+from scheduler.importer import import_schedule_workbook
+from scheduler.model import BLOCK_PREFIX, WEEK_NAMES, ScheduleModel, cycle_days, day_structures
+from scheduler.rules import RULES_EXAMPLE, RuleError, compile_rules
+from scheduler.profiler import Profiler
+from scheduler.project import load_project, save_project
+from scheduler.scenarios import run_scenarios, time_structure_from_config
+from scheduler.shared_store import SharedStore
+from scheduler.solver import DEFAULT_SEED, cycle_periods, format_unassigned, lesson_demands, solve
+from scheduler.timestructure import build_time_structure, day_capacity, end_of_day
+from scheduler.teachers import TeacherRegistry, base_initials, duplicate_name_frame
+from scheduler.template import build_template_workbook, template_rows
+from scheduler.upload import read_template_workbook
 
 # ==========================================
 # 0. KONFIGURASI HALAMAN
@@ -15,6 +39,12 @@ st.markdown("by Glenn Bolang | [Support my work via Saweria](https://saweria.co/
 st.markdown("---") 
 
 # --- STATE MANAGEMENT ---
+RUN_STARTED = time.perf_counter()
+FULL_RUN = True  # False setelah skrip selesai; rerun fragmen melihat nilai ini
+if 'render_times' not in st.session_state: st.session_state['render_times'] = {}
+if 'profiler' not in st.session_state: st.session_state['profiler'] = Profiler()
+PROF = st.session_state['profiler']
+PROF.begin_run("halaman")
 if 'data_classes' not in st.session_state: st.session_state['data_classes'] = []
 if 'data_subjects' not in st.session_state: 
     st.session_state['data_subjects'] = pd.DataFrame(columns=[
@@ -22,8 +52,16 @@ if 'data_subjects' not in st.session_state:
         'Teacher Name', 'Teacher Initials', 'Periods/Week'
     ])
 if 'time_structure' not in st.session_state: st.session_state['time_structure'] = pd.DataFrame()
+if 'day_time_structures' not in st.session_state: st.session_state['day_time_structures'] = {}
 if 'manual_schedule' not in st.session_state: st.session_state['manual_schedule'] = {} 
 if 'selected_day_view' not in st.session_state: st.session_state['selected_day_view'] = 'Senin'
+if 'cycle_weeks' not in st.session_state: st.session_state['cycle_weeks'] = 1
+if 'rules_text' not in st.session_state: st.session_state['rules_text'] = RULES_EXAMPLE
+if 'events_text' not in st.session_state: st.session_state['events_text'] = DEFAULT_EVENTS
+if 'quality_max_daily' not in st.session_state: st.session_state['quality_max_daily'] = DEFAULT_MAX_DAILY
+if 'solver_seed' not in st.session_state: st.session_state['solver_seed'] = DEFAULT_SEED
+if 'edit_journal' not in st.session_state: st.session_state['edit_journal'] = EditJournal()
+if 'teacher_registry' not in st.session_state: st.session_state['teacher_registry'] = TeacherRegistry()
 
 # --- FUNGSI BANTUAN: GENERATE TEMPLATE KHUSUS ---
 def generate_custom_template(level):
@@ -35,56 +73,40 @@ def generate_custom_template(level):
     data = []
     for k in kelas_list:
         for _ in range(20):
-            data.append([k, "", "", "", 2]) 
-            
-    df = pd.DataFrame(data, columns=['Kelas', 'Mata Pelajaran', 'Inisial Mapel', 'Nama Lengkap Guru', 'Jam (JP)'])
+            data.append([k, "", "", "", 2, 1, None]) 
+    # Kolom Kelas & JP diberi dropdown/validasi langsung di Excel
+    return build_template_workbook(kelas_list, data)
+
+# --- FUNGSI BANTUAN: TEMPLATE DARI DATA YANG SUDAH DIUPLOAD ---
+def generate_current_template():
+    subjects = st.session_state['data_subjects']
+    return build_template_workbook(st.session_state['data_classes'], template_rows(subjects),
+                                   subjects['Subject Name'], subjects['Subject Code'], subjects['Teacher Name'],
+                                   st.session_state['rules_text'])
+
+# --- FUNGSI BANTUAN: EXPORT JADWAL UJIAN ---
+def generate_exam_workbook(result):
     output = io.BytesIO()
     with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        df.to_excel(writer, index=False, sheet_name='Data_Master')
+        result['schedule'].to_excel(writer, index=False, sheet_name='Jadwal Ujian')
+        result['rooms'].to_excel(writer, index=False, sheet_name='Pengawas per Ruang')
+        result['invigilators'].to_excel(writer, index=False, sheet_name='Beban Pengawas')
     return output.getvalue()
 
-# --- FUNGSI BANTUAN: AUTO GENERATE INISIAL GURU ---
-def create_initials(full_name):
-    if not isinstance(full_name, str) or not full_name.strip(): return "???"
-    parts = full_name.strip().split()
-    if len(parts) >= 2:
-        return (parts[0][0] + parts[1][:2]).upper()
-    elif len(parts) == 1:
-        return parts[0][:3].upper()
-    else:
-        return "???"
-
-# --- FUNGSI BANTUAN: DETEKSI KONFLIK ---
-def get_conflict_coordinates(df):
-    conflicts = set()
-    SAFE_LIST = ["UPACARA", "CHAPEL", "ISTIRAHAT", "BREAK", "RECESS", "NO CLASS", "P5", "FLAG CEREMONY", "DEVOTION", "SCOUT", "EXERCISE", "PRAMUKA"]
-
-    if not isinstance(df, pd.DataFrame): return conflicts
-
-    for idx, row in df.iterrows():
-        idx_str = str(idx).upper()
-        if "ISTIRAHAT" in idx_str or "BREAK" in idx_str or "RECESS" in idx_str: continue
-        if "RECESS" in str(row.values).upper(): continue
-
-        teacher_map = {} 
-        for col in df.columns:
-            if col == "Waktu": continue
-            val = row[col]
-            if isinstance(val, str) and val.strip():
-                if any(safe in val.upper() for safe in SAFE_LIST): continue
-                match = re.search(r'\((.*?)\)', val)
-                if match:
-                    code = match.group(1)
-                    if code not in teacher_map: teacher_map[code] = []
-                    teacher_map[code].append(col)
-        
-        for code, cols in teacher_map.items():
-            if len(cols) > 1:
-                for c in cols: conflicts.add((idx, c))
-    return conflicts
+# --- FUNGSI BANTUAN: TEMPLATE PILIHAN PEMINATAN ---
+def generate_elective_template():
+    df_pick = pd.DataFrame([["Siswa 1", "Kelas XI-1", "Fisika"], ["Siswa 1", "Kelas XI-1", "Ekonomi"]],
+                           columns=['Siswa', 'Kelas', 'Mapel'])
+    df_info = pd.DataFrame([["Fisika", "", 3], ["Ekonomi", "", 3]],
+                           columns=['Mata Pelajaran', 'Nama Lengkap Guru', 'Jam (JP)'])
+    output = io.BytesIO()
+    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+        df_pick.to_excel(writer, index=False, sheet_name='Pilihan')
+        df_info.to_excel(writer, index=False, sheet_name='Mapel')
+    return output.getvalue()
 
 # --- FUNGSI BANTUAN: CUSTOM STYLING (MERAH & KREM) ---
-def apply_custom_styles(df):
+def apply_custom_styles(df, rule_coords=None, block_coords=None, conflict_coords=()):
     # 1. Buat DataFrame kosong untuk menampung style CSS
     df_styler = pd.DataFrame('', index=df.index, columns=df.columns)
     
@@ -99,38 +121,252 @@ def apply_custom_styles(df):
                 # Cream Background, Black Font
                 df_styler.at[r, c] = 'background-color: #FFFDD0; color: black;'
 
-    # 3. Loop untuk mencari BENTROK -> Warna MERAH (Prioritas Tinggi, akan menimpa krem jika terjadi aneh)
-    coords = get_conflict_coordinates(df)
+    # 3. Sel yang melanggar ATURAN -> Warna ORANYE
+    for r, c in (rule_coords or {}):
+        if r in df_styler.index and c in df_styler.columns:
+            df_styler.at[r, c] = 'background-color: #fd7e14; color: white;'
+
+    # 4. Pelajaran blok yang TERPOTONG -> Warna UNGU
+    for r, c in (block_coords or set()):
+        if r in df_styler.index and c in df_styler.columns:
+            df_styler.at[r, c] = 'background-color: #6f42c1; color: white;'
+
+    # 5. Loop untuk mencari BENTROK -> Warna MERAH (Prioritas Tinggi, akan menimpa krem jika terjadi aneh)
+    # Koordinat bentrok berasal dari indeks model (id guru), bukan dari teks sel
+    coords = conflict_coords
     for r, c in coords:
         # Red Background, White Font, Bold
         df_styler.at[r, c] = 'background-color: #dc3545; color: white; font-weight: bold;'
         
     return df_styler
 
+# --- FUNGSI BANTUAN: GRID AWAL SATU HARI ---
+def init_day_frame(day):
+    # Kegiatan tetap (RECESS di break, UPACARA, ...) sudah diisi di model saat dibangun
+    return get_schedule_model().to_frame(day)
+
+# --- FUNGSI BANTUAN: SIKLUS MINGGU (A/B) ---
+def get_cycle_days():
+    # Semua hari dalam siklus aktif: DAYS untuk 1 minggu, "Senin A" ... "Jumat B" untuk 2 minggu
+    return cycle_days(st.session_state['cycle_weeks'])
+
+# --- FUNGSI BANTUAN: MODEL JADWAL (INDEKS BERSAMA) ---
+def get_schedule_model():
+    # Model integer dibangun sekali, lalu diperbarui per sel saat editor berubah
+    model = st.session_state.get('schedule_model')
+    if model is None:
+        with PROF.stage("build_model", kelas=len(st.session_state['data_classes']),
+                        hari=len(st.session_state['manual_schedule'])):
+            model = ScheduleModel.from_frames(
+                st.session_state['data_classes'],
+                st.session_state['time_structure'],
+                st.session_state['manual_schedule'],
+                get_cycle_days(),
+                st.session_state['day_time_structures']
+            )
+            model.register_teachers(st.session_state['data_subjects']['Teacher Initials'])
+            get_events()[0].apply(model)
+        st.session_state['schedule_model'] = model
+        # Grid dibangun ulang (struktur waktu/data mapel berubah): log mulai dari snapshot baru
+        log_epoch(model, "Grid baru")
+    return model
+
+# --- FUNGSI BANTUAN: MODE BERSAMA (SQLITE) ---
+def get_shared_store():
+    if not st.session_state.get('shared_mode'): return None
+    path = st.session_state.get('shared_db_path') or "jadwal_bersama.db"
+    store = st.session_state.get('shared_store')
+    if store is None or store.path != path:
+        store = SharedStore(path)
+        st.session_state['shared_store'] = store
+        st.session_state['shared_version'] = 0
+        st.session_state['cell_versions'] = {}
+    return store
+
+def is_fixed_cell(model, day, period, cls):
+    return bool(model.fixed[model.slot_index[(day, str(period))], model.class_ids[cls]])
+
+def pull_shared_changes(store, model):
+    # Tarik hanya sel yang berubah sejak versi terakhir yang dilihat sesi ini.
+    # Sel kegiatan tetap lokal tidak ditimpa (sama seperti editor), tetapi dilaporkan
+    rows, head = store.pull(st.session_state['shared_version'])
+    versions = st.session_state['cell_versions']
+    pulled, kept = [], st.session_state.setdefault('shared_fixed_kept', [])
+    for day, period, cls, value, version in rows:
+        versions[(day, period, cls)] = version
+        if (day, period) not in model.slot_index or cls not in model.class_ids: continue
+        if is_fixed_cell(model, day, period, cls):
+            if model.cell(model.slot_index[(day, period)], model.class_ids[cls]) != (value or ""):
+                kept.append((day, period, cls))
+            continue
+        old = model.set_cell(day, period, cls, value)
+        pulled.append((day, period, cls, model.labels[old] or None, value or None))
+    refresh_days(model, {d for d, _, _, _, _ in pulled})
+    log_cells(model, pulled, "Tarik bersama")
+    # Undo langkah lokal atas sel yang baru ditarik akan menimpa edit koordinator lain
+    st.session_state['edit_journal'].rebase(pulled)
+    st.session_state['shared_version'] = head
+
+def push_shared_changes(store, model, cells):
+    # cells: list of (slot, kelas). Compare-and-set per sel; sel yang kalah diganti nilai server
+    versions = st.session_state['cell_versions']
+    payload = []
+    for s, c in cells:
+        key = (model.days[model.slot_day[s]], model.slot_label[s], model.classes[c])
+        payload.append((*key, model.cell(s, c) or None, versions.get(key, 0)))
+    version, conflicts = store.commit_cells(payload, st.session_state.get('editor_name', ""))
+    lost = {(d, p, c) for d, p, c, _, _ in conflicts}
+    for d, p, c, _, _ in payload:
+        if (d, p, c) not in lost: versions[(d, p, c)] = version
+    reverted, kept = [], st.session_state.setdefault('shared_fixed_kept', [])
+    for d, p, c, value, server_version in conflicts:
+        versions[(d, p, c)] = server_version
+        if is_fixed_cell(model, d, p, c):
+            kept.append((d, p, c))
+            continue
+        old = model.set_cell(d, p, c, value)
+        reverted.append((d, p, c, model.labels[old] or None, value))
+    refresh_days(model, {d for d, _, _, _, _ in reverted})
+    log_cells(model, reverted, "Konflik bersama")
+    st.session_state['edit_journal'].rebase(reverted)
+    st.session_state['shared_conflicts'] = reverted
+
+# --- FUNGSI BANTUAN: LOG AUDIT ---
+def get_event_log():
+    if not st.session_state.get('audit_mode'): return None
+    path = st.session_state.get('audit_db_path') or "jadwal_log.db"
+    log = st.session_state.get('event_log')
+    if log is None or log.path != path:
+        log = EventLog(path)
+        st.session_state['event_log'] = log
+    return log
+
+def log_cells(model, cells, action):
+    # cells: list of (hari, jam, kelas, lama, baru) yang sudah diterapkan ke model
+    log = get_event_log()
+    if log and cells:
+        log.append(model, cells, st.session_state.get('editor_name', ""), action)
+
+def log_epoch(model, action):
+    # Grid diganti utuh (proyek, impor, struktur waktu): snapshot baru, bukan event per sel
+    log = get_event_log()
+    if log:
+        log.start_epoch(model, st.session_state.get('editor_name', ""), action)
+
+def restore_from_log(model, store, seq):
+    # Kembalikan grid ke keadaan event `seq`; hanya sel yang beda yang ditulis (bisa di-undo).
+    # Sel target yang tidak punya tempat di struktur sekarang (hari/jam/kelas lain) atau jatuh
+    # di sel kegiatan tetap tidak ditulis, tetapi dilaporkan
+    target = get_event_log().state_at(seq)
+    cells, skipped = [], []
+    for ts in range(target.n_slots):
+        key = (target.days[target.slot_day[ts]], target.slot_label[ts])
+        for tc, cls in enumerate(target.classes):
+            new = target.cell(ts, tc) or None
+            if key not in model.slot_index or cls not in model.class_ids:
+                if new: skipped.append((*key, cls))
+                continue
+            s, c = model.slot_index[key], model.class_ids[cls]
+            if (model.cell(s, c) or None) == new: continue
+            # Sel kegiatan tetap hanya berubah lewat "Terapkan Kegiatan Tetap"
+            if model.fixed[s, c]:
+                skipped.append((*key, cls))
+                continue
+            lid = model.intern(new)
+            cells.append((s, c, model.place(s, c, lid), lid))
+    st.session_state['restore_skipped'] = skipped
+    diffs = st.session_state['edit_journal'].record(model, cells, f"Pulihkan #{seq}")
+    log_cells(model, diffs, f"Pulihkan #{seq}")
+    refresh_days(model, sorted({d for d, _, _, _, _ in diffs or ()}, key=model.days.index))
+    if store and cells:
+        push_shared_changes(store, model, [(s, c) for s, c, _, _ in cells])
+
+# --- FUNGSI BANTUAN: UNDO / REDO ---
+def refresh_days(model, days):
+    # Tulis ulang frame hari yang berubah dan buang state editor lamanya
+    for d in days:
+        st.session_state['manual_schedule'][d] = model.to_frame(d)
+        for key in [k for k in st.session_state if str(k).startswith(f"editor_{d}_")]:
+            del st.session_state[key]
+
+def step_history(model, store, redo=False):
+    journal = st.session_state['edit_journal']
+    step = journal.redo(model) if redo else journal.undo(model)
+    if not step: return
+    label, days, cells = step
+    refresh_days(model, days)
+    if redo:
+        log_cells(model, cells, f"Redo: {label}")
+    else:
+        log_cells(model, [(d, p, c, new, old) for d, p, c, old, new in reversed(cells)], f"Undo: {label}")
+    if store:
+        touched = [(model.slot_index[(d, p)], model.class_ids[c]) for d, p, c, _, _ in cells
+                   if (d, p) in model.slot_index and c in model.class_ids]
+        push_shared_changes(store, model, touched)
+
+# --- FUNGSI BANTUAN: ATURAN JADWAL ---
+def get_rules():
+    text = st.session_state['rules_text']
+    cached = st.session_state.get('rules_compiled')
+    if cached is None or cached[0] != text:
+        try:
+            cached = (text, compile_rules(text), None)
+        except RuleError as e:
+            cached = (text, compile_rules(""), str(e))
+        st.session_state['rules_compiled'] = cached
+    return cached[1], cached[2]
+
+# --- FUNGSI BANTUAN: KEGIATAN TETAP ---
+def get_events():
+    text = st.session_state['events_text']
+    cached = st.session_state.get('events_compiled')
+    if cached is None or cached[0] != text:
+        try:
+            cached = (text, compile_events(text), None)
+        except RuleError as e:
+            cached = (text, compile_events(DEFAULT_EVENTS), str(e))
+        st.session_state['events_compiled'] = cached
+    return cached[1], cached[2]
+
+def apply_fixed_events(model, store):
+    # Pasang ulang mask kegiatan tetap ke seluruh siklus sebagai satu langkah undo
+    before = model.fixed.copy()
+    changes = get_events()[0].apply(model)
+    diffs = st.session_state['edit_journal'].record(model, changes, "Kegiatan tetap", fixed_before=before)
+    log_cells(model, diffs, "Kegiatan tetap")
+    refresh_days(model, [d for d in model.days if d in st.session_state['manual_schedule']])
+    if store and changes:
+        push_shared_changes(store, model, [(s, c) for s, c, _, _ in changes])
+    return len(changes)
+
 # --- FUNGSI BANTUAN: HITUNG BEBAN GURU ---
 def calculate_teacher_load():
     if st.session_state['data_subjects'].empty: return pd.DataFrame()
     
-    df_target = st.session_state['data_subjects'].groupby('Teacher Initials').agg({
-        'Periods/Week': 'sum',
+    # Blok peminatan tercatat sekali per kelas peserta tapi diajar sekali per jam:
+    # ambil satu baris per blok lalu pecah inisial "BUD/SIT" per guru
+    df_subjects = st.session_state['data_subjects']
+    is_block = df_subjects['Subject Code'].astype(str).str.upper().str.startswith(BLOCK_PREFIX)
+    df_block = df_subjects[is_block].drop_duplicates(['Subject Code', 'Teacher Initials']).copy()
+    df_block['Teacher Initials'] = df_block['Teacher Initials'].astype(str).str.split('/')
+    df_all = pd.concat([df_subjects[~is_block], df_block.explode('Teacher Initials')])
+
+    # Agregasi per id guru di model (kode dari registri unik per orang)
+    model = get_schedule_model()
+    # Target dihitung per siklus (siklus A/B: JP/minggu x 2, atau kolom 'Jam per Siklus')
+    df_all = df_all.assign(tid=[model.teacher_id(code) for code in df_all['Teacher Initials'].astype(str)],
+                           **{'Target JP': cycle_periods(df_all, model.n_weeks)})
+    df_target = df_all.groupby('tid').agg({
+        'Teacher Initials': 'first',
+        'Target JP': 'sum',
         'Teacher Name': 'first'
-    }).reset_index()
-    df_target.rename(columns={'Periods/Week': 'Target JP'}, inplace=True)
+    })
     
-    actual_counts = {}
-    for day in st.session_state['manual_schedule']:
-        df_day = st.session_state['manual_schedule'][day]
-        for col in df_day.columns:
-            if col == "Waktu": continue
-            for cell in df_day[col]:
-                if isinstance(cell, str):
-                    match = re.search(r'\((.*?)\)', cell)
-                    if match:
-                        code = match.group(1)
-                        if code not in actual_counts: actual_counts[code] = 0
-                        actual_counts[code] += 1
+    # Hitungan JP terplot diambil dari indeks model (blok paralel dihitung sekali per jam)
+    actual_counts = model.teacher_slot.sum(axis=0)
                         
-    df_target['Terplot'] = df_target['Teacher Initials'].map(actual_counts).fillna(0).astype(int)
+    df_target['Terplot'] = actual_counts[df_target.index.to_numpy()].astype(int)
+    df_target = df_target.reset_index()
     df_target['Sisa'] = df_target['Target JP'] - df_target['Terplot']
     
     def get_status(row):
@@ -139,7 +375,254 @@ def calculate_teacher_load():
         else: return f"🔴 Lebih {abs(row['Sisa'])}"
         
     df_target['Status'] = df_target.apply(get_status, axis=1)
-    return df_target[['Teacher Initials', 'Teacher Name', 'Target JP', 'Terplot', 'Status']]
+    week_cols = []
+    if model.n_weeks > 1:
+        # Sebaran JP terplot per minggu siklus
+        per_week = model.teacher_week_counts()
+        for w in range(model.n_weeks):
+            week_cols.append(f"Minggu {WEEK_NAMES[w]}")
+            df_target[week_cols[-1]] = per_week[df_target['tid'].to_numpy(), w]
+    return df_target[['Teacher Initials', 'Teacher Name', 'Target JP', 'Terplot', *week_cols, 'Status']]
+
+# ==========================================
+# AREA JADWAL (FRAGMEN)
+# ==========================================
+# Edit di dropdown hanya menjalankan ulang fragmen ini (layar pantau, editor,
+# beban guru), bukan seluruh halaman. Edit dari state data_editor diterapkan
+# di awal fragmen sehingga tidak perlu st.rerun() kedua.
+def commit_day_edit(day, model, store, edited_df):
+    changes = model.apply_frame(day, edited_df)
+    if model.fixed_rejected:
+        # Sel kegiatan tetap dikunci: kembalikan tampilan editor ke isi model
+        st.toast(f"🔒 {model.fixed_rejected} sel kegiatan tetap tidak bisa diubah di editor.")
+        refresh_days(model, [day])
+    if changes:
+        # edited_df bisa hanya sebagian kolom (tampilan per kelompok kelas)
+        full = st.session_state['manual_schedule'][day].copy()
+        full.loc[:, edited_df.columns] = edited_df.values
+        st.session_state['manual_schedule'][day] = full
+        log_cells(model, st.session_state['edit_journal'].record(model, changes, f"Edit {day}"), "Edit manual")
+        if store:
+            push_shared_changes(store, model, [(s, c) for s, c, _, _ in changes])
+    return changes
+
+def apply_pending_edits(day, model, store, editor_key):
+    state = st.session_state.get(editor_key)
+    if not state or not state.get('edited_rows'): return
+    edited = st.session_state['manual_schedule'][day].copy()
+    for row, values in state['edited_rows'].items():
+        for col, val in values.items():
+            if col in edited.columns:
+                edited.iat[int(row), edited.columns.get_loc(col)] = val
+    commit_day_edit(day, model, store, edited)
+
+# --- TAMPILAN SEBAGIAN KELAS (SEKOLAH BESAR) ---
+def choose_visible_classes(classes):
+    # Kembalikan (kelas yang tampil, id tampilan untuk key editor)
+    modes = ["Semua kelas", "Per tingkat", "Jendela geser"]
+    if 'view_mode' not in st.session_state:
+        st.session_state['view_mode'] = modes[1] if len(classes) > WIDE_SCHOOL else modes[0]
+    v1, v2, v3 = st.columns([2, 2, 2])
+    mode = v1.radio("Tampilan kelas", modes, key='view_mode', horizontal=True)
+    if mode == "Per tingkat":
+        groups = group_classes_by_grade(classes)
+        grade = v2.selectbox("Tingkat", list(groups), key='view_grade')
+        return groups[grade], f"g{grade}"
+    if mode == "Jendela geser":
+        size = v3.number_input("Jumlah kolom", min_value=5, max_value=max(len(classes), 5), value=min(20, len(classes)), step=5, key='view_size')
+        start = v2.number_input("Mulai dari kelas ke-", min_value=1, max_value=max(len(classes), 1), value=1, step=int(size), key='view_start')
+        return class_window(classes, start, size), f"w{start}-{size}"
+    return classes, "all"
+
+@st.fragment
+def schedule_workspace(day, model, rules, store):
+    started = time.perf_counter()
+    if not FULL_RUN: PROF.begin_run("fragmen")
+    all_classes = st.session_state['data_classes']
+    classes, view_id = choose_visible_classes(all_classes)
+    editor_key = f"editor_{day}_{view_id}"
+    cells_shape = dict(kelas=len(classes), jam=model.day_slots(day).stop - model.day_slots(day).start)
+    if store:
+        with PROF.stage("pull_shared_changes"):
+            pull_shared_changes(store, model)
+    with PROF.stage("apply_pending_edits", **cells_shape):
+        apply_pending_edits(day, model, store, editor_key)
+    # Hanya kolom yang tampil yang dikirim ke browser
+    current_df = st.session_state['manual_schedule'][day][['Waktu'] + classes].copy()
+    if st.session_state.get('shared_conflicts'):
+        st.warning("⚠️ Sel berikut sudah diubah koordinator lain dan tidak ditimpa: " + ", ".join(
+            f"{d} jam {p} {c}" for d, p, c, _, _ in st.session_state.pop('shared_conflicts')))
+    if st.session_state.get('shared_fixed_kept'):
+        st.warning("⚠️ Sel kegiatan tetap berikut diubah koordinator lain tetapi tetap dikunci di sini: " + ", ".join(
+            f"{d} jam {p} {c}" for d, p, c in st.session_state.pop('shared_fixed_kept')))
+
+    head_col, undo_col, redo_col = st.columns([4, 1, 1])
+    head_col.subheader(f"Editor Jadwal: {day}")
+    journal = st.session_state['edit_journal']
+    # Callback dijalankan sebelum fragmen digambar ulang, jadi tidak perlu st.rerun()
+    undo_col.button("↩️ Undo", disabled=not journal.can_undo, use_container_width=True,
+                    on_click=step_history, args=(model, store))
+    redo_col.button("↪️ Redo", disabled=not journal.can_redo, use_container_width=True,
+                    on_click=step_history, args=(model, store, True))
+    
+    # --- LAYAR PANTAU (READ ONLY) ---
+    st.info("💡 LAYAR PANTAU: Merah = Bentrok | Oranye = Melanggar Aturan | Ungu = Blok Terpotong | Krem = Sel Masih Kosong")
+    
+    # Terapkan styling: Merah untuk bentrok, Oranye untuk aturan, Ungu untuk blok terpotong, Krem untuk kosong
+    with PROF.stage("rules.violations", aturan=len(rules), **cells_shape):
+        rule_violations = rules.violations(model, day)
+    with PROF.stage("split_block_cells", baris_mapel=len(st.session_state['data_subjects'])):
+        demands = lesson_demands(model, st.session_state['data_subjects'])
+        split_blocks = {(r, c) for d, r, c in split_block_cells(model, demands) if d == day}
+    # Styler bersifat lazy: apply_custom_styles baru jalan saat st.dataframe men-serialisasi
+    # Bentrok dihitung dari indeks model untuk SEMUA kelas, lalu disaring ke kolom yang tampil
+    with PROF.stage("conflict_cells (indeks)", kelas=len(all_classes)):
+        all_conflicts = model.conflict_cells(day)
+    visible = set(classes)
+    conflicts = {(r, c) for r, c in all_conflicts if c in visible}
+    hidden_conflicts = len(all_conflicts) - len(conflicts)
+    if hidden_conflicts:
+        st.warning(f"⚠️ {hidden_conflicts} sel bentrok ada di kelas yang tidak ditampilkan.")
+    with PROF.stage("apply_custom_styles + layar pantau", **cells_shape):
+        st.dataframe(
+            current_df.style.apply(lambda _: apply_custom_styles(current_df, rule_violations, split_blocks, conflicts), axis=None),
+            use_container_width=True,
+            height=400
+        )
+    
+    st.caption("👆 Layar Pantau di atas hanya untuk melihat status. Silakan edit jadwal di tabel bawah 👇")
+
+    # --- EDITOR JADWAL ---
+    col_config = {}
+    col_config["Waktu"] = st.column_config.TextColumn("Pukul", width="small", disabled=True)
+
+    subjects_by_class = dict(tuple(st.session_state['data_subjects'].groupby('Class')))
+    for cls in classes:
+        subset = subjects_by_class.get(cls)
+        opts = [None, *dict.fromkeys(["UPACARA", "CHAPEL", "RECESS", "PRAMUKA", "OLAH RAGA", "DEVOTION",
+                                      *get_events()[0].labels()])]
+        if subset is not None:
+            for code, ini in zip(subset['Subject Code'], subset['Teacher Initials']):
+                opts.append(f"{code} ({ini})")
+        
+        # Lebar kolom 'small' agar muat banyak
+        col_config[cls] = st.column_config.SelectboxColumn(
+            label=cls, 
+            options=opts, 
+            width="small", 
+            required=False
+        )
+    
+    # Deteksi konflik untuk pesan warning (tambahan info)
+    if all_conflicts:
+        st.toast(f"⚠️ ADA {len(all_conflicts)} BENTROK JADWAL!", icon="🚨")
+    if split_blocks:
+        st.toast(f"⚠️ {len(split_blocks)} sel pelajaran blok terpotong!", icon="🧩")
+    if rule_violations:
+        with st.expander(f"⚠️ {len(rule_violations)} sel melanggar aturan"):
+            for (r, c), broken in rule_violations.items():
+                if c not in visible: continue
+                st.write(f"Jam {r} / {c}: " + "; ".join(broken))
+
+    with PROF.stage("data_editor", **cells_shape):
+        edited_df = st.data_editor(
+            current_df,
+            column_config=col_config,
+            use_container_width=True,
+            height=500,
+            key=editor_key
+        )
+
+    # Biasanya edit sudah diterapkan di awal fragmen; ini hanya cadangan
+    if not edited_df.equals(current_df):
+        commit_day_edit(day, model, store, edited_df)
+
+    # --- RIWAYAT PERUBAHAN (LOG AUDIT) ---
+    event_log = get_event_log()
+    if event_log:
+        with st.expander("📜 Riwayat Perubahan"):
+            f1, f2 = st.columns(2)
+            f_day = f1.selectbox("Hari", ["Semua"] + model.days, key='audit_day')
+            f_cls = f2.selectbox("Kelas", ["Semua"] + classes, key='audit_class')
+            history = event_log.events(day=None if f_day == "Semua" else f_day,
+                                       cls=None if f_cls == "Semua" else f_cls)
+            st.dataframe(history, use_container_width=True, hide_index=True, height=250)
+
+            r1, r2 = st.columns([2, 1])
+            seq = r1.number_input("Pulihkan jadwal ke keadaan setelah perubahan No.", min_value=0,
+                                  max_value=max(event_log.head(), 0), value=event_log.head(), step=1)
+            r2.button("⏪ Pulihkan", use_container_width=True, on_click=restore_from_log, args=(model, store, int(seq)))
+            if st.session_state.get('restore_skipped'):
+                st.warning("⚠️ Sel berikut tidak dipulihkan (hari/jam/kelasnya tidak ada di struktur sekarang "
+                           "atau terkunci kegiatan tetap): " +
+                           ", ".join(f"{d} jam {p} {c}" for d, p, c in st.session_state.pop('restore_skipped')))
+    
+    st.divider()
+
+    st.subheader("📊 Monitor Beban Mengajar (Real-Time)")
+    st.info("Status otomatis dihitung saat Anda menginput jadwal di atas.")
+    
+    with PROF.stage("calculate_teacher_load", baris_mapel=len(st.session_state['data_subjects'])):
+        df_load = calculate_teacher_load()
+    
+    if not df_load.empty:
+        def highlight_status(val):
+            color = ''
+            if 'LUNAS' in val: color = 'background-color: #d4edda; color: #155724' 
+            elif 'Kurang' in val: color = 'background-color: #fff3cd; color: #856404' 
+            elif 'Lebih' in val: color = 'background-color: #f8d7da; color: #721c24' 
+            return color
+
+        st.dataframe(
+            df_load.style.applymap(highlight_status, subset=['Status']),
+            use_container_width=True,
+            hide_index=True
+        )
+    else:
+        st.text("Belum ada data guru.")
+
+    # --- SKOR KUALITAS (LAPORAN YAYASAN) ---
+    st.subheader("🏅 Skor Kualitas Jadwal")
+    with PROF.stage("quality_metrics", kelas=len(all_classes)):
+        metrics = quality_metrics(model, st.session_state['quality_max_daily'])
+    score = scorecard_frame(model, metrics)
+    for col, row in zip(st.columns(len(score)), score.itertuples(index=False)):
+        col.metric(row.Metrik, row.Nilai, row.Keterangan, delta_color="off")
+    with st.expander("Rincian per Guru & per Kelas"):
+        st.number_input("Batas JP per hari (guru)", min_value=1, max_value=20, step=1, key='quality_max_daily')
+        names = dict(zip(st.session_state['data_subjects']['Teacher Initials'].astype(str),
+                         st.session_state['data_subjects']['Teacher Name']))
+        q1, q2 = st.columns([3, 2])
+        q1.dataframe(teacher_metrics_frame(model, metrics, names), use_container_width=True, hide_index=True, height=300)
+        q2.dataframe(class_metrics_frame(model, metrics), use_container_width=True, hide_index=True, height=300)
+
+    times = st.session_state['render_times']
+    times['editor'] = (time.perf_counter() - started) * 1000
+    st.caption(f"⏱️ Waktu server: area jadwal {times['editor']:.0f} ms · "
+               f"muat ulang halaman penuh terakhir {times.get('halaman', 0):.0f} ms")
+
+
+@st.fragment
+def export_panel():
+    st.divider()
+    
+    x1, x2 = st.columns(2)
+    teacher_sheets = x1.checkbox("Tambahkan sheet per guru", key='export_teacher_sheets')
+    class_sheets = x2.checkbox("Tambahkan sheet per kelas", key='export_class_sheets')
+    if st.button("💾 Export Semua Jadwal ke Excel", type="primary"):
+        if not FULL_RUN: PROF.begin_run("fragmen")
+        df_load = calculate_teacher_load()
+        days = [d for d in get_cycle_days() if d in st.session_state['manual_schedule']]
+        subjects = st.session_state['data_subjects']
+        names = dict(zip(subjects['Teacher Initials'].astype(str), subjects['Teacher Name']))
+        with PROF.stage("export openpyxl", hari=len(days), kelas=len(st.session_state['data_classes']),
+                        per_guru=teacher_sheets, per_kelas=class_sheets):
+            # Warna bentrok/kosong ditulis sebagai conditional formatting, bukan style per sel
+            model = get_schedule_model()
+            quality = quality_frames(model, st.session_state['quality_max_daily'], names)
+            data = export_workbook(model, days, df_load, teacher_sheets, class_sheets, names, quality)
+                
+        st.download_button("Klik untuk Download File", data, "Jadwal_Siap_Cetak.xlsx")
 
 # ==========================================
 # SIDEBAR NAVIGATION
@@ -149,9 +632,74 @@ with st.sidebar:
     menu = st.radio("Pilih Langkah:", [
         "1. Panduan & Upload Data", 
         "2. Setting Waktu & Break", 
-        "3. Input Jadwal (Visual)"
+        "3. Input Jadwal (Visual)",
+        "4. Jadwal Ujian"
     ])
 
+    # --- MODE BERSAMA ---
+    with st.expander("👥 Mode Bersama (Multi-Koordinator)"):
+        st.toggle("Aktifkan penyimpanan bersama", key='shared_mode')
+        st.text_input("File database bersama", value="jadwal_bersama.db", key='shared_db_path')
+        st.text_input("Nama Anda", key='editor_name')
+        st.caption("Setiap sel disimpan dengan nomor versi. Jika dua orang mengubah sel yang sama, "
+                   "perubahan yang datang belakangan ditolak dan sel diisi nilai terbaru.")
+
+    # --- LOG AUDIT ---
+    with st.expander("📜 Log Audit"):
+        st.toggle("Catat setiap perubahan jadwal", key='audit_mode')
+        st.text_input("File log", value="jadwal_log.db", key='audit_db_path')
+        st.caption("Log hanya ditambah (tidak pernah diubah). Snapshot disimpan tiap 500 perubahan "
+                   "sehingga keadaan jadwal di titik mana pun bisa dipulihkan dengan cepat.")
+
+    # --- PROFILER ---
+    with st.expander("🩺 Performa (Debug)"):
+        PROF.set_enabled(st.toggle("Rekam waktu & memori per tahap", key='profiler_on'))
+        if PROF.enabled and PROF.records:
+            st.caption("Rerun terakhir:")
+            st.dataframe(PROF.last_run(), hide_index=True, use_container_width=True)
+            st.caption(f"Persentil dari {len(PROF.records)} catatan terakhir:")
+            st.dataframe(PROF.summary(), hide_index=True, use_container_width=True)
+            st.download_button("⬇️ Unduh Data Profil (JSON)", PROF.to_json({
+                'kelas': len(st.session_state['data_classes']),
+                'baris_mapel': len(st.session_state['data_subjects']),
+                'hari_terisi': list(st.session_state['manual_schedule']),
+            }), "profil_performa.json", mime="application/json")
+            if st.button("Bersihkan Data Profil"):
+                PROF.clear()
+        elif PROF.enabled:
+            st.caption("Belum ada catatan. Lakukan sesuatu di aplikasi lalu buka panel ini lagi.")
+
+    # --- SIMPAN / BUKA PROYEK ---
+    st.divider()
+    with st.expander("💾 Simpan / Buka Proyek"):
+        ready = not st.session_state['data_subjects'].empty and not st.session_state['time_structure'].empty
+        if ready and st.button("📦 Siapkan File Proyek", use_container_width=True):
+            st.session_state['project_bytes'] = save_project(
+                get_schedule_model(), st.session_state['data_subjects'], st.session_state['time_structure'],
+                st.session_state['manual_schedule'], st.session_state['rules_text'], st.session_state['events_text'],
+                st.session_state['day_time_structures'], st.session_state['teacher_registry']
+            )
+        if st.session_state.get('project_bytes'):
+            st.download_button("⬇️ Unduh Proyek", st.session_state['project_bytes'], "Proyek_Jadwal.npz",
+                               use_container_width=True)
+
+        project_file = st.file_uploader("Buka File Proyek (.npz)", type=['npz'], key='project_upload')
+        if project_file and st.session_state.get('project_loaded_id') != project_file.file_id:
+            try:
+                project = load_project(project_file.getvalue())
+                st.session_state['schedule_model'] = project['model']
+                log_epoch(project['model'], "Buka proyek")
+                st.session_state['cycle_weeks'] = project['model'].n_weeks
+                st.session_state['edit_journal'].clear()
+                for key in ['data_subjects', 'data_classes', 'time_structure', 'day_time_structures',
+                            'manual_schedule', 'rules_text', 'events_text', 'teacher_registry']:
+                    st.session_state[key] = project[key]
+                st.session_state['project_loaded_id'] = project_file.file_id
+                st.session_state.pop('project_bytes', None)
+                st.success("✅ Proyek dimuat.")
+            except Exception as e:
+                st.error(f"Error: {e}")
+
 # ==========================================
 # MENU 1: PANDUAN & UPLOAD
 # ==========================================
@@ -166,12 +714,19 @@ if menu == "1. Panduan & Upload Data":
             * Unduh **Template Excel** (SMP atau SMA) di bawah.
             * Isi kolom **Kelas, Mata Pelajaran, dan Nama Guru**.
             * Kolom *Inisial Mapel* boleh dikosongkan (opsional).
+            * Kolom *Kelas* berupa dropdown; *Jam (JP)* dan *Blok (JP)* hanya menerima bilangan bulat.
+              Setelah upload, **Template dari Data Saat Ini** juga memberi dropdown mapel dan guru.
+            * Kolom *Blok (JP)* diisi 2 untuk praktikum/PJOK yang harus 2 JP berurutan.
             * **Upload** file yang sudah diisi ke sistem ini.
+            * Nama guru yang sama tetapi beda gelar/penulisan akan diusulkan untuk **digabung**.
         
         2.  **Pengaturan Waktu (Menu 2):**
             * Pindah ke Menu 2 di Sidebar sebelah kiri.
             * Tentukan jam masuk, durasi per jam pelajaran (JP), dan total JP per hari.
             * Atur waktu **Istirahat (Break)**.
+            * Untuk jadwal **minggu A/B**, isi *Siklus (Minggu)* = 2. Mapel dua mingguan cukup diberi
+              kolom *Jam per Siklus* di template (mis. 2 = dua JP dalam dua minggu).
+            * Hari dengan jam berbeda (Jumat pendek, Senin dengan upacara) diatur di tabel **Waktu Berbeda per Hari**.
             * Klik tombol **Simpan Struktur Waktu**.
         
         3.  **Penyusunan Jadwal (Menu 3):**
@@ -181,6 +736,8 @@ if menu == "1. Panduan & Upload Data":
             * **Layar Pantau (Atas)** akan berwarna:
                 * **MERAH**: Jika guru bentrok (mengajar ganda).
                 * **KREM**: Jika sel masih kosong (belum diisi).
+            * Upacara/Chapel/Pramuka/Istirahat diatur di **Kegiatan Tetap**; sel itu terkunci di editor.
+            * **Skor Kualitas** (jam kosong guru, hari > 6 JP, mapel berulang, jam terakhir) diperbarui setiap kali sel berubah dan ikut ter-export.
             * Unduh hasil akhir via tombol **Export Excel**.
         """)
 
@@ -193,47 +750,187 @@ if menu == "1. Panduan & Upload Data":
         st.download_button("⬇️ Unduh Template SMP", generate_custom_template('SMP'), "Template_SMP.xlsx")
     with c2:
         st.download_button("⬇️ Unduh Template SMA", generate_custom_template('SMA'), "Template_SMA.xlsx")
+    if not st.session_state['data_subjects'].empty:
+        st.download_button("⬇️ Unduh Template dari Data Saat Ini", generate_current_template(), "Template_Data_Saat_Ini.xlsx",
+                           help="Berisi data yang sudah diupload, dengan dropdown kelas, mapel dan guru dari data ini.")
 
     # --- BAGIAN UPLOAD ---
     uploaded_file = st.file_uploader("Upload File Template yang Sudah Diisi", type=['xlsx'])
     
     if uploaded_file:
         try:
-            df_up = pd.read_excel(uploaded_file)
-            expected_cols = ['Kelas', 'Mata Pelajaran', 'Inisial Mapel', 'Nama Lengkap Guru', 'Jam (JP)']
-            
-            if all(col in df_up.columns for col in expected_cols):
-                df_up = df_up.dropna(subset=['Kelas', 'Mata Pelajaran', 'Nama Lengkap Guru'])
-                df_up['Inisial Guru'] = df_up['Nama Lengkap Guru'].apply(create_initials)
-                
-                rename_map = {'Kelas': 'Class', 'Mata Pelajaran': 'Subject Name', 'Inisial Mapel': 'Subject Code', 
-                              'Nama Lengkap Guru': 'Teacher Name', 'Inisial Guru': 'Teacher Initials', 'Jam (JP)': 'Periods/Week'}
-                df_up = df_up.rename(columns=rename_map)
-                
-                df_up['Class'] = df_up['Class'].astype(str)
-                df_up['Periods/Week'] = df_up['Periods/Week'].astype(int)
-                
+            # Penggabungan nama yang sudah disetujui ikut diterapkan setiap kali file dibaca ulang
+            name_merges = st.session_state.setdefault('name_merges', {})
+            # Dibaca ulang hanya jika file atau daftar gabung nama berubah; rerun biasa tidak
+            # boleh menimpa blok peminatan yang sudah ditambahkan atau proyek yang baru dibuka
+            upload_key = (uploaded_file.file_id, tuple(sorted(name_merges.items())))
+            if st.session_state.get('upload_loaded_key') != upload_key:
+                with PROF.stage("read_excel", bytes=uploaded_file.size):
+                    # Registri sesi: guru lama tetap memegang kode yang sudah tersimpan di sel jadwal
+                    df_up, rules_text = read_template_workbook(uploaded_file, name_merges,
+                                                               st.session_state['teacher_registry'])
+
                 st.session_state['data_subjects'] = df_up
                 st.session_state['data_classes'] = sorted(df_up['Class'].unique().tolist())
-                
-                st.success(f"✅ Data Berhasil Dimuat! ({len(df_up)} Baris)")
-                st.info("Inisial guru berhasil digenerate otomatis.")
-                st.dataframe(df_up.head(3))
-            else:
-                st.error("Format kolom salah! Gunakan template yang disediakan.")
+                st.session_state['upload_subjects'] = df_up
+                st.session_state['upload_loaded_key'] = upload_key
+                st.session_state.pop('schedule_model', None)
+                if rules_text is not None:
+                    st.session_state['rules_text'] = rules_text
+            df_up = st.session_state['upload_subjects']
+
+            st.success(f"✅ Data Berhasil Dimuat! ({len(df_up)} Baris)")
+            st.info("Inisial guru berhasil digenerate otomatis.")
+            renamed = df_up.drop_duplicates('Teacher ID')
+            renamed = renamed[renamed['Teacher Initials'] != renamed['Teacher Name'].map(base_initials)]
+            if not renamed.empty:
+                st.warning(f"⚠️ {len(renamed)} guru punya inisial yang sama dengan guru lain; kodenya dibedakan:")
+                st.dataframe(renamed[['Teacher Name', 'Teacher Initials']], hide_index=True)
+
+            with PROF.stage("dedupe_nama", names=df_up['Teacher Name'].nunique()):
+                df_dup = duplicate_name_frame(df_up['Teacher Name'])
+            if not df_dup.empty:
+                st.warning(f"⚠️ {len(df_dup)} nama guru kemungkinan orang yang sama dengan nama lain "
+                           "(beda gelar / huruf besar / salah ketik). Periksa lalu gabungkan:")
+                df_dup_edit = st.data_editor(
+                    df_dup, hide_index=True, use_container_width=True, key='dedupe_editor',
+                    disabled=['Nama di File', 'Kemiripan'],
+                    column_config={'Gabung ke': st.column_config.TextColumn(help="Nama yang dipakai setelah digabung")}
+                )
+                if st.button("🔗 Gabungkan Nama Terpilih", use_container_width=True):
+                    chosen = df_dup_edit[df_dup_edit['Gabung'] & (df_dup_edit['Gabung ke'].str.strip() != "")]
+                    name_merges.update(zip(chosen['Nama di File'], chosen['Gabung ke'].str.strip()))
+                    st.session_state.pop('dedupe_editor', None)
+                    st.session_state.pop('schedule_model', None)
+                    st.rerun()
+            if name_merges:
+                mc1, mc2 = st.columns([3, 1])
+                mc1.caption(f"🔗 {len(name_merges)} nama guru digabung ke nama kanonik.")
+                if mc2.button("↩️ Batalkan Gabung"):
+                    name_merges.clear()
+                    st.session_state.pop('schedule_model', None)
+                    st.rerun()
+            st.dataframe(df_up.head(3))
         except Exception as e:
             st.error(f"Error: {e}")
 
+    # --- BAGIAN IMPOR JADWAL DARI FILE EXPORT ---
+    st.divider()
+    st.subheader("📥 Impor Jadwal dari File Export (Opsional)")
+    with st.expander("Lanjutkan jadwal dari Jadwal_Siap_Cetak.xlsx"):
+        st.caption("Data mapel (langkah di atas) harus sudah diupload agar kode mapel & guru bisa divalidasi.")
+        schedule_file = st.file_uploader("Upload Jadwal_Siap_Cetak.xlsx", type=['xlsx'], key='schedule_import')
+        if schedule_file and st.button("📥 Impor ke Editor", use_container_width=True):
+            if st.session_state['data_subjects'].empty:
+                st.error("⛔ Upload data mapel terlebih dahulu.")
+            else:
+                try:
+                    imported = import_schedule_workbook(
+                        schedule_file, st.session_state['data_classes'],
+                        st.session_state['data_subjects'], st.session_state['time_structure'], get_events()[0]
+                    )
+                    st.session_state['schedule_model'] = imported['model']
+                    log_epoch(imported['model'], "Impor jadwal")
+                    st.session_state['cycle_weeks'] = imported['model'].n_weeks
+                    st.session_state['edit_journal'].clear()
+                    st.session_state['time_structure'] = imported['time_structure']
+                    st.session_state['day_time_structures'] = imported['day_time_structures']
+                    st.session_state['manual_schedule'] = imported['manual_schedule']
+                    st.success(f"✅ {len(imported['manual_schedule'])} hari berhasil diimpor. Lanjutkan di Menu 3.")
+                    if not imported['unknown'].empty:
+                        st.warning(f"⚠️ {len(imported['unknown'])} sel berisi kode yang tidak ada di data mapel:")
+                        st.dataframe(imported['unknown'], use_container_width=True, hide_index=True)
+                    if not imported['overwritten'].empty:
+                        st.warning(f"⚠️ {len(imported['overwritten'])} sel dari file jatuh di slot kegiatan tetap "
+                                   "dan diganti kegiatannya:")
+                        st.dataframe(imported['overwritten'], use_container_width=True, hide_index=True)
+                    if imported['renamed_sheets']:
+                        st.info("Sheet tanpa huruf minggu dibaca sebagai minggu A: " + ", ".join(
+                            f"{src} → {dst}" for src, dst in imported['renamed_sheets'].items()))
+                    if imported['skipped_sheets']:
+                        st.warning("Sheet berikut dilewati karena sheet minggu A-nya juga ada: " +
+                                   ", ".join(imported['skipped_sheets']))
+                    if imported['extra_classes']:
+                        st.warning(f"Kelas di file tapi tidak ada di data (diabaikan): {', '.join(imported['extra_classes'])}")
+                    if imported['missing_classes']:
+                        st.info(f"Kelas tanpa kolom di file (dibiarkan kosong): {', '.join(imported['missing_classes'])}")
+                except Exception as e:
+                    st.error(f"Error: {e}")
+
+    # --- BAGIAN PEMINATAN (OPSIONAL) ---
+    st.divider()
+    st.subheader("🧩 Peminatan / Blok Paralel (Opsional, SMA)")
+    with st.expander("Susun blok mapel peminatan dari pilihan siswa"):
+        st.markdown("""
+        * Sheet **Pilihan**: satu baris per pilihan (*Siswa, Kelas, Mapel*).
+        * Sheet **Mapel**: guru dan JP per mapel peminatan.
+        * Mapel yang dipilih siswa yang sama (atau diajar guru yang sama) tidak akan berada di blok yang sama.
+        """)
+        st.download_button("⬇️ Unduh Template Peminatan", generate_elective_template(), "Template_Peminatan.xlsx")
+        elective_file = st.file_uploader("Upload Pilihan Siswa", type=['xlsx'], key='elective_upload')
+        ec1, ec2 = st.columns(2)
+        max_blocks = ec1.number_input("Maksimal Blok (0 = otomatis)", 0, 26, 0)
+        block_tag = ec2.text_input("Penanda Blok (mis. XI-)", "")
+
+        if elective_file and st.button("🧩 Susun Blok", use_container_width=True):
+            try:
+                xls = pd.ExcelFile(elective_file)
+                choices = choices_from_frame(pd.read_excel(xls, sheet_name='Pilihan'))
+                df_info = None
+                if 'Mapel' in xls.sheet_names:
+                    df_info = pd.read_excel(xls, sheet_name='Mapel').rename(columns={
+                        'Mata Pelajaran': 'Mapel', 'Nama Lengkap Guru': 'Guru', 'Jam (JP)': 'JP'})
+                    df_info = df_info.dropna(subset=['Mapel'])
+                    # Pakai registri sesi agar guru yang sama mendapat kode yang sama
+                    registry = st.session_state['teacher_registry']
+                    ids = [registry.add(name) for name in df_info['Guru']]
+                    df_info['Inisial'] = [registry.codes[t] if t is not None else "???" for t in ids]
+                result = block_electives(choices, df_info, max_blocks or None, seed=int(st.session_state['solver_seed']))
+                st.session_state['elective_result'] = (result, block_tag)
+            except Exception as e:
+                st.error(f"Error: {e}")
+
+        if 'elective_result' in st.session_state:
+            result, block_tag = st.session_state['elective_result']
+            st.dataframe(pd.DataFrame([{
+                'Blok': f"{BLOCK_PREFIX}{block_tag}{b['Blok']}", 'Mapel': ", ".join(b['Mapel']),
+                'Guru': ", ".join(b['Guru']), 'Siswa': b['Siswa'], 'JP': b['JP'], 'Kelas': ", ".join(b['Kelas'])
+            } for b in result['blocks']]), use_container_width=True, hide_index=True)
+            if result['clashes']:
+                st.warning(f"⚠️ {result['clashes']} pilihan siswa masih bentrok dengan batas blok ini.")
+            if result['teacher_clash']:
+                st.warning("⚠️ Ada guru yang mengajar dua mapel di blok yang sama.")
+
+            if st.button("➕ Tambahkan Blok ke Data Mapel", use_container_width=True):
+                df_rows = blocks_to_subject_rows(result, block_tag)
+                # Kelas peserta harus ada di data mapel; salah ketik kelas tidak boleh menambah kelas baru
+                unknown = sorted(set(df_rows['Class']) - set(st.session_state['data_classes']))
+                if unknown:
+                    st.warning(f"⚠️ Kelas di file pilihan tidak ada di data mapel (dilewati): {', '.join(unknown)}")
+                    df_rows = df_rows[~df_rows['Class'].isin(unknown)]
+                if df_rows.empty:
+                    st.error("⛔ Tidak ada baris blok yang bisa ditambahkan. Upload data mapel terlebih dahulu.")
+                else:
+                    # Susun ulang dengan penanda yang sama menggantikan blok lama, bukan menggandakannya
+                    st.session_state['data_subjects'] = merge_block_rows(
+                        st.session_state['data_subjects'], df_rows, block_tag
+                    )
+                    st.session_state.pop('schedule_model', None)
+                    st.success(f"✅ {len(result['blocks'])} blok ditambahkan ({len(df_rows)} baris).")
+
 # ==========================================
 # MENU 2: SETTING WAKTU
 # ==========================================
 elif menu == "2. Setting Waktu & Break":
     st.header("⏰ Langkah 2: Setting Waktu")
     
-    c1, c2, c3 = st.columns(3)
+    c1, c2, c3, c4 = st.columns(4)
     start_time = c1.time_input("Jam Masuk", datetime.time(7,0))
     jp_dur = c2.number_input("Durasi 1 JP (Menit)", 35)
     total_jp = c3.number_input("Total JP Hari Ini", min_value=1, value=8)
+    weeks = c4.number_input("Siklus (Minggu)", 1, len(WEEK_NAMES), st.session_state['cycle_weeks'],
+                            help="2 = jadwal minggu A/B. Target JP dihitung per siklus (JP/minggu x jumlah minggu, "
+                                 "atau kolom 'Jam per Siklus' di template).")
     
     st.subheader("☕ Konfigurasi Istirahat")
     num_breaks = st.number_input("Jumlah Break", 0, 4, 2)
@@ -245,31 +942,92 @@ elif menu == "2. Setting Waktu & Break":
             dur = bc2.number_input(f"Durasi Break {i+1} (Menit)", 5, 60, (15 if i==0 else 30), key=f"bdur{i}")
             break_configs.append({'after': pos, 'duration': dur})
     
+    # --- WAKTU BERBEDA PER HARI ---
+    st.subheader("📅 Waktu Berbeda per Hari (Opsional)")
+    st.caption("Centang hari yang strukturnya berbeda, mis. Jumat lebih pendek atau Senin dengan blok upacara. "
+               "Break '0:30' = blok pembuka 30 menit sebelum jam ke-1 (isi dengan kegiatan tetap 'UPACARA at Senin break0').")
+    default_break = ", ".join(f"{b['after']}:{b['duration']}" for b in break_configs)
+    df_day_configs = st.session_state.get('day_time_configs')
+    if df_day_configs is None:
+        df_day_configs = pd.DataFrame([{'Hari': d, 'Beda': False, 'Jam Masuk': start_time.strftime('%H:%M'),
+                                        'Durasi JP': jp_dur, 'Total JP': total_jp, 'Break': default_break}
+                                       for d in cycle_days(1)])
+    df_day_configs = st.data_editor(
+        df_day_configs, hide_index=True, use_container_width=True, disabled=['Hari'], key='day_time_editor',
+        column_config={'Beda': st.column_config.CheckboxColumn("Beda", help="Pakai waktu baris ini untuk hari tersebut")}
+    )
+
     if st.button("💾 Simpan Struktur Waktu", use_container_width=True):
-        schedule = []
-        curr = datetime.datetime.combine(datetime.date.today(), start_time)
-        break_configs.sort(key=lambda x: x['after'])
-        
-        break_counter = 1
-        for i in range(1, total_jp+1):
-            end = curr + datetime.timedelta(minutes=jp_dur)
-            schedule.append({'Period': str(i), 'Type': 'Class', 'Waktu': f"{curr.strftime('%H:%M')} - {end.strftime('%H:%M')}"})
-            curr = end
-            
-            found = next((b for b in break_configs if b['after'] == i), None)
-            if found:
-                end_br = curr + datetime.timedelta(minutes=found['duration'])
-                schedule.append({'Period': f'BREAK {break_counter}', 'Type': 'BREAK', 'Waktu': f"{curr.strftime('%H:%M')} - {end_br.strftime('%H:%M')}"})
-                curr = end_br
-                break_counter += 1
-                
-        st.session_state['time_structure'] = pd.DataFrame(schedule)
-        st.session_state['manual_schedule'] = {} 
-        st.success("✅ Waktu tersimpan! Grid jadwal telah di-reset sesuai waktu baru.")
+        try:
+            # Break ganda di posisi yang sama ditolak, baik di struktur umum maupun per hari
+            time_df = build_time_structure(start_time, jp_dur, total_jp, break_configs)
+            day_times = {row['Hari']: time_structure_from_config(row)
+                         for row in df_day_configs.to_dict('records') if row['Beda']}
+        except Exception as e:
+            st.error(f"Struktur waktu tidak valid: {e}")
+        else:
+            st.session_state['time_structure'] = time_df
+            st.session_state['day_time_structures'] = day_times
+            st.session_state['day_time_configs'] = df_day_configs
+            st.session_state['cycle_weeks'] = int(weeks)
+            st.session_state['manual_schedule'] = {} 
+            st.session_state.pop('schedule_model', None)
+            st.session_state['edit_journal'].clear()
+            st.success("✅ Waktu tersimpan! Grid jadwal telah di-reset sesuai waktu baru.")
 
     if not st.session_state['time_structure'].empty:
+        # Kapasitas nyata per hari (sebelum kegiatan tetap), dari struktur masing-masing hari
+        structures = day_structures(cycle_days(1), st.session_state['time_structure'],
+                                    st.session_state['day_time_structures'])
+        df_capacity = pd.DataFrame([{'Hari': d, 'JP': day_capacity(df), 'Break': len(df) - day_capacity(df),
+                                     'Pulang': end_of_day(df)} for d, df in structures])
+        weekly = int(df_capacity['JP'].sum())
+        st.dataframe(df_capacity, use_container_width=True, hide_index=True)
+        subjects = st.session_state['data_subjects']
+        if not subjects.empty:
+            need = subjects.assign(JP=cycle_periods(subjects, st.session_state['cycle_weeks'])).groupby('Class')['JP'].sum()
+            over = need[need > weekly * st.session_state['cycle_weeks']]
+            if not over.empty:
+                st.warning(f"⚠️ Kapasitas {weekly} JP/minggu tidak cukup untuk: " +
+                           ", ".join(f"{c} ({n} JP)" for c, n in over.items()))
         with st.expander("Lihat Struktur Waktu"):
             st.dataframe(st.session_state['time_structure'])
+            for day, df in st.session_state['day_time_structures'].items():
+                st.write(f"**{day}**")
+                st.dataframe(df)
+
+    # --- MODE SKENARIO (WHAT-IF) ---
+    st.divider()
+    st.subheader("🔬 Bandingkan Skenario Waktu (What-If)")
+    st.caption("Uji beberapa struktur waktu sekaligus tanpa menghapus jadwal yang sedang disusun. "
+               "Kolom Break: 'setelah jam ke:menit', pisahkan dengan koma (mis. 4:15, 6:30).")
+    if 'scenario_configs' not in st.session_state:
+        st.session_state['scenario_configs'] = pd.DataFrame([
+            {'Nama': '8 JP x 35 menit', 'Jam Masuk': '07:00', 'Durasi JP': 35, 'Total JP': 8, 'Break': '4:15, 6:30', 'Minggu': 1},
+            {'Nama': '9 JP x 35 menit', 'Jam Masuk': '07:00', 'Durasi JP': 35, 'Total JP': 9, 'Break': '4:15, 7:30', 'Minggu': 1},
+            {'Nama': '8 JP x 40 menit', 'Jam Masuk': '07:00', 'Durasi JP': 40, 'Total JP': 8, 'Break': '4:15, 6:30', 'Minggu': 1},
+        ])
+    df_configs = st.data_editor(st.session_state['scenario_configs'], num_rows="dynamic",
+                                use_container_width=True, hide_index=True, key="scenario_editor")
+
+    if st.button("▶️ Jalankan & Bandingkan Skenario", use_container_width=True):
+        if st.session_state['data_subjects'].empty:
+            st.error("⛔ Upload data di Menu 1 terlebih dahulu.")
+        else:
+            st.session_state['scenario_configs'] = df_configs
+            configs = df_configs.dropna(subset=['Nama']).to_dict('records')
+            with st.spinner(f"Menyelesaikan {len(configs)} skenario secara paralel..."):
+                try:
+                    st.session_state['scenario_results'] = pd.DataFrame(run_scenarios(
+                        configs, st.session_state['data_classes'], st.session_state['data_subjects'],
+                        st.session_state['rules_text'], seed=st.session_state['solver_seed'],
+                        events_text=DEFAULT_EVENTS if get_events()[1] else st.session_state['events_text']
+                    ))
+                except Exception as e:
+                    st.error(f"Error: {e}")
+
+    if 'scenario_results' in st.session_state:
+        st.dataframe(st.session_state['scenario_results'], use_container_width=True, hide_index=True)
 
 # ==========================================
 # MENU 3: INPUT JADWAL
@@ -286,6 +1044,10 @@ elif menu == "3. Input Jadwal (Visual)":
         st.stop()
 
     # --- DAY SELECTOR ---
+    cycle = get_cycle_days()
+    week = ""
+    if st.session_state['cycle_weeks'] > 1:
+        week = st.radio("Minggu:", WEEK_NAMES[:st.session_state['cycle_weeks']], horizontal=True, key='selected_week')
     st.write("Pilih Hari:")
     day_cols = st.columns(5)
     days_data = [("Senin", "🔴"), ("Selasa", "🟠"), ("Rabu", "🟡"), ("Kamis", "🟢"), ("Jumat", "🔵")]
@@ -296,113 +1058,178 @@ elif menu == "3. Input Jadwal (Visual)":
             st.session_state['selected_day_view'] = day_name
             st.rerun()
 
-    day = st.session_state['selected_day_view']
+    day = f"{st.session_state['selected_day_view']} {week}".strip()
+    if day not in cycle: day = cycle[0]
     
     classes = st.session_state['data_classes']
-    time_df = st.session_state['time_structure']
-    periods = time_df['Period'].tolist()
+    model = get_schedule_model()
     
-    if day not in st.session_state['manual_schedule']:
-        cols = ['Waktu'] + classes
-        df_init = pd.DataFrame(index=periods, columns=cols)
-        time_map = dict(zip(time_df['Period'], time_df['Waktu']))
-        df_init['Waktu'] = df_init.index.map(time_map)
-        
-        for idx in periods:
-            if "BREAK" in str(idx).upper() or "ISTIRAHAT" in str(idx).upper():
-                df_init.loc[idx, classes] = "RECESS"
-        
-        st.session_state['manual_schedule'][day] = df_init
+    store = get_shared_store()
+    days_needed = cycle if store else [day]
+    for d in days_needed:
+        if d not in st.session_state['manual_schedule']:
+            df_init = init_day_frame(d)
+            st.session_state['manual_schedule'][d] = df_init
+            log_cells(model, cell_diffs(model, model.apply_frame(d, df_init)), "Grid awal")
+
+    if store:
+        sc1, sc2 = st.columns([3, 1])
+        sc1.caption(f"👥 Mode bersama aktif · versi database {st.session_state['shared_version']}")
+        if sc2.button("⬆️ Kirim Jadwal Lokal", use_container_width=True):
+            filled = [(int(s), int(c)) for s, c in zip(*model.grid.nonzero())]
+            push_shared_changes(store, model, filled)
+            st.rerun()
     
     current_df = st.session_state['manual_schedule'][day].copy()
 
     if not isinstance(current_df, pd.DataFrame):
          st.warning("Data korup, mereset...")
          del st.session_state['manual_schedule'][day]
+         st.session_state.pop('schedule_model', None)
          st.rerun()
 
-    st.subheader(f"Editor Jadwal: {day}")
-    
-    # --- LAYAR PANTAU (READ ONLY) ---
-    st.info("💡 LAYAR PANTAU: Merah = Bentrok | Krem = Sel Masih Kosong")
-    
-    # Terapkan styling: Merah untuk bentrok, Krem untuk kosong
-    st.dataframe(
-        current_df.style.apply(lambda _: apply_custom_styles(current_df), axis=None),
-        use_container_width=True,
-        height=400
-    )
-    
-    st.caption("👆 Layar Pantau di atas hanya untuk melihat status. Silakan edit jadwal di tabel bawah 👇")
-
-    # --- EDITOR JADWAL ---
-    col_config = {}
-    col_config["Waktu"] = st.column_config.TextColumn("Pukul", width="small", disabled=True)
+    # --- KEGIATAN TETAP ---
+    with st.expander("📌 Kegiatan Tetap (Upacara, Chapel, Pramuka, Istirahat)"):
+        events_text = st.text_area(
+            "Kegiatan tetap (satu per baris)", value=st.session_state['events_text'], height=130,
+            help="Format: LABEL at HARI JAM [for KELAS]. Contoh: UPACARA at Senin 1 | "
+                 "PRAMUKA at Jumat 7,8 for Kelas 7* | RECESS at * break"
+        )
+        if st.button("📌 Terapkan Kegiatan Tetap", use_container_width=True):
+            st.session_state['events_text'] = events_text
+            events, events_error = get_events()
+            if events_error:
+                st.error(f"Kegiatan tidak valid: {events_error}")
+            else:
+                n = apply_fixed_events(model, store)
+                st.success(f"✅ {len(events)} kegiatan terpasang ({n} sel berubah).")
+        st.caption(f"{int(model.fixed.sum())} sel terkunci sebagai kegiatan tetap: diisi otomatis, "
+                   "dilewati generator, dan tidak pernah dihitung bentrok.")
 
-    for cls in classes:
-        subset = st.session_state['data_subjects'][st.session_state['data_subjects']['Class'] == cls]
-        opts = [None, "UPACARA", "CHAPEL", "RECESS", "PRAMUKA", "OLAH RAGA", "DEVOTION"]
-        if not subset.empty:
-            for _, row in subset.iterrows():
-                opts.append(f"{row['Subject Code']} ({row['Teacher Initials']})")
-        
-        # Lebar kolom 'small' agar muat banyak
-        col_config[cls] = st.column_config.SelectboxColumn(
-            label=cls, 
-            options=opts, 
-            width="small", 
-            required=False
+    # --- ATURAN & GENERATOR OTOMATIS ---
+    with st.expander("⚙️ Aturan Jadwal & Generator Otomatis"):
+        st.session_state['rules_text'] = st.text_area(
+            "Aturan (satu per baris)", value=st.session_state['rules_text'], height=150,
+            help="Contoh: max consecutive * 2 | max daily teacher * 6 | only UPACARA at Senin 1 | forbid PJOK after break 2"
         )
-    
-    # Deteksi konflik untuk pesan warning (tambahan info)
-    conflicts = get_conflict_coordinates(current_df)
-    if conflicts:
-        st.toast(f"⚠️ ADA {len(conflicts)} BENTROK JADWAL!", icon="🚨")
-
-    edited_df = st.data_editor(
-        current_df,
-        column_config=col_config,
-        use_container_width=True,
-        height=500,
-        key=f"editor_{day}"
-    )
+        rules, rules_error = get_rules()
+        if rules_error:
+            st.error(f"Aturan tidak valid: {rules_error}")
+        else:
+            st.caption(f"{len(rules)} aturan aktif. Dipakai oleh layar pantau dan generator.")
 
-    if not edited_df.equals(current_df):
-        st.session_state['manual_schedule'][day] = edited_df
-        st.rerun() 
-    
-    st.divider()
+        g1, g2 = st.columns([1, 3])
+        g1.number_input("Seed generator", min_value=0, step=1, key='solver_seed',
+                        help="Seed sama + data sama = jadwal sama. Ganti seed untuk mencoba susunan lain.")
+        if g2.button("⚡ Isi Otomatis Sel Kosong", use_container_width=True):
+            seed = int(st.session_state['solver_seed'])
+            for d in cycle:
+                if d not in st.session_state['manual_schedule']:
+                    df_init = init_day_frame(d)
+                    st.session_state['manual_schedule'][d] = df_init
+                    log_cells(model, cell_diffs(model, model.apply_frame(d, df_init)), "Grid awal")
+            before = model.grid.copy()
+            with PROF.stage("solve", kelas=len(classes), baris_mapel=len(st.session_state['data_subjects'])):
+                unassigned = solve(model, st.session_state['data_subjects'], rules, seed=seed)
+            cells = st.session_state['edit_journal'].record_grid(model, before, f"Isi otomatis (seed {seed})")
+            log_cells(model, cells, f"Isi otomatis (seed {seed})")
+            refresh_days(model, cycle)
+            if store and cells:
+                push_shared_changes(store, model, [(model.slot_index[(d, p)], model.class_ids[c]) for d, p, c, _, _ in cells])
+            st.session_state['last_unassigned'] = unassigned
+            st.session_state['last_solve_seed'] = seed
+            st.session_state.pop('last_diagnosis', None)
+            st.rerun()
 
-    st.subheader("📊 Monitor Beban Mengajar (Real-Time)")
-    st.info("Status otomatis dihitung saat Anda menginput jadwal di atas.")
-    
-    df_load = calculate_teacher_load()
-    
-    if not df_load.empty:
-        def highlight_status(val):
-            color = ''
-            if 'LUNAS' in val: color = 'background-color: #d4edda; color: #155724' 
-            elif 'Kurang' in val: color = 'background-color: #fff3cd; color: #856404' 
-            elif 'Lebih' in val: color = 'background-color: #f8d7da; color: #721c24' 
-            return color
+        if 'last_solve_seed' in st.session_state:
+            st.caption(f"Isi otomatis terakhir memakai seed {st.session_state['last_solve_seed']}.")
 
-        st.dataframe(
-            df_load.style.applymap(highlight_status, subset=['Status']),
-            use_container_width=True,
-            hide_index=True
-        )
-    else:
-        st.text("Belum ada data guru.")
+        if st.session_state.get('last_unassigned'):
+            unassigned = st.session_state['last_unassigned']
+            st.error(f"⚠️ Gagal menjadwalkan {len(unassigned)} pelajaran karena slot penuh/bentrok.")
+            st.write(format_unassigned(unassigned))
 
-    st.divider()
-    
-    if st.button("💾 Export Semua Jadwal ke Excel", type="primary"):
-        out = io.BytesIO()
-        with pd.ExcelWriter(out, engine='xlsxwriter') as writer:
-            for d in ["Senin", "Selasa", "Rabu", "Kamis", "Jumat"]:
-                if d in st.session_state['manual_schedule']:
-                    st.session_state['manual_schedule'][d].to_excel(writer, sheet_name=d)
-            if not df_load.empty:
-                df_load.to_excel(writer, sheet_name="Analisis Beban", index=False)
-                
-        st.download_button("Klik untuk Download File", out.getvalue(), "Jadwal_Siap_Cetak.xlsx")
\ No newline at end of file
+            if st.button("🔍 Diagnosa Penyebab", use_container_width=True):
+                with st.spinner("Mencari inti konflik..."):
+                    st.session_state['last_diagnosis'] = diagnose(
+                        model, st.session_state['data_subjects'], rules, unassigned, time_budget=5.0,
+                        seed=st.session_state['last_solve_seed']
+                    )
+
+            diag = st.session_state.get('last_diagnosis')
+            if diag and diag['feasible']:
+                st.success("Instance sebenarnya bisa dijadwalkan. Coba jalankan generator dengan seed lain.")
+            elif diag:
+                st.warning(f"**Penyebab:** {diag['reason']}")
+                st.markdown(f"**Guru terlibat:** {', '.join(diag['teachers']) or '-'}  \n"
+                            f"**Kelas terlibat:** {', '.join(diag['classes']) or '-'}  \n"
+                            f"**Kegiatan tetap:** {', '.join(diag['events']) or '-'}")
+                st.write("Inti konflik (hapus/ubah salah satu agar jadwal bisa lengkap):")
+                st.write(diag['core'])
+                if not diag['minimal']:
+                    st.caption("Batas waktu tercapai; inti mungkin belum minimal.")
+
+    schedule_workspace(day, model, rules, store)
+    export_panel()
+    st.session_state['render_times']['halaman'] = (time.perf_counter() - RUN_STARTED) * 1000
+
+# ==========================================
+# MENU 4: JADWAL UJIAN
+# ==========================================
+elif menu == "4. Jadwal Ujian":
+    st.header("📝 Jadwal Ujian Akhir Semester")
+    st.caption("Memakai kelas & mapel dari Menu 1. Mapel yang diikuti kelas yang sama tidak akan diujikan "
+               "di sesi yang sama; setiap kelas ujian di ruangnya sendiri dengan pengawas dari daftar guru.")
+
+    if st.session_state['data_subjects'].empty:
+        st.error("⛔ Data Sekolah belum diupload. Silakan kembali ke Menu 1 untuk upload data.")
+        st.stop()
+
+    e1, e2, e3, e4 = st.columns(4)
+    exam_days = e1.number_input("Jumlah Hari Ujian", 1, 20, 5)
+    exam_sessions = e2.number_input("Sesi per Hari", 1, 6, 2)
+    exam_rooms = e3.number_input("Ruang Tersedia (0 = semua kelas)", 0, 500, 0)
+    per_room = e4.number_input("Pengawas per Ruang", 1, 3, 1)
+    g1, g2, g3 = st.columns(3)
+    per_grade = g1.checkbox("Satu naskah per tingkat (kelas setingkat ujian serentak)", value=True)
+    exclude_own = g2.checkbox("Guru tidak mengawas mapelnya sendiri", value=True)
+    max_per_day = g3.number_input("Maks. Tugas Mengawas per Hari", 1, 6, 2)
+
+    if st.button("📝 Susun Jadwal Ujian", type="primary", use_container_width=True):
+        # Beban mengajar per guru (JP per siklus) dipakai sebagai penentu seri saat membagi tugas
+        subjects = st.session_state['data_subjects']
+        load = (subjects.assign(**{'Teacher Initials': subjects['Teacher Initials'].astype(str).str.split('/'),
+                                   'JP': cycle_periods(subjects, st.session_state['cycle_weeks'])})
+                .explode('Teacher Initials'))
+        load = load[~load['Teacher Initials'].isin(["", "-", "???"])]
+        teacher_load = load.groupby('Teacher Initials')['JP'].sum().astype(int).to_dict()
+        with st.spinner("Mewarnai graf bentrok & membagi pengawas..."), \
+                PROF.stage("exam_schedule", baris_mapel=len(subjects)):
+            st.session_state['exam_result'] = schedule_exams(
+                subjects, teacher_load, exam_days, exam_sessions, exam_rooms or None, per_room,
+                group_of=class_grade if per_grade else None, exclude_own=exclude_own, max_per_day=max_per_day,
+                seed=int(st.session_state['solver_seed'])
+            )
+
+    result = st.session_state.get('exam_result')
+    if result:
+        m1, m2, m3, m4 = st.columns(4)
+        m1.metric("Naskah Ujian", result['papers'])
+        m2.metric("Sesi Terpakai", f"{result['sessions']} / {result['max_sessions']}")
+        m3.metric("Kelas Bentrok", result['clashes'])
+        m4.metric("Kekurangan Pengawas", result['shortage'])
+        if result['clashes']:
+            st.error("⚠️ Sesi tidak cukup: ada kelas yang mendapat dua ujian di sesi yang sama. "
+                     "Tambah hari/sesi atau gunakan satu naskah per tingkat.")
+        if result['over_rooms']:
+            st.warning(f"⚠️ {result['over_rooms']} kelas tidak mendapat ruang (ruang tersedia kurang).")
+        if result['shortage']:
+            st.warning("⚠️ Guru tidak cukup untuk semua ruang; naikkan batas tugas per hari atau kurangi pengawas per ruang.")
+        st.caption(f"Dihitung dalam {result['seconds']} detik (seed {result['seed']}).")
+        st.dataframe(result['schedule'], use_container_width=True, hide_index=True)
+        with st.expander("Pengawas per Ruang & Beban Pengawas"):
+            st.dataframe(result['rooms'], use_container_width=True, hide_index=True)
+            st.dataframe(result['invigilators'], use_container_width=True, hide_index=True)
+        st.download_button("💾 Export Jadwal Ujian ke Excel", generate_exam_workbook(result), "Jadwal_Ujian.xlsx")
+
+FULL_RUN = False
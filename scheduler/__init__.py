@@ -0,0 +1 @@
+"""Mesin penjadwalan (tanpa Streamlit) yang dipakai oleh app.py."""
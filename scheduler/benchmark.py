@@ -0,0 +1,231 @@
+import argparse
+import hashlib
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from scheduler.events import DEFAULT_EVENTS
+from scheduler.metrics import quality_metrics, quality_penalty
+from scheduler.rules import compile_rules
+from scheduler.scenarios import config_days, day_times_from_config, prepare_model, time_structure_from_config
+from scheduler.solver import lesson_demands, solve, week_excess
+from scheduler.upload import read_template_workbook
+
+# ==========================================
+# BENCHMARK REGRESI GENERATOR (HASIL EMAS)
+# ==========================================
+# Korpus (benchmarks/corpus.json) berisi sekolah sintetis (dibangkitkan dari
+# parameter + seed) dan sekolah nyata yang sudah dianonimkan (CSV
+# data_subjects). Setiap kasus diselesaikan dengan beberapa seed tetap, lalu
+# tingkat penempatan, skor penalti kualitas dan waktu hitung dibandingkan
+# dengan baseline tersimpan (benchmarks/baseline.json). Siklus A/B juga dicek
+# rata per minggu: JP/minggu yang menumpuk di satu minggu selalu regresi.
+#
+#   python -m scheduler.benchmark                  jalankan & bandingkan (exit 1 jika regresi)
+#   python -m scheduler.benchmark --update         tulis ulang baseline dari hasil sekarang
+#   python -m scheduler.benchmark --time           ikut cek waktu hitung (mesin yang sama dengan baseline)
+#   python -m scheduler.benchmark --anonymize Template.xlsx benchmarks/sekolah/smp_x.csv
+#
+# Karena generator deterministik per seed, hash grid juga disimpan: hash yang
+# berubah tanpa regresi berarti hasil berbeda tapi tidak lebih buruk.
+
+BENCH_DIR = Path(__file__).resolve().parent.parent / "benchmarks"
+CORPUS_FILE = BENCH_DIR / "corpus.json"
+BASELINE_FILE = BENCH_DIR / "baseline.json"
+DEFAULT_SEEDS = (0, 1, 2)
+# Batas regresi: penempatan turun > 0,5 poin persen, skor naik > 5%, dan (hanya
+# dengan --time, di mesin yang sama dengan baseline) waktu > 1,5x baseline (+50 ms)
+TOLERANCE = {'placement': 0.005, 'score': 0.05, 'time_ratio': 1.5, 'time_slack': 0.05}
+
+# (nama, kode, JP/minggu, panjang blok) ala kurikulum SMP/SMA
+SYNTHETIC_SUBJECTS = [
+    ("Matematika", "MTK", 5, 1), ("Bahasa Indonesia", "BIN", 4, 1), ("Bahasa Inggris", "BIG", 4, 1),
+    ("IPA", "IPA", 5, 2), ("IPS", "IPS", 4, 1), ("Pendidikan Agama", "PAI", 3, 1),
+    ("PPKn", "PKN", 2, 1), ("PJOK", "PJOK", 3, 2), ("Seni Budaya", "SBK", 2, 2),
+    ("Prakarya", "PRK", 2, 2), ("Informatika", "INF", 2, 1), ("Bahasa Daerah", "BJW", 2, 1),
+]
+MAX_TEACHER_LOAD = 24
+
+
+def synthetic_school(classes=9, grades=3, weeks=1, seed=0):
+    """data_subjects sekolah sintetis: kelas per tingkat, guru per mapel dengan beban <= 24 JP/minggu."""
+    rng = random.Random(seed)
+    per_grade = max(1, classes // grades)
+    class_names = [f"{7 + g}{chr(65 + k)}" for g in range(grades) for k in range(per_grade)]
+    rows = []
+    for name, code, jp, block in SYNTHETIC_SUBJECTS:
+        # Kelas dibagi berurutan ke guru mapel; urutan diacak agar guru mengajar lintas tingkat
+        order = class_names[:]
+        rng.shuffle(order)
+        per_teacher = max(1, MAX_TEACHER_LOAD // jp)
+        for i, cls in enumerate(order):
+            t = i // per_teacher + 1
+            rows.append({'Class': cls, 'Subject Name': name, 'Subject Code': code,
+                         'Teacher Name': f"Guru {code} {t}", 'Teacher Initials': f"{code}{t}",
+                         'Periods/Week': jp, 'Block Length': block})
+    df = pd.DataFrame(rows)
+    if weeks > 1:
+        # Bahasa Daerah dua mingguan: 2 JP per siklus, bukan 2 JP x jumlah minggu;
+        # mapel lain tanpa 'Periods/Cycle' sehingga wajib rata di setiap minggu
+        df['Periods/Cycle'] = None
+        df.loc[df['Subject Code'] == "BJW", 'Periods/Cycle'] = 2
+    return df.sort_values(['Class', 'Subject Code'], ignore_index=True)
+
+
+def anonymize_subjects(subjects, seed=0):
+    """Ganti nama & kode guru dengan nomor acak tetap; kelas, mapel dan JP dipertahankan.
+
+    Alias dibuat per inisial (unik per orang dari registri guru). Baris blok "BUD/SIT"
+    menjadi "T004/T011" dengan nama "Guru 004, Guru 011", sehingga guru blok tetap
+    orang yang sama dengan guru di baris mapel biasa.
+    """
+    parts = subjects['Teacher Initials'].astype(str).str.split("/").map(lambda p: [i.strip() for i in p])
+    codes = sorted({code for p in parts for code in p if code and code != "-"})
+    random.Random(seed).shuffle(codes)
+    alias = {code: i + 1 for i, code in enumerate(codes)}
+    df = subjects.copy()
+    df['Teacher Initials'] = ["/".join(f"T{alias[c]:03d}" for c in p if c in alias) or "-" for p in parts]
+    df['Teacher Name'] = [", ".join(f"Guru {alias[c]:03d}" for c in p if c in alias) or "-" for p in parts]
+    keep = ['Class', 'Subject Name', 'Subject Code', 'Teacher Name', 'Teacher Initials',
+            'Periods/Week', 'Block Length', 'Periods/Cycle']
+    return df[[c for c in keep if c in df.columns]]
+
+
+def load_corpus(path=CORPUS_FILE):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)['kasus']
+
+
+def case_subjects(case, base_dir=BENCH_DIR):
+    if 'sintetis' in case:
+        return synthetic_school(**case['sintetis'])
+    return pd.read_csv(base_dir / case['file'], dtype={'Class': str})
+
+
+def run_case(case, seed, subjects=None):
+    """Selesaikan satu kasus dengan satu seed; kembalikan hasil yang bisa dibandingkan."""
+    subjects = case_subjects(case) if subjects is None else subjects
+    config = case['waktu']
+    classes = sorted(subjects['Class'].astype(str).unique().tolist())
+    model = prepare_model(classes, subjects, time_structure_from_config(config), config_days(config),
+                          case.get('kegiatan', DEFAULT_EVENTS), day_times_from_config(config))
+    demands = lesson_demands(model, subjects)
+    need = sum(info['Need'] for info in demands.values())
+    rules = compile_rules(case.get('aturan', ""))
+
+    started = time.perf_counter()
+    unassigned = solve(model, subjects, rules, seed=seed)
+    seconds = time.perf_counter() - started
+
+    missing = sum(u['Missing'] for u in unassigned)
+    return {
+        'seed': seed,
+        'placement': round(1 - missing / need, 4) if need else 1.0,
+        'score': quality_penalty(quality_metrics(model)),
+        'week_excess': week_excess(model, demands),
+        'seconds': round(seconds, 4),
+        'hash': hashlib.sha256(model.grid.tobytes()).hexdigest()[:16],
+    }
+
+
+def run_benchmark(cases, seeds=DEFAULT_SEEDS):
+    """Hasil per kasus: rata-rata penempatan/skor, median waktu, hash per seed."""
+    results = {}
+    for case in cases:
+        subjects = case_subjects(case)
+        runs = [run_case(case, seed, subjects) for seed in seeds]
+        # Seed pertama diulang sekali: hash harus identik (generator deterministik)
+        repeat = run_case(case, seeds[0], subjects)
+        results[case['nama']] = {
+            'placement': round(statistics.mean(r['placement'] for r in runs), 4),
+            'score': round(statistics.mean(r['score'] for r in runs), 1),
+            'seconds': round(statistics.median(r['seconds'] for r in runs), 4),
+            'week_excess': max(r['week_excess'] for r in runs),
+            'hashes': {str(r['seed']): r['hash'] for r in runs},
+            'deterministic': repeat['hash'] == runs[0]['hash'],
+        }
+    return results
+
+
+def compare(results, baseline, tolerance=TOLERANCE, check_time=False):
+    """Daftar (kasus, status, keterangan); status 'REGRESI', 'BERUBAH', 'BARU' atau 'OK'.
+
+    Waktu hitung baseline bergantung mesin, jadi hanya dibandingkan jika `check_time`.
+    """
+    report = []
+    for name, res in results.items():
+        base = baseline.get(name)
+        if not res['deterministic']:
+            report.append((name, "REGRESI", "hasil berbeda untuk seed yang sama (tidak deterministik)"))
+            continue
+        if res.get('week_excess'):
+            report.append((name, "REGRESI", f"{res['week_excess']} JP menumpuk di satu minggu "
+                                            "(JP/minggu tidak rata antar minggu siklus)"))
+            continue
+        if base is None:
+            report.append((name, "BARU", f"belum ada baseline (penempatan {res['placement']:.2%}, "
+                                         f"skor {res['score']}, {res['seconds']:.3f}s)"))
+            continue
+        problems = []
+        if res['placement'] < base['placement'] - tolerance['placement']:
+            problems.append(f"penempatan {base['placement']:.2%} -> {res['placement']:.2%}")
+        if res['score'] > base['score'] * (1 + tolerance['score']):
+            problems.append(f"skor penalti {base['score']} -> {res['score']}")
+        if check_time and res['seconds'] > base['seconds'] * tolerance['time_ratio'] + tolerance['time_slack']:
+            problems.append(f"waktu {base['seconds']:.3f}s -> {res['seconds']:.3f}s")
+        if problems:
+            report.append((name, "REGRESI", "; ".join(problems)))
+        elif res['hashes'] != base.get('hashes'):
+            report.append((name, "BERUBAH", f"penempatan {res['placement']:.2%}, skor {res['score']} "
+                                            f"(baseline {base['placement']:.2%}, {base['score']})"))
+        else:
+            report.append((name, "OK", f"penempatan {res['placement']:.2%}, skor {res['score']}, "
+                                       f"{res['seconds']:.3f}s"))
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark regresi generator jadwal EDUNEXUS")
+    parser.add_argument("--update", action="store_true", help="tulis ulang baseline dari hasil sekarang")
+    parser.add_argument("--cases", help="nama kasus dipisah koma (default: semua)")
+    parser.add_argument("--seeds", default=",".join(map(str, DEFAULT_SEEDS)), help="daftar seed, mis. 0,1,2")
+    parser.add_argument("--time", action="store_true",
+                        help="anggap waktu hitung > 1,5x baseline sebagai regresi (baseline dari mesin yang sama)")
+    parser.add_argument("--anonymize", nargs=2, metavar=("TEMPLATE", "CSV"),
+                        help="anonimkan file template sekolah menjadi CSV korpus")
+    args = parser.parse_args(argv)
+
+    if args.anonymize:
+        subjects, _ = read_template_workbook(args.anonymize[0])
+        anonymize_subjects(subjects).to_csv(args.anonymize[1], index=False)
+        print(f"Tersimpan: {args.anonymize[1]}. Tambahkan ke {CORPUS_FILE.name} sebagai "
+              f'{{"nama": "...", "file": "sekolah/...", "waktu": {{...}}}}.')
+        return 0
+
+    cases = load_corpus()
+    if args.cases:
+        wanted = {c.strip() for c in args.cases.split(",")}
+        cases = [c for c in cases if c['nama'] in wanted]
+    seeds = [int(s) for s in args.seeds.split(",") if s.strip()]
+    results = run_benchmark(cases, seeds)
+
+    baseline = json.loads(BASELINE_FILE.read_text(encoding='utf-8')) if BASELINE_FILE.exists() else {}
+    report = compare(results, baseline, check_time=args.time)
+    for name, status, detail in report:
+        print(f"{status:<8} {name:<28} {detail}")
+
+    if args.update:
+        baseline.update(results)
+        BASELINE_FILE.write_text(json.dumps(baseline, indent=2, ensure_ascii=False) + "\n", encoding='utf-8')
+        print(f"Baseline diperbarui: {BASELINE_FILE}")
+        return 0
+    return 1 if any(status == "REGRESI" for _, status, _ in report) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
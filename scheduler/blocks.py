@@ -0,0 +1,69 @@
+import numpy as np
+
+# ==========================================
+# PELAJARAN BLOK (2+ JP BERURUTAN)
+# ==========================================
+# Setiap hari punya bitmask: bit ke-i = slot ke-i di hari itu. Blok sepanjang L
+# yang mulai di posisi p memakai mask ((1 << L) - 1) << p. Blok valid jika mask
+# itu tidak beririsan dengan break, sel kelas yang terisi, dan jam sibuk guru
+# -- satu operasi AND per kandidat posisi.
+
+
+def block_mask(length, start=0):
+    return ((1 << length) - 1) << start
+
+
+def day_busy_mask(model, d, c, lid):
+    busy = int(model.day_break_mask[d]) | int(model.class_busy[c, d])
+    for t in model.label_teachers[lid]:
+        busy |= int(model.teacher_busy[t, d])
+    return busy
+
+
+def block_starts(model, d, c, lid, length):
+    """Posisi awal (bit) di hari d tempat blok label lid sepanjang `length` muat."""
+    busy = day_busy_mask(model, d, c, lid)
+    n = int(model.day_offsets[d + 1] - model.day_offsets[d])
+    mask = block_mask(length)
+    return [p for p in range(n - length + 1) if not busy & (mask << p)]
+
+
+def place_block(model, d, start, c, lid, length, rules=None):
+    # Tempatkan sel satu per satu agar aturan per sel ikut dicek; batalkan jika gagal
+    base = int(model.day_offsets[d]) + start
+    for k in range(length):
+        s = base + k
+        if rules and not rules.allows(model, s, c, lid):
+            for j in range(k):
+                model.place(base + j, c, 0)
+            return False
+        model.place(s, c, lid)
+    return True
+
+
+def split_block_cells(model, demands):
+    """Sel pelajaran blok yang terpotong (kurang dari panjang blok atau lewat break).
+
+    `demands` adalah hasil lesson_demands(); sisa Need % Block boleh muncul
+    sekali sebagai potongan pendek.
+    """
+    coords = set()
+    for (c, lid), info in demands.items():
+        length = info.get('Block', 1)
+        if length <= 1: continue
+        leftover = info['Need'] % length
+        column = model.grid[:, c] == lid
+        for d in range(len(model.days)):
+            start, stop = int(model.day_offsets[d]), int(model.day_offsets[d + 1])
+            hits = np.flatnonzero(column[start:stop]) + start
+            if not len(hits): continue
+            # Pecah menjadi run berurutan
+            runs = np.split(hits, np.flatnonzero(np.diff(hits) != 1) + 1)
+            for run in runs:
+                if len(run) % length == 0: continue
+                if leftover and len(run) % length == leftover:
+                    leftover = 0
+                    continue
+                for s in run:
+                    coords.add((model.days[d], model.slot_label[s], model.classes[c]))
+    return coords
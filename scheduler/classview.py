@@ -0,0 +1,29 @@
+import re
+
+# ==========================================
+# TAMPILAN SEBAGIAN KELAS (SEKOLAH BESAR)
+# ==========================================
+# Editor Menu 3 hanya mengirim kolom kelas yang tampil ke browser. Sekolah
+# besar default ke tampilan per tingkat; "jendela geser" memotong daftar kelas
+# menjadi potongan berurutan dengan ukuran tetap.
+
+WIDE_SCHOOL = 40  # di atas jumlah kelas ini, default tampilan per tingkat
+
+
+def class_grade(cls):
+    # "Kelas 7A" -> "7", "X IPA 1" -> "X", "12-B" -> "12"
+    m = re.search(r'\d+|\b[IVX]+\b', str(cls))
+    return m.group(0) if m else "Lainnya"
+
+
+def group_classes_by_grade(classes):
+    """{tingkat: [kelas]} dengan urutan tingkat dan kelas sesuai kemunculan."""
+    groups = {}
+    for cls in classes:
+        groups.setdefault(class_grade(cls), []).append(cls)
+    return groups
+
+
+def class_window(classes, start, size):
+    # start dihitung dari 1 (seperti input "Mulai dari kelas ke-")
+    return list(classes[start - 1:start - 1 + size])
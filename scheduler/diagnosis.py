@@ -0,0 +1,193 @@
+import random
+import time
+
+import numpy as np
+
+from scheduler.model import WEEK_NAMES
+from scheduler.rules import RuleSet
+from scheduler.solver import lesson_demands, solve_demands
+
+# ==========================================
+# DIAGNOSA: INTI KONFLIK (MINIMAL INFEASIBLE SUBSET)
+# ==========================================
+# Instance dipecah menjadi "item" yang bisa dihapus satu per satu:
+#   - kebutuhan pelajaran   (kelas, label "MTK (BUD)", jumlah JP)
+#   - kegiatan tetap        (label UPACARA/RECESS/..., hari, kelas) beserta sel-selnya
+#   - aturan                (satu baris aturan terkompilasi)
+# Inti konflik dicari dengan deletion-based shrinking: sebuah kelompok item
+# dibuang jika sisanya TETAP tidak bisa dijadwalkan. Cek kelayakan memakai
+# hitungan kapasitas (cepat, pasti benar) lalu beberapa percobaan solver.
+
+
+class Item:
+    def __init__(self, kind, key, text, payload):
+        self.kind = kind          # 'lesson' | 'event' | 'rule'
+        self.key = key
+        self.text = text
+        self.payload = payload
+
+    def __repr__(self):
+        return f"Item({self.text!r})"
+
+
+def build_items(model, subjects, rules=None):
+    items = []
+    for (c, lid), info in lesson_demands(model, subjects).items():
+        text = f"{info['Class']}: {model.labels[lid]} ({info['Need']} JP)"
+        items.append(Item('lesson', (c, lid), text, info))
+
+    # Kegiatan tetap: sel non-mapel yang terisi di jam pelajaran
+    events = {}
+    for s in np.flatnonzero(~model.slot_break):
+        for c in np.flatnonzero(model.grid[s]):
+            lid = int(model.grid[s, c])
+            if model.label_teacher[lid] >= 0: continue
+            key = (lid, int(model.slot_day[s]), int(c))
+            events.setdefault(key, []).append((int(s), int(c)))
+    for (lid, d, c), cells in events.items():
+        text = f"{model.labels[lid]} {model.days[d]} - {model.classes[c]} ({len(cells)} JP)"
+        items.append(Item('event', (lid, d, c), text, cells))
+
+    for rule in (rules.rules if rules else []):
+        items.append(Item('rule', rule.text, f"Aturan: {rule.text}", rule))
+    return items
+
+
+# --- CEK KELAYAKAN ---
+def capacity_problem(model, items):
+    """Cek hitungan kapasitas; kembalikan alasan (str) atau None jika lolos."""
+    free = np.repeat(~model.slot_break[:, None], len(model.classes), axis=1)
+    for item in items:
+        if item.kind == 'event':
+            for s, c in item.payload:
+                free[s, c] = False
+
+    class_need, class_week_need = {}, {}
+    teacher_need, teacher_classes = {}, {}
+    for item in items:
+        if item.kind != 'lesson': continue
+        c, lid = item.key
+        need = item.payload['Need']
+        class_need[c] = class_need.get(c, 0) + need
+        class_week_need[c] = class_week_need.get(c, 0) + item.payload.get('Weekly', 0)
+        t = model.label_teacher[lid]
+        if t >= 0:
+            teacher_need[t] = teacher_need.get(t, 0) + need
+            teacher_classes.setdefault(t, set()).add(c)
+
+    class_free = free.sum(axis=0)
+    for c, need in class_need.items():
+        if need > class_free[c]:
+            return f"{model.classes[c]} butuh {need} JP, tetapi hanya tersedia {class_free[c]} slot kosong."
+    # Siklus A/B: JP/minggu harus muat di setiap minggu, bukan hanya di total siklus
+    slot_week = model.day_week[model.slot_day]
+    for c, need in class_week_need.items():
+        for w in range(model.n_weeks):
+            avail = int(free[slot_week == w, c].sum())
+            if need > avail:
+                return (f"{model.classes[c]} butuh {need} JP di minggu {WEEK_NAMES[w]}, "
+                        f"tetapi hanya tersedia {avail} slot kosong.")
+    for t, need in teacher_need.items():
+        avail = int(free[:, sorted(teacher_classes[t])].any(axis=1).sum())
+        if need > avail:
+            return f"Guru {model.teachers[t]} butuh {need} JP, tetapi hanya ada {avail} jam di mana kelasnya kosong."
+    return None
+
+
+def _solvable(model, items, attempts, rng):
+    # Mask kegiatan tetap dibangun ulang dari item yang tersisa: kegiatan yang
+    # dibuang dari inti harus benar-benar membebaskan slotnya
+    base = model.empty_like()
+    fixed = np.zeros_like(model.fixed)
+    for item in items:
+        if item.kind == 'event':
+            for s, c in item.payload:
+                base.place(s, c, item.key[0])
+                fixed[s, c] = True
+    base.set_fixed(fixed)
+    demands = {item.key: item.payload for item in items if item.kind == 'lesson'}
+    rules = RuleSet([item.payload for item in items if item.kind == 'rule'])
+    for _ in range(attempts):
+        if not solve_demands(base.copy(), demands, rules, rng):
+            return True
+    return False
+
+
+def is_infeasible(model, items, attempts=3, rng=None):
+    if capacity_problem(model, items): return True
+    return not _solvable(model, items, attempts, rng or random.Random(0))
+
+
+# --- PENYUSUTAN INTI ---
+def _relevant(model, items, seeds):
+    # Pangkas awal: hanya item yang menyentuh kelas/guru dari pelajaran `seeds`
+    classes = {i.key[0] for i in seeds}
+    teachers = {model.label_teacher[i.key[1]] for i in seeds} - {-1}
+    keep = []
+    for item in items:
+        if item.kind == 'event':
+            if any(c in classes for _, c in item.payload): keep.append(item)
+        elif item.kind == 'lesson':
+            c, lid = item.key
+            if c in classes or model.label_teacher[lid] in teachers: keep.append(item)
+        else:
+            keep.append(item)
+    return keep
+
+
+def diagnose(model, subjects, rules=None, unassigned=None, time_budget=5.0, attempts=3, seed=0):
+    """Cari himpunan kecil item yang bersama-sama membuat jadwal mustahil.
+
+    `model` dipakai sebagai sumber kegiatan tetap (sel non-mapel); sel mapel
+    yang sudah diisi manual tidak dikunci. Jika `unassigned` (hasil solver)
+    diberikan, pencarian dimulai dari kelas/guru yang gagal terplot.
+    Mengembalikan dict berisi inti konflik, guru, kelas, kegiatan, alasan,
+    dan apakah inti sudah minimal dalam batas waktu.
+    """
+    rng = random.Random(seed)
+    deadline = time.perf_counter() + time_budget
+    items = build_items(model, subjects, rules)
+
+    if not is_infeasible(model, items, attempts, rng):
+        return {'feasible': True, 'core': [], 'teachers': [], 'classes': [], 'events': [],
+                'reason': None, 'minimal': True, 'seed': seed}
+
+    core = items
+    if unassigned:
+        failed = {u['Class'] for u in unassigned}
+        seeds = [i for i in items if i.kind == 'lesson' and i.payload['Class'] in failed]
+        trial = _relevant(model, items, seeds)
+        if seeds and is_infeasible(model, trial, attempts, rng):
+            core = trial
+
+    # Deletion-based shrinking dengan ukuran potongan yang mengecil (n/2, n/4, ..., 1)
+    minimal = False
+    chunk = max(1, len(core) // 2)
+    while time.perf_counter() < deadline:
+        i, removed_any = 0, False
+        while i < len(core) and time.perf_counter() < deadline:
+            trial = core[:i] + core[i + chunk:]
+            if trial and is_infeasible(model, trial, attempts, rng):
+                core, removed_any = trial, True
+            else:
+                i += chunk
+        if chunk == 1 and not removed_any and i >= len(core):
+            minimal = True
+            break
+        chunk = max(1, chunk // 2)
+
+    teachers = sorted({model.teachers[model.label_teacher[i.key[1]]] for i in core
+                       if i.kind == 'lesson' and model.label_teacher[i.key[1]] >= 0})
+    classes = sorted({i.payload['Class'] for i in core if i.kind == 'lesson'})
+    reason = capacity_problem(model, core) or \
+        f"Generator tidak menemukan penempatan dalam {attempts} percobaan untuk kombinasi ini."
+    return {
+        'feasible': False,
+        'core': [i.text for i in core],
+        'teachers': teachers,
+        'classes': classes,
+        'events': [i.text for i in core if i.kind == 'event'],
+        'reason': reason,
+        'minimal': minimal,
+        'seed': seed,
+    }
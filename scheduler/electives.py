@@ -0,0 +1,221 @@
+import random
+import re
+import string
+import time
+
+import numpy as np
+import pandas as pd
+
+from scheduler.model import BLOCK_PREFIX
+
+# ==========================================
+# PENGELOMPOKAN MAPEL PEMINATAN KE BLOK PARALEL
+# ==========================================
+# Mapel peminatan = simpul graf. Dua mapel bertetangga jika ada siswa yang
+# memilih keduanya (bobot = jumlah siswa bersama) atau diajar guru yang sama.
+# Pewarnaan graf = pembagian ke blok: mapel dalam satu blok berjalan paralel.
+# Pewarnaan awal memakai DSATUR, lalu TabuCol mencoba mengurangi jumlah blok.
+
+HARD_WEIGHT = 10 ** 6   # bobot sisi "guru sama" (tidak boleh satu blok)
+
+
+def choices_from_frame(df):
+    """Baca pilihan siswa: format panjang (Siswa, Kelas, Mapel) atau lebar (Pilihan 1..n)."""
+    if 'Mapel' in df.columns:
+        long = df[['Siswa', 'Kelas', 'Mapel']].dropna()
+    else:
+        pick_cols = [c for c in df.columns if str(c).startswith('Pilihan')]
+        long = df.melt(id_vars=['Siswa', 'Kelas'], value_vars=pick_cols, value_name='Mapel').dropna(subset=['Mapel'])
+    long = long.astype({'Siswa': str, 'Kelas': str, 'Mapel': str})
+    long['Mapel'] = long['Mapel'].str.strip()
+    return long[['Siswa', 'Kelas', 'Mapel']].drop_duplicates()
+
+
+def build_clash_graph(choices, teacher_of=None):
+    """Matriks bobot W[i, j] = jumlah siswa yang memilih mapel i dan j."""
+    electives = sorted(choices['Mapel'].unique())
+    students = choices['Siswa'].unique()
+    e_idx = pd.Index(electives).get_indexer(choices['Mapel'])
+    s_idx = pd.Index(students).get_indexer(choices['Siswa'])
+    incidence = np.zeros((len(students), len(electives)), dtype=np.int32)
+    incidence[s_idx, e_idx] = 1
+    weights = incidence.T @ incidence
+    enrolment = np.diag(weights).copy()
+    np.fill_diagonal(weights, 0)
+
+    if teacher_of:
+        teachers = [teacher_of.get(e) for e in electives]
+        for i in range(len(electives)):
+            for j in range(i + 1, len(electives)):
+                if teachers[i] and teachers[i] == teachers[j]:
+                    weights[i, j] = weights[j, i] = HARD_WEIGHT
+    return electives, weights, enrolment
+
+
+# --- PEWARNAAN ---
+def dsatur(weights):
+    n = len(weights)
+    adj = weights > 0
+    colors = np.full(n, -1, dtype=np.int32)
+    neighbour_colors = [set() for _ in range(n)]
+    degree = weights.sum(axis=1)
+    for _ in range(n):
+        # Simpul belum berwarna dengan saturasi terbesar, seri -> bobot derajat terbesar
+        v = max((i for i in range(n) if colors[i] < 0),
+                key=lambda i: (len(neighbour_colors[i]), degree[i]))
+        color = 0
+        while color in neighbour_colors[v]:
+            color += 1
+        colors[v] = color
+        for u in np.flatnonzero(adj[v]):
+            neighbour_colors[u].add(color)
+    return colors
+
+
+def clash_cost(weights, colors):
+    same = colors[:, None] == colors[None, :]
+    return int((weights * same).sum() // 2)
+
+
+def tabucol(weights, colors, k, deadline, rng, max_iter=20000):
+    """Perbaiki pewarnaan k warna dengan tabu search; kembalikan (warna terbaik, biaya)."""
+    n = len(weights)
+    colors = colors.copy()
+    # gamma[v, c] = total bobot tetangga v yang berwarna c
+    gamma = np.zeros((n, k), dtype=np.int64)
+    for c in range(k):
+        gamma[:, c] = weights[:, colors == c].sum(axis=1)
+    cost = clash_cost(weights, colors)
+    best, best_cost = colors.copy(), cost
+    tabu = np.zeros((n, k), dtype=np.int64)
+
+    it = 0
+    while best_cost > 0 and it < max_iter and time.perf_counter() < deadline:
+        it += 1
+        own = gamma[np.arange(n), colors]
+        conflicted = np.flatnonzero(own > 0)
+        if not len(conflicted): break
+        delta = gamma[conflicted] - own[conflicted, None]
+        delta[np.arange(len(conflicted)), colors[conflicted]] = np.iinfo(np.int64).max
+        allowed = (tabu[conflicted] <= it) | (cost + delta < best_cost)
+        delta = np.where(allowed, delta, np.iinfo(np.int64).max)
+        flat = np.flatnonzero(delta == delta.min())
+        pick = flat[rng.randrange(len(flat))]
+        row, new = divmod(int(pick), k)
+        if delta[row, new] == np.iinfo(np.int64).max: continue
+        v, old = int(conflicted[row]), int(colors[conflicted[row]])
+
+        cost += int(delta[row, new])
+        colors[v] = new
+        gamma[:, old] -= weights[:, v]
+        gamma[:, new] += weights[:, v]
+        tabu[v, old] = it + 7 + rng.randrange(3) + len(conflicted) // 2
+        if cost < best_cost:
+            best, best_cost = colors.copy(), cost
+    return best, best_cost
+
+
+def relabel_colors(colors):
+    """Nomori ulang warna jadi 0..k-1 berurutan (warna kosong dibuang)."""
+    _, inverse = np.unique(colors, return_inverse=True)
+    return inverse.astype(np.int32)
+
+
+def reduce_colors(weights, max_colors=None, seed=0, time_budget=2.0, minimize=True):
+    """DSATUR lalu TabuCol: kurangi warna satu per satu selama masih tanpa bentrok.
+
+    `minimize=True` terus mengurangi sampai 1 warna (blok peminatan: sesedikit mungkin);
+    `minimize=False` berhenti begitu muat di `max_colors` (sesi ujian). Jika tetap di atas
+    `max_colors`, warna dipaksa masuk batas dengan bobot bentrok seminimal mungkin.
+    """
+    rng = random.Random(seed)
+    deadline = time.perf_counter() + time_budget
+    colors = dsatur(weights) if len(weights) else np.zeros(0, dtype=np.int32)
+    k = int(colors.max()) + 1 if len(colors) else 0
+
+    floor = 1 if minimize else (max_colors or 1)
+    while k > floor and time.perf_counter() < deadline:
+        trial = colors.copy()
+        for v in np.flatnonzero(trial == k - 1):
+            trial[v] = rng.randrange(k - 1)
+        trial, cost = tabucol(weights, trial, k - 1, deadline, rng)
+        if cost: break
+        colors, k = trial, k - 1
+
+    if max_colors and k > max_colors:
+        trial = colors.copy()
+        over = trial >= max_colors
+        trial[over] = [rng.randrange(max_colors) for _ in range(int(over.sum()))]
+        colors, _ = tabucol(weights, trial, max_colors, time.perf_counter() + time_budget, rng)
+    return relabel_colors(colors)
+
+
+def color_electives(weights, max_blocks=None, seed=0, time_budget=2.0):
+    # Blok sesedikit mungkin; batas blok sekolah = minimalkan jumlah siswa yang bentrok
+    return reduce_colors(weights, max_blocks, seed, time_budget)
+
+
+# --- HASIL ---
+def block_electives(choices, elective_info=None, max_blocks=None, seed=0, time_budget=2.0):
+    """Kelompokkan mapel peminatan ke blok paralel.
+
+    `choices`: DataFrame (Siswa, Kelas, Mapel). `elective_info`: DataFrame
+    opsional (Mapel, Guru, Inisial, JP). Mengembalikan dict berisi tabel blok,
+    pemetaan mapel -> blok dan jumlah siswa yang masih bentrok.
+    """
+    info = elective_info.set_index('Mapel') if elective_info is not None else pd.DataFrame()
+    teacher_of = info['Guru'].to_dict() if 'Guru' in info else None
+    electives, weights, enrolment = build_clash_graph(choices, teacher_of)
+    colors = color_electives(weights, max_blocks, seed, time_budget)
+
+    student_weights = np.where(weights >= HARD_WEIGHT, 0, weights)
+    blocks = []
+    for b in range(int(colors.max()) + 1 if len(colors) else 0):
+        members = [electives[i] for i in np.flatnonzero(colors == b)]
+        rows = info.reindex(members)
+        blocks.append({
+            'Blok': string.ascii_uppercase[b] if b < 26 else str(b + 1),
+            'Mapel': members,
+            'Guru': [g for g in rows.get('Guru', pd.Series(dtype=object)).tolist() if isinstance(g, str)],
+            'Inisial': [g for g in rows.get('Inisial', pd.Series(dtype=object)).tolist() if isinstance(g, str)],
+            'JP': int(rows['JP'].max()) if 'JP' in rows and rows['JP'].notna().any() else 2,
+            'Siswa': int(enrolment[np.flatnonzero(colors == b)].sum()),
+            'Kelas': sorted(choices.loc[choices['Mapel'].isin(members), 'Kelas'].unique()),
+        })
+    return {
+        'blocks': blocks,
+        'assignment': {electives[i]: blocks[colors[i]]['Blok'] for i in range(len(electives))},
+        'clashes': clash_cost(student_weights, colors),
+        'teacher_clash': bool(clash_cost(np.where(weights >= HARD_WEIGHT, 1, 0), colors)),
+        'seed': seed,
+    }
+
+
+def blocks_to_subject_rows(result, tag=""):
+    """Baris data_subjects: satu label blok bersama per kelas asal peserta."""
+    rows = []
+    for block in result['blocks']:
+        code = f"{BLOCK_PREFIX}{tag}{block['Blok']}"
+        for cls in block['Kelas']:
+            rows.append({
+                'Class': cls,
+                'Subject Name': f"Peminatan {', '.join(block['Mapel'])}",
+                'Subject Code': code,
+                'Teacher Name': ", ".join(block['Guru']) or "-",
+                'Teacher Initials': "/".join(block['Inisial']) or "-",
+                'Periods/Week': block['JP'],
+                'Block Length': 1,
+            })
+    return pd.DataFrame(rows)
+
+
+def merge_block_rows(subjects, rows, tag=""):
+    """Ganti baris blok bertanda `tag` di `subjects` dengan `rows` (hasil susun ulang blok yang sama).
+
+    Blok lama "BLOK {tag}A", "BLOK {tag}B", ... dibuang seluruhnya, termasuk blok yang
+    tidak muncul lagi di hasil baru; blok dengan penanda lain tidak tersentuh.
+    """
+    pattern = re.compile(re.escape(f"{BLOCK_PREFIX}{tag}".upper()) + r"(?:[A-Z]|\d+)")
+    codes = subjects['Subject Code'].astype(str).str.strip().str.upper()
+    old = codes.map(lambda code: pattern.fullmatch(code) is not None).astype(bool)
+    return pd.concat([subjects[~old], rows], ignore_index=True)
@@ -0,0 +1,189 @@
+import io
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from scheduler.model import ScheduleModel
+
+# ==========================================
+# LOG EDIT (EVENT SOURCING) + SNAPSHOT BERKALA
+# ==========================================
+# Tabel `events` hanya ditambah (append-only): satu baris per sel yang berubah,
+# lengkap dengan siapa, kapan dan aksi apa. Setiap `snapshot_every` event grid
+# utuh disimpan ke tabel `snapshots`. Keadaan pada event ke-n = snapshot terdekat
+# <= n lalu memutar ulang event sesudahnya (paling banyak `snapshot_every` sel).
+# Grid yang diganti utuh (proyek, impor, struktur waktu) membuka epoch baru:
+# baris penanda '*' plus snapshot, sehingga replay tidak melintasi batas struktur.
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    seq     INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts      REAL NOT NULL,
+    editor  TEXT,
+    action  TEXT,
+    day     TEXT NOT NULL,
+    period  TEXT NOT NULL,
+    class   TEXT NOT NULL,
+    old     TEXT,
+    new     TEXT
+);
+CREATE INDEX IF NOT EXISTS events_class ON events(class, seq);
+CREATE TABLE IF NOT EXISTS snapshots (
+    seq   INTEGER PRIMARY KEY,
+    ts    REAL NOT NULL,
+    state BLOB NOT NULL
+);
+"""
+
+EVENT_COLUMNS = ['No', 'Waktu', 'Oleh', 'Aksi', 'Hari', 'Jam', 'Kelas', 'Lama', 'Baru']
+
+
+def _encode_state(model):
+    header = {
+        'classes': model.classes,
+        'labels': model.labels,
+        'teachers': model.teachers,
+        'days': [(d, model.time_frame(d).to_dict(orient='records')) for d in model.days],
+    }
+    raw = np.frombuffer(json.dumps(header, ensure_ascii=False).encode('utf-8'), dtype=np.uint8)
+    out = io.BytesIO()
+    np.savez_compressed(out, header=raw, grid=model.grid)
+    return out.getvalue()
+
+
+def _decode_state(blob):
+    with np.load(io.BytesIO(blob)) as npz:
+        header = json.loads(npz['header'].tobytes().decode('utf-8'))
+        grid = npz['grid']
+    day_structures = [(d, pd.DataFrame(rows)) for d, rows in header['days']]
+    return ScheduleModel.from_grid(header['classes'], day_structures, header['labels'], grid, header['teachers'])
+
+
+class EventLog:
+    """Log audit append-only di SQLite dengan snapshot tiap `snapshot_every` event."""
+
+    def __init__(self, path, snapshot_every=500, timeout=10.0):
+        self.path = path
+        self.snapshot_every = snapshot_every
+        self.timeout = timeout
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        try:
+            conn.execute("PRAGMA synchronous=NORMAL")
+            yield conn
+        finally:
+            conn.close()
+
+    def head(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COALESCE(MAX(seq), 0) FROM events").fetchone()[0]
+
+    def append(self, model, cells, editor="", action="edit"):
+        """Catat sel yang sudah diterapkan ke `model`: list of (day, period, kelas, lama, baru).
+
+        Log kosong otomatis mendapat snapshot awal (keadaan sebelum `cells`),
+        jadi setiap keadaan bisa direkonstruksi sejak event pertama.
+        """
+        cells = [(d, str(p), c, o, n) for d, p, c, o, n in cells if o != n]
+        if not cells: return self.head()
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if conn.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0] == 0:
+                    base = model.copy()
+                    for d, p, c, o, _ in reversed(cells):
+                        if (d, p) in base.slot_index and c in base.class_ids:
+                            base.set_cell(d, p, c, o)
+                    last = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM events").fetchone()[0]
+                    conn.execute("INSERT INTO snapshots(seq, ts, state) VALUES (?, ?, ?)",
+                                 (last, now, _encode_state(base)))
+                conn.executemany(
+                    "INSERT INTO events(ts, editor, action, day, period, class, old, new) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(now, editor, action, d, p, c, o, n) for d, p, c, o, n in cells])
+                seq = conn.execute("SELECT MAX(seq) FROM events").fetchone()[0]
+                last_snap = conn.execute("SELECT MAX(seq) FROM snapshots").fetchone()[0]
+                if seq - last_snap >= self.snapshot_every:
+                    # Snapshot dibangun dari log sendiri (bukan dari `model`), jadi tetap
+                    # benar walau ada penulis lain di antara dua snapshot
+                    conn.execute("INSERT INTO snapshots(seq, ts, state) VALUES (?, ?, ?)",
+                                 (seq, now, _encode_state(self._replay(conn, seq))))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return seq
+
+    def start_epoch(self, model, editor="", action="Grid baru"):
+        """Mulai epoch baru: satu baris penanda di `events` + snapshot utuh `model` pada seq itu.
+
+        Dipakai saat grid diganti utuh (buka proyek, impor, struktur waktu baru) karena
+        keadaan sesudahnya tidak bisa diturunkan dari event sel sebelumnya.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM events").fetchone()[0]
+                if seq:
+                    # Hari/jam/kelas '*' tidak pernah cocok dengan slot, jadi penanda dilewati saat replay
+                    conn.execute("INSERT INTO events(ts, editor, action, day, period, class, old, new) "
+                                 "VALUES (?, ?, ?, '*', '*', '*', NULL, NULL)", (now, editor, action))
+                    seq = conn.execute("SELECT MAX(seq) FROM events").fetchone()[0]
+                # Log masih kosong: snapshot ini menjadi keadaan awal (seq 0)
+                conn.execute("INSERT OR REPLACE INTO snapshots(seq, ts, state) VALUES (?, ?, ?)",
+                             (seq, now, _encode_state(model)))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return seq
+
+    def _replay(self, conn, seq):
+        snap = conn.execute("SELECT seq, state FROM snapshots WHERE seq <= ? ORDER BY seq DESC LIMIT 1",
+                            (seq,)).fetchone()
+        if snap is None:
+            raise ValueError("Log belum punya snapshot untuk titik ini.")
+        model = _decode_state(snap[1])
+        tail = conn.execute("SELECT day, period, class, new FROM events WHERE seq > ? AND seq <= ? ORDER BY seq",
+                            (snap[0], seq))
+        for day, period, cls, new in tail:
+            if (day, period) in model.slot_index and cls in model.class_ids:
+                model.set_cell(day, period, cls, new)
+        return model
+
+    def state_at(self, seq=None):
+        """Rekonstruksi ScheduleModel pada event `seq` (default: terbaru)."""
+        with self._connect() as conn:
+            conn.execute("BEGIN")
+            try:
+                if seq is None:
+                    seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM events").fetchone()[0]
+                return self._replay(conn, seq)
+            finally:
+                conn.execute("COMMIT")
+
+    def events(self, day=None, cls=None, editor=None, limit=200):
+        """Riwayat terbaru (paling baru di atas) sebagai DataFrame audit."""
+        where, args = [], []
+        for col, val in (('day', day), ('class', cls), ('editor', editor)):
+            if val:
+                where.append(f"{col} = ?")
+                args.append(val)
+        sql = "SELECT seq, ts, editor, action, day, period, class, old, new FROM events"
+        if where: sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY seq DESC LIMIT ?"
+        with self._connect() as conn:
+            rows = conn.execute(sql, (*args, limit)).fetchall()
+        df = pd.DataFrame(rows, columns=EVENT_COLUMNS)
+        df['Waktu'] = pd.to_datetime(df['Waktu'], unit='s').dt.strftime('%Y-%m-%d %H:%M:%S')
+        return df
@@ -0,0 +1,128 @@
+import fnmatch
+import re
+
+import numpy as np
+
+from scheduler.model import split_cycle_day
+from scheduler.rules import RuleError, _parse_days, _parse_periods
+
+# ==========================================
+# KEGIATAN TETAP (UPACARA, CHAPEL, PRAMUKA, RECESS)
+# ==========================================
+# Satu kegiatan per baris, baris diawali '#' adalah komentar:
+#
+#   RECESS at * break                   -> semua slot break, semua kelas
+#   UPACARA at Senin 1                  -> Senin jam ke-1, semua kelas
+#   CHAPEL at Jumat 1 for Kelas 7*      -> hanya kelas yang cocok pola (fnmatch)
+#   PRAMUKA at Jumat 7,8 for Kelas 7A, Kelas 7B
+#   UPACARA at Senin break0             -> slot "BREAK 0" saja (blok pembuka Senin, break 0:30)
+#
+# Setiap kegiatan dikompilasi sekali per model menjadi mask slot x kelas.
+# Mask itu mengisi grid, mengeluarkan sel dari domain solver dan membuat sel
+# kebal cek bentrok (satu lookup model.fixed[s, c]), tanpa mencocokkan teks
+# sel dengan SAFE_LIST. Baris yang lebih bawah menimpa baris di atasnya.
+
+DEFAULT_EVENTS = """# Kegiatan tetap: LABEL at HARI JAM [for KELAS]
+RECESS at * break
+# UPACARA at Senin 1
+# CHAPEL at Jumat 1 for Kelas 7*
+# PRAMUKA at Jumat 7,8 for Kelas 7*, Kelas 8*
+"""
+
+EVENT_PATTERN = re.compile(r'^(?P<label>.+?)\s+at\s+(?P<days>\S+)\s+(?P<periods>\S+)(?:\s+for\s+(?P<classes>.+))?$',
+                           re.IGNORECASE)
+
+
+def _period_key(label):
+    # "BREAK 1" dan "break1" sama (token DSL tidak boleh berspasi)
+    return str(label).upper().replace(" ", "")
+
+
+class FixedEvent:
+    def __init__(self, text, label, days, periods, classes):
+        self.text = text
+        self.label = label          # isi sel, mis. "UPACARA"
+        self.days = days            # set nama hari dasar atau None (semua)
+        self.periods = periods      # set label jam, "break", atau None (semua jam pelajaran)
+        self.classes = classes      # daftar pola kelas atau None (semua)
+
+    def __repr__(self):
+        return f"FixedEvent({self.text!r})"
+
+    def slot_mask(self, model):
+        base_days = np.array([split_cycle_day(d)[0] for d in model.days], dtype=object)
+        mask = np.ones(model.n_slots, dtype=bool) if self.days is None else \
+            np.isin(base_days, list(self.days))[model.slot_day]
+        if self.periods == "break":
+            return mask & model.slot_break
+        if self.periods is None:
+            return mask & ~model.slot_break
+        labels = np.array([_period_key(label) for label in model.slot_label], dtype=object)
+        return mask & np.isin(labels, list(self.periods))
+
+    def class_mask(self, model):
+        if self.classes is None: return np.ones(len(model.classes), dtype=bool)
+        return np.array([any(fnmatch.fnmatchcase(c, p) for p in self.classes) for c in model.classes], dtype=bool)
+
+
+class EventSet:
+    """Kumpulan kegiatan tetap terkompilasi."""
+
+    def __init__(self, events=()):
+        self.events = list(events)
+
+    def __len__(self):
+        return len(self.events)
+
+    def labels(self):
+        return list(dict.fromkeys(e.label for e in self.events))
+
+    def layout(self, model):
+        # Grid id label kegiatan (slot x kelas), 0 = bukan kegiatan tetap
+        lids = np.zeros(model.grid.shape, dtype=np.int32)
+        relabelled = False
+        for event in self.events:
+            lid = model.intern(event.label)
+            # Kegiatan berguru (mis. "RAPAT (BUD)") di banyak kelas = satu kegiatan, seperti blok paralel
+            if model.label_teachers[lid] and not model.label_shared[lid]:
+                model.label_shared[lid] = relabelled = True
+            lids[np.outer(event.slot_mask(model), event.class_mask(model))] = lid
+        if relabelled: model.rebuild_indexes()
+        return lids
+
+    def apply(self, model):
+        """Pasang mask ke model dan isi sel kegiatan; kembalikan daftar sel yang berubah."""
+        lids = self.layout(model)
+        fixed = lids > 0
+        changes = []
+        # Sel yang sebelumnya kegiatan tetap tetapi tidak lagi ikut dikosongkan
+        for s, c in zip(*np.nonzero(fixed | model.fixed)):
+            lid = int(lids[s, c])
+            old = model.place(int(s), int(c), lid)
+            if old != lid: changes.append((int(s), int(c), old, lid))
+        model.set_fixed(fixed)
+        return changes
+
+
+def compile_event(line, line_no=1):
+    match = EVENT_PATTERN.match(line)
+    if not match:
+        raise RuleError(f"Baris {line_no}: kegiatan '{line}' tidak dikenali (format: LABEL at HARI JAM [for KELAS]).")
+    label = match.group('label').strip().upper()
+    periods = match.group('periods')
+    periods = "break" if periods.lower() == "break" else _parse_periods(periods)
+    if periods not in (None, "break"): periods = {_period_key(p) for p in periods}
+    classes = match.group('classes')
+    classes = None if classes is None or classes.strip() == "*" else \
+        [p.strip() for p in classes.split(",") if p.strip()]
+    return FixedEvent(" ".join(line.split()), label, _parse_days(match.group('days'), line_no), periods, classes)
+
+
+def compile_events(text):
+    """Kompilasi teks kegiatan tetap (satu per baris) menjadi EventSet."""
+    events = []
+    for line_no, raw in enumerate(str(text or "").splitlines(), start=1):
+        line = raw.split("#", 1)[0].strip()
+        if not line: continue
+        events.append(compile_event(line, line_no))
+    return EventSet(events)
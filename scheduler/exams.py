@@ -0,0 +1,162 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from scheduler.electives import clash_cost, reduce_colors
+
+# ==========================================
+# MODE UJIAN (PEWARNAAN GRAF SESI UJIAN)
+# ==========================================
+# Naskah ujian = satu mapel untuk satu kelompok kelas (per kelas atau per
+# tingkat). Dua naskah bertetangga jika ada kelas yang sama-sama mengikutinya,
+# karena siswa kelas itu tidak bisa duduk di dua ujian sekaligus. Pewarnaan
+# graf = pembagian ke sesi ujian: DSATUR untuk pewarnaan awal, lalu TabuCol
+# (sama dengan blok peminatan) untuk mengurangi jumlah sesi atau memuatkan
+# ke batas sesi sekolah. Setiap kelas mengerjakan ujian di ruangnya sendiri,
+# dan setiap ruang diawasi guru dari data mapel dengan beban tugas merata.
+
+
+def build_papers(subjects, group_of=None):
+    """Daftar naskah ujian dari data_subjects: satu per (kode mapel, kelompok kelas)."""
+    df = subjects[['Class', 'Subject Name', 'Subject Code', 'Teacher Initials']].copy()
+    df['Class'] = df['Class'].astype(str)
+    df['Grup'] = df['Class'].map(group_of) if group_of else df['Class']
+    papers = []
+    for (code, group), rows in df.groupby(['Subject Code', 'Grup'], sort=True):
+        teachers = {t.strip() for ini in rows['Teacher Initials'].astype(str) for t in ini.split("/") if t.strip()}
+        papers.append({
+            'Kode': code,
+            'Ujian': f"{rows['Subject Name'].iloc[0]} · {group}",
+            'Kelas': sorted(rows['Class'].unique()),
+            'Guru': sorted(teachers - {"-"}),
+        })
+    return papers
+
+
+def paper_clash_graph(papers):
+    """Matriks W[i, j] = jumlah kelas yang mengikuti naskah i dan j."""
+    classes = sorted({c for p in papers for c in p['Kelas']})
+    c_ids = {c: i for i, c in enumerate(classes)}
+    incidence = np.zeros((len(papers), len(classes)), dtype=np.int32)
+    for i, paper in enumerate(papers):
+        incidence[i, [c_ids[c] for c in paper['Kelas']]] = 1
+    weights = incidence @ incidence.T
+    np.fill_diagonal(weights, 0)
+    return weights
+
+
+def color_sessions(weights, max_sessions=None, seed=0, time_budget=2.0):
+    """Warna (sesi) per naskah: sesedikit mungkin, dan muat di max_sessions jika diberikan."""
+    # Berhenti begitu muat di batas sekolah; jika tidak muat, minimalkan jumlah kelas yang bentrok
+    return reduce_colors(weights, max_sessions, seed, time_budget, minimize=False)
+
+
+def fit_rooms(papers, weights, colors, rooms, max_sessions=None):
+    """Pindahkan naskah dari sesi yang butuh ruang melebihi `rooms` ke sesi lain tanpa bentrok."""
+    colors = colors.copy()
+    size = np.array([len(p['Kelas']) for p in papers], dtype=np.int32)
+    k = int(colors.max()) + 1 if len(colors) else 0
+    used = np.bincount(colors, weights=size, minlength=k).astype(np.int32)
+    for s in range(k):
+        # Naskah terkecil dipindah dulu agar sesi asal cepat muat
+        for v in sorted(np.flatnonzero(colors == s), key=lambda v: size[v]):
+            if used[s] <= rooms: break
+            target = None
+            for t in range(k):
+                if t != s and used[t] + size[v] <= rooms and not (weights[v, colors == t] > 0).any():
+                    target = t
+                    break
+            if target is None and (max_sessions is None or k < max_sessions):
+                target, k = k, k + 1
+                used = np.append(used, 0)
+            if target is None: continue
+            colors[v] = target
+            used[s] -= size[v]
+            used[target] += size[v]
+    return colors, int(np.maximum(used - rooms, 0).sum())
+
+
+def assign_invigilators(papers, colors, teacher_load, per_room=1, exclude_own=True,
+                        sessions_per_day=2, max_per_day=None, max_duties=None):
+    """Pengawas per ruang (kelas) per sesi.
+
+    Guru dengan tugas mengawas paling sedikit dipilih dulu; jika seri, guru dengan
+    JP mengajar lebih kecil. Satu guru hanya satu ruang per sesi, tidak mengawas
+    mapelnya sendiri (opsional), dan dibatasi tugas per hari / total.
+    Mengembalikan (baris [sesi, naskah, kelas, pengawas], tugas per guru, kekurangan).
+    """
+    duties = {t: 0 for t in teacher_load}
+    per_day = {}
+    rows, shortage = [], 0
+    for s in range(int(colors.max()) + 1 if len(colors) else 0):
+        members = np.flatnonzero(colors == s)
+        own = {t for v in members for t in papers[v]['Guru']} if exclude_own else set()
+        day = s // max(sessions_per_day, 1)
+        pool = sorted((t for t in duties if t not in own
+                       and (max_per_day is None or per_day.get((t, day), 0) < max_per_day)
+                       and (max_duties is None or duties[t] < max_duties)),
+                      key=lambda t: (duties[t], teacher_load[t], t))
+        pool.reverse()
+        for v in members:
+            for cls in papers[v]['Kelas']:
+                picked = [pool.pop() for _ in range(min(per_room, len(pool)))]
+                shortage += per_room - len(picked)
+                for t in picked:
+                    duties[t] += 1
+                    per_day[(t, day)] = per_day.get((t, day), 0) + 1
+                rows.append((s, int(v), cls, picked))
+    return rows, duties, shortage
+
+
+def session_label(s, sessions_per_day):
+    day, nth = divmod(s, max(sessions_per_day, 1))
+    return day + 1, nth + 1
+
+
+def schedule_exams(subjects, teacher_load, days=5, sessions_per_day=2, rooms=None, per_room=1,
+                   group_of=None, exclude_own=True, max_per_day=None, seed=0, time_budget=2.0):
+    """Susun jadwal ujian dari data mapel; kembalikan tabel jadwal, pengawas dan ringkasan."""
+    started = time.perf_counter()
+    papers = build_papers(subjects, group_of)
+    weights = paper_clash_graph(papers)
+    max_sessions = days * sessions_per_day
+    colors = color_sessions(weights, max_sessions, seed, time_budget)
+    over_rooms = 0
+    if rooms:
+        colors, over_rooms = fit_rooms(papers, weights, colors, rooms, max_sessions)
+    rows, duties, shortage = assign_invigilators(papers, colors, teacher_load, per_room, exclude_own,
+                                                 sessions_per_day, max_per_day)
+
+    by_paper = {}
+    for s, v, cls, picked in rows:
+        by_paper.setdefault(v, []).append(f"{cls}: {', '.join(picked) or '-'}")
+    schedule = []
+    for v in np.argsort(colors, kind='stable'):
+        day, nth = session_label(int(colors[v]), sessions_per_day)
+        schedule.append({'Hari Ke': day, 'Sesi': nth, 'Ujian': papers[v]['Ujian'], 'Kode': papers[v]['Kode'],
+                         'Kelas': ", ".join(papers[v]['Kelas']), 'Ruang': len(papers[v]['Kelas']),
+                         'Pengawas': "; ".join(by_paper.get(int(v), []))})
+    rooms_df = pd.DataFrame([{'Hari Ke': session_label(s, sessions_per_day)[0],
+                              'Sesi': session_label(s, sessions_per_day)[1],
+                              'Ujian': papers[v]['Ujian'], 'Ruang (Kelas)': cls,
+                              'Pengawas': ", ".join(picked) or "-"} for s, v, cls, picked in rows],
+                            columns=['Hari Ke', 'Sesi', 'Ujian', 'Ruang (Kelas)', 'Pengawas'])
+    load_df = pd.DataFrame({'Guru': list(duties), 'Tugas Mengawas': list(duties.values()),
+                            'JP Mengajar': [teacher_load[t] for t in duties]})
+    load_df = load_df.sort_values(['Tugas Mengawas', 'Guru'], ascending=[False, True], ignore_index=True)
+
+    n_sessions = int(colors.max()) + 1 if len(colors) else 0
+    return {
+        'schedule': pd.DataFrame(schedule, columns=['Hari Ke', 'Sesi', 'Ujian', 'Kode', 'Kelas', 'Ruang', 'Pengawas']),
+        'rooms': rooms_df,
+        'invigilators': load_df,
+        'papers': len(papers),
+        'sessions': n_sessions,
+        'max_sessions': max_sessions,
+        'clashes': clash_cost(weights, colors),
+        'over_rooms': over_rooms,
+        'shortage': shortage,
+        'seed': seed,
+        'seconds': round(time.perf_counter() - started, 2),
+    }
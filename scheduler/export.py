@@ -0,0 +1,194 @@
+import re
+import tempfile
+
+from openpyxl import Workbook
+from openpyxl.formatting.rule import FormulaRule
+from openpyxl.styles import Font, PatternFill
+from openpyxl.utils import get_column_letter
+
+from scheduler.model import BLOCK_PREFIX
+
+# ==========================================
+# EXPORT EXCEL (Jadwal_Siap_Cetak.xlsx)
+# ==========================================
+# Tata letak sama dengan export lama (dan dibaca balik oleh importer):
+# kolom A = label jam, kolom B = 'Waktu', lalu satu kolom per kelas.
+# Warna tidak ditulis per sel. Setiap sheet hanya mendapat beberapa aturan
+# conditional formatting tingkat worksheet, sehingga file tetap kecil dan
+# sorotan ikut diperbarui saat sekolah mengedit file di Excel.
+#
+# Workbook dibuat dengan write_only=True: baris dialirkan langsung dari grid
+# model ke file sementara, sehingga memori puncak tidak ikut membesar walau
+# ada ratusan sheet per guru / per kelas.
+
+RED_FILL = PatternFill(start_color='DC3545', end_color='DC3545', fill_type='solid')
+CREAM_FILL = PatternFill(start_color='FFFDD0', end_color='FFFDD0', fill_type='solid')
+GREEN_FILL = PatternFill(start_color='D4EDDA', end_color='D4EDDA', fill_type='solid')
+YELLOW_FILL = PatternFill(start_color='FFF3CD', end_color='FFF3CD', fill_type='solid')
+PINK_FILL = PatternFill(start_color='F8D7DA', end_color='F8D7DA', fill_type='solid')
+WHITE_BOLD = Font(color='FFFFFF', bold=True)
+
+FIRST_CLASS_COL = 3  # A = jam, B = Waktu
+
+
+def _inner(ref):
+    # Teks di dalam kurung: "MTK (BUD)" -> "BUD". Ditambah "()" agar FIND tidak pernah error,
+    # jadi bisa dipakai per elemen di SUMPRODUCT (sel tanpa kurung -> "")
+    text = f'{ref}&"()"'
+    return f'MID({text},FIND("(",{text})+1,FIND(")",{text})-FIND("(",{text})-1)'
+
+
+def _tokens(ref):
+    # "BLOK A (BUD/SIT)" -> "BLOK A /BUD/SIT/": setiap inisial diapit "/"
+    return f'SUBSTITUTE(SUBSTITUTE({ref},"(","/"),")","/")'
+
+
+def conflict_formula(cell, row_range):
+    # Sel "MAPEL (INI)" bentrok jika "(INI)" muncul di sel pelajaran lain pada baris yang sama,
+    # atau INI ikut mengajar di label blok paralel ("BLOK A (INI/X)") pada baris itu. Label blok
+    # yang sama di banyak kelas = satu kegiatan: sel blok tidak ikut COUNTIF dan cukup dicek
+    # ada/tidak, sehingga blok yang sama tidak saling menandai. Sel blok sendiri merah jika
+    # salah satu gurunya mengajar pelajaran biasa di baris yang sama.
+    n = len(BLOCK_PREFIX)
+    is_block = f'LEFT({cell},{n})="{BLOCK_PREFIX}"'
+    code = _inner(cell)
+    row_blocks = f'(LEFT({row_range},{n})="{BLOCK_PREFIX}")'
+    row_lessons = f'(LEFT({row_range},{n})<>"{BLOCK_PREFIX}")'
+    lesson_clash = (f'AND(NOT({is_block}),ISNUMBER(FIND("(",{cell})),ISNUMBER(FIND(")",{cell})),'
+                    f'OR(COUNTIFS({row_range},"*("&{code}&")*",{row_range},"<>{BLOCK_PREFIX}*")>1,'
+                    f'SUMPRODUCT({row_blocks}*ISNUMBER(FIND("/"&{code}&"/",{_tokens(row_range)})))>0))')
+    block_clash = (f'AND({is_block},'
+                   f'SUMPRODUCT({row_lessons}*ISNUMBER(FIND("/"&{_inner(row_range)}&"/",{_tokens(cell)})))>0)')
+    return f'OR({lesson_clash},{block_clash})'
+
+
+def add_day_highlights(ws, n_rows, n_classes):
+    """Pasang aturan bentrok (merah) dan sel kosong (krem) untuk satu sheet hari."""
+    if not n_rows or not n_classes: return
+    first = get_column_letter(FIRST_CLASS_COL)
+    last = get_column_letter(FIRST_CLASS_COL + n_classes - 1)
+    target = f"{first}2:{last}{n_rows + 1}"
+    cell = f"{first}2"
+    row_range = f"${first}2:${last}2"
+    ws.conditional_formatting.add(target, FormulaRule(
+        formula=[conflict_formula(cell, row_range)], fill=RED_FILL, font=WHITE_BOLD, stopIfTrue=True))
+    ws.conditional_formatting.add(target, FormulaRule(
+        formula=[f'LEN(TRIM({cell}))=0'], fill=CREAM_FILL))
+
+
+def add_load_highlights(ws, n_rows, status_col):
+    if not n_rows: return
+    col = get_column_letter(status_col)
+    target = f"{col}2:{col}{n_rows + 1}"
+    cell = f"{col}2"
+    for word, fill in (("LUNAS", GREEN_FILL), ("Kurang", YELLOW_FILL), ("Lebih", PINK_FILL)):
+        ws.conditional_formatting.add(target, FormulaRule(
+            formula=[f'ISNUMBER(SEARCH("{word}",{cell}))'], fill=fill))
+
+
+def day_rows(model, day):
+    # Baris sheet hari langsung dari grid model (tanpa DataFrame)
+    lookup = [None] + model.labels[1:]
+    for s in model.day_slots(day):
+        yield [model.slot_label[s], model.slot_time[s]] + [lookup[lid] for lid in model.grid[s].tolist()]
+
+
+def safe_sheet_name(name, used):
+    # Nama sheet Excel: maks 31 karakter, tanpa []:*?/\ dan harus unik
+    base = re.sub(r'[\[\]:*?/\\]', '-', str(name)).strip("'")[:31] or "Sheet"
+    candidate, n = base, 2
+    while candidate.lower() in used:
+        suffix = f" ({n})"
+        candidate = base[:31 - len(suffix)] + suffix
+        n += 1
+    used.add(candidate.lower())
+    return candidate
+
+
+def period_axis(model, days):
+    # Gabungan label jam semua hari (urutan kemunculan), untuk sheet guru/kelas
+    labels = []
+    for day in days:
+        for s in model.day_slots(day):
+            if model.slot_label[s] not in labels:
+                labels.append(model.slot_label[s])
+    return labels
+
+
+def teacher_cells(model):
+    # {id guru: {slot: [teks "KELAS: LABEL"]}} dari satu kali sapuan grid
+    cells = {}
+    s_idx, c_idx = model.grid.nonzero()
+    for s, c, lid in zip(s_idx.tolist(), c_idx.tolist(), model.grid[s_idx, c_idx].tolist()):
+        for t in model.label_teachers[lid]:
+            cells.setdefault(t, {}).setdefault(s, []).append(f"{model.classes[c]}: {model.labels[lid]}")
+    return cells
+
+
+def write_grid_sheet(ws, model, days, periods, cell_text, title=None):
+    # Baris = jam, kolom = hari; cell_text(slot) -> isi sel atau None
+    ws.freeze_panes = "B2"
+    ws.append([title, *days])
+    for label in periods:
+        row = [label]
+        for day in days:
+            s = model.slot_index.get((day, label))
+            row.append(None if s is None else cell_text(s))
+        ws.append(row)
+
+
+def export_workbook(model, days, df_load=None, teacher_sheets=False, class_sheets=False, teacher_names=None,
+                    quality=None):
+    """Bangun file export (bytes): sheet per hari + 'Analisis Beban' (+ opsional skor kualitas, per guru/kelas).
+
+    quality: daftar DataFrame (lihat scheduler.metrics.quality_frames), ditulis bertumpuk di satu sheet.
+    """
+    wb = Workbook(write_only=True)
+    used = set(d.lower() for d in days) | {"analisis beban", "skor kualitas"}
+    for day in days:
+        ws = wb.create_sheet(day)
+        ws.freeze_panes = "C2"
+        # Write-only: aturan CF dipasang sebelum baris ditulis (jumlah baris sudah diketahui)
+        add_day_highlights(ws, len(model.day_slots(day)), len(model.classes))
+        ws.append([None, 'Waktu'] + model.classes)
+        for row in day_rows(model, day):
+            ws.append(row)
+
+    if df_load is not None and not df_load.empty:
+        ws = wb.create_sheet("Analisis Beban")
+        ws.append(list(df_load.columns))
+        status_col = list(df_load.columns).index('Status') + 1 if 'Status' in df_load.columns else None
+        if status_col:
+            add_load_highlights(ws, len(df_load), status_col)
+        for row in df_load.itertuples(index=False):
+            ws.append(list(row))
+
+    if quality:
+        ws = wb.create_sheet("Skor Kualitas")
+        for n, df in enumerate(quality):
+            if n: ws.append([])
+            ws.append(list(df.columns))
+            for row in df.itertuples(index=False):
+                ws.append(list(row))
+
+    periods = period_axis(model, days) if teacher_sheets or class_sheets else []
+    if teacher_sheets:
+        names = teacher_names or {}
+        by_teacher = teacher_cells(model)
+        for t, code in enumerate(model.teachers):
+            slots = by_teacher.get(t)
+            if not slots: continue
+            ws = wb.create_sheet(safe_sheet_name(f"Guru {code}", used))
+            title = f"{names[code]} ({code})" if names.get(code) else code
+            write_grid_sheet(ws, model, days, periods, lambda s: "\n".join(slots[s]) if s in slots else None, title)
+    if class_sheets:
+        lookup = [None] + model.labels[1:]
+        for c, cls in enumerate(model.classes):
+            ws = wb.create_sheet(safe_sheet_name(f"Kelas {cls}", used))
+            write_grid_sheet(ws, model, days, periods, lambda s: lookup[model.grid[s, c]], cls)
+
+    # Simpan lewat file sementara di disk; hanya zip akhir yang dibaca ke memori
+    with tempfile.TemporaryFile() as tmp:
+        wb.save(tmp)
+        tmp.seek(0)
+        return tmp.read()
@@ -0,0 +1,114 @@
+import numpy as np
+
+# ==========================================
+# JURNAL EDIT (UNDO / REDO)
+# ==========================================
+# Setiap langkah menyimpan hanya sel yang berubah: (hari, jam, kelas, lama, baru).
+# Operasi massal (isi otomatis, kirim jadwal, dsb.) menjadi satu grup sehingga
+# sekali undo mengembalikan semuanya. Nilai disimpan sebagai teks sel, bukan id
+# label, supaya jurnal tetap berlaku walau model dibangun ulang. Langkah yang
+# mengubah mask kegiatan tetap juga mencatat sel mask yang berubah, sehingga
+# undo "Kegiatan tetap" mengembalikan isi sel sekaligus kuncinya.
+
+
+def cell_diffs(model, changes):
+    # (s, c, id lama, id baru) -> (hari, jam, kelas, teks lama, teks baru)
+    return tuple(
+        (model.days[model.slot_day[s]], model.slot_label[s], model.classes[c],
+         model.labels[old] if old else None, model.labels[new] if new else None)
+        for s, c, old, new in changes if old != new
+    )
+
+
+def fixed_diffs(model, before):
+    # Mask kegiatan tetap sebelum/sesudah -> (hari, jam, kelas, lama, baru) dengan nilai bool
+    return tuple(
+        (model.days[model.slot_day[s]], model.slot_label[s], model.classes[c], bool(before[s, c]), bool(model.fixed[s, c]))
+        for s, c in zip(*np.nonzero(before != model.fixed))
+    )
+
+
+class EditJournal:
+    """Tumpukan undo/redo berbasis diff sel. Memori sebanding jumlah edit."""
+
+    def __init__(self, max_steps=200):
+        self.max_steps = max_steps
+        self.undo_stack = []
+        self.redo_stack = []
+
+    def __len__(self):
+        return len(self.undo_stack)
+
+    @property
+    def can_undo(self):
+        return bool(self.undo_stack)
+
+    @property
+    def can_redo(self):
+        return bool(self.redo_stack)
+
+    def record(self, model, changes, label="", fixed_before=None):
+        """Catat perubahan dari model.apply_frame / place: list of (s, c, lama, baru) id label.
+
+        `fixed_before` = salinan model.fixed sebelum operasi, jika operasi mengubah mask kegiatan tetap.
+        """
+        cells = cell_diffs(model, changes)
+        fixed = fixed_diffs(model, fixed_before) if fixed_before is not None else ()
+        if not cells and not fixed: return None
+        self.undo_stack.append((label, cells, fixed))
+        if len(self.undo_stack) > self.max_steps:
+            del self.undo_stack[0]
+        self.redo_stack.clear()
+        return cells
+
+    def record_grid(self, model, before, label=""):
+        """Catat selisih grid sebelum/sesudah operasi massal (mis. solver)."""
+        s_idx, c_idx = np.nonzero(before != model.grid)
+        return self.record(model, [(s, c, before[s, c], model.grid[s, c]) for s, c in zip(s_idx, c_idx)], label)
+
+    def _replay(self, model, cells, fixed, forward):
+        days = []
+        for day, period, cls, old, new in (cells if forward else reversed(cells)):
+            if (day, period) not in model.slot_index or cls not in model.class_ids: continue
+            model.set_cell(day, period, cls, new if forward else old)
+            if day not in days: days.append(day)
+        if fixed:
+            mask = model.fixed.copy()
+            for day, period, cls, old, new in fixed:
+                if (day, period) not in model.slot_index or cls not in model.class_ids: continue
+                mask[model.slot_index[(day, period)], model.class_ids[cls]] = new if forward else old
+                if day not in days: days.append(day)
+            model.set_fixed(mask)
+        return days
+
+    def undo(self, model):
+        """Kembalikan langkah terakhir; hasilnya (label, hari yang tersentuh, sel)."""
+        if not self.undo_stack: return None
+        label, cells, fixed = step = self.undo_stack.pop()
+        self.redo_stack.append(step)
+        return label, self._replay(model, cells, fixed, forward=False), cells
+
+    def redo(self, model):
+        if not self.redo_stack: return None
+        label, cells, fixed = step = self.redo_stack.pop()
+        self.undo_stack.append(step)
+        return label, self._replay(model, cells, fixed, forward=True), cells
+
+    def rebase(self, cells):
+        """Sel ditimpa dari luar jurnal (mis. tarikan mode bersama): buang langkah yang tidak lagi sah.
+
+        Langkah terbaru yang menyentuh salah satu sel beserta semua langkah sebelumnya dibuang,
+        karena undo-nya akan menimpa nilai dari luar. Langkah sesudahnya tetap bisa di-undo.
+        """
+        keys = {(day, str(period), cls) for day, period, cls, *_ in cells}
+        if not keys: return
+        self.redo_stack.clear()
+        for i in range(len(self.undo_stack) - 1, -1, -1):
+            _, step_cells, fixed = self.undo_stack[i]
+            if any(cell[:3] in keys for cell in step_cells + fixed):
+                del self.undo_stack[:i + 1]
+                break
+
+    def clear(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
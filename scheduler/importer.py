@@ -0,0 +1,168 @@
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+from scheduler.model import (DAYS, WEEK_NAMES, ScheduleModel, cycle_days, day_structures, is_break_label,
+                             is_empty_cell, lesson_label, split_cycle_day)
+
+# ==========================================
+# IMPOR KEMBALI FILE EXPORT (Jadwal_Siap_Cetak.xlsx)
+# ==========================================
+# Format export: satu sheet per hari, kolom A = label jam (index DataFrame),
+# kolom 'Waktu', lalu satu kolom per kelas. Sheet lain (mis. "Analisis Beban")
+# diabaikan. Jadwal siklus A/B punya sheet "Senin A" ... "Jumat B"; sheet tanpa
+# huruf minggu ("Senin") di file siklus dibaca sebagai minggu A, atau dilewati
+# (dan dilaporkan) jika "Senin A" juga ada.
+
+
+def _read_day_sheets(path_or_file):
+    wb = load_workbook(path_or_file, read_only=True, data_only=True)
+    try:
+        sheets = {}
+        # Urutan mengikuti siklus (minggu, lalu hari), bukan urutan sheet di file
+        names = [n for n in wb.sheetnames if split_cycle_day(n)[0] in DAYS]
+        for day in sorted(names, key=lambda n: (split_cycle_day(n)[1], DAYS.index(split_cycle_day(n)[0]))):
+            rows = wb[day].iter_rows(values_only=True)
+            header = next(rows, None)
+            if not header: continue
+            body = [r for r in rows if r and r[0] is not None]
+            sheets[day] = (list(header), body)
+        return sheets
+    finally:
+        wb.close()
+
+
+def _structure_from_sheet(header, body):
+    waktu_col = header.index('Waktu') if 'Waktu' in header else None
+    records = []
+    for row in body:
+        label = str(row[0])
+        records.append({
+            'Period': label,
+            'Type': 'BREAK' if is_break_label(label) else 'Class',
+            'Waktu': row[waktu_col] if waktu_col is not None else "",
+        })
+    return pd.DataFrame(records)
+
+
+def _structure_key(time_df):
+    return tuple(zip(time_df['Period'].astype(str), time_df['Waktu'].astype(str)))
+
+
+def _file_structures(sheets, time_structure=None):
+    # Struktur umum = struktur yang paling banyak dipakai sheet hari; hari yang
+    # berbeda (Jumat pendek, Senin dengan blok upacara) menjadi struktur per hari
+    structures = {day: _structure_from_sheet(header, body) for day, (header, body) in sheets.items()}
+    keys = {day: _structure_key(df) for day, df in structures.items()}
+    common = max(set(keys.values()), key=lambda k: (list(keys.values()).count(k), -list(keys.values()).index(k)))
+    if time_structure is not None and not time_structure.empty and _structure_key(time_structure) == common:
+        time_df = time_structure
+    else:
+        time_df = structures[next(d for d in sheets if keys[d] == common)]
+
+    day_times = {}
+    by_base = {}
+    for day in sheets:
+        by_base.setdefault(split_cycle_day(day)[0], []).append(day)
+    for base, days in by_base.items():
+        if all(keys[d] == common for d in days): continue
+        if len({keys[d] for d in days}) == 1:
+            day_times[base] = structures[days[0]]
+        else:
+            day_times.update({d: structures[d] for d in days if keys[d] != common})
+    return time_df, day_times
+
+
+def import_schedule_workbook(path_or_file, classes, subjects, time_structure=None, events=None):
+    """Baca file export kembali ke ScheduleModel.
+
+    Kelas mengikuti `classes` (data upload). Kode "MAPEL (INI)" yang tidak ada di
+    `subjects` untuk kelas itu dilaporkan di `unknown` (tetap dimuat ke grid).
+    Jika jam pada file berbeda dari `time_structure`, struktur waktu dari file
+    yang dipakai; hari dengan jam berbeda dari hari lain menjadi struktur per hari.
+    `events` (EventSet) dipasang ulang karena mask kegiatan tetap tidak ada di file;
+    isi file yang tertimpa kegiatan tetap dilaporkan di `overwritten`.
+    """
+    sheets = _read_day_sheets(path_or_file)
+    if not sheets:
+        raise ValueError("Tidak ada sheet hari (Senin-Jumat) di file ini.")
+
+    weeks = max(split_cycle_day(d)[1] for d in sheets) + 1
+    renamed, skipped = {}, []
+    if weeks == 1:
+        # "Senin A" tanpa minggu B tetap dibaca sebagai jadwal satu minggu biasa
+        sheets = {split_cycle_day(d)[0]: v for d, v in sheets.items()}
+    else:
+        cycle_sheets = {}
+        for day, v in sheets.items():
+            if split_cycle_day(day)[0] != day:
+                cycle_sheets[day] = v
+                continue
+            target = f"{day} {WEEK_NAMES[0]}"
+            if target in sheets:
+                skipped.append(day)
+            else:
+                renamed[day] = target
+                cycle_sheets[target] = v
+        sheets = cycle_sheets
+    time_df, day_times = _file_structures(sheets, time_structure)
+    model = ScheduleModel(classes, day_structures(cycle_days(weeks), time_df, day_times))
+    model.register_teachers(subjects['Teacher Initials'])
+    known = subjects[subjects['Class'].astype(str).isin(model.class_ids)]
+    valid_pairs = [(model.class_ids[str(cls)], model.intern(lesson_label(code, ini)))
+                   for cls, code, ini in zip(known['Class'], known['Subject Code'], known['Teacher Initials'])]
+    sheet_classes = set()
+
+    # Kumpulkan semua sel sebagai array objek (slot x kelas), lalu intern per teks unik
+    cells = np.full(model.grid.shape, "", dtype=object)
+    for day, (header, body) in sheets.items():
+        col_pos = {str(h): i for i, h in enumerate(header) if h is not None and i > 0 and h != 'Waktu'}
+        sheet_classes.update(col_pos)
+        targets = [(model.class_ids[cls], i) for cls, i in col_pos.items() if cls in model.class_ids]
+        for row in body:
+            s = model.slot_index.get((day, str(row[0])))
+            if s is None: continue
+            for c, i in targets:
+                val = row[i] if i < len(row) else None
+                if not is_empty_cell(val): cells[s, c] = str(val).strip()
+
+    uniques, inverse = np.unique(cells, return_inverse=True)
+    lids = np.array([model.intern(text) for text in uniques], dtype=np.int32)
+    model.grid = lids[inverse].reshape(cells.shape)
+    model.rebuild_indexes()
+    changes = events.apply(model) if events is not None else []
+    overwritten = [(s, c, old, new) for s, c, old, new in changes if old]
+    overwritten = pd.DataFrame({
+        'Hari': [model.days[model.slot_day[s]] for s, _, _, _ in overwritten],
+        'Jam': [model.slot_label[s] for s, _, _, _ in overwritten],
+        'Kelas': [model.classes[c] for _, c, _, _ in overwritten],
+        'Isi File': [model.labels[old] for _, _, old, _ in overwritten],
+        'Kegiatan Tetap': [model.labels[new] if new else None for _, _, _, new in overwritten],
+    })
+
+    # Validasi massal: pasangan (kelas, label bertanda guru) harus ada di data upload
+    n_labels = len(model.labels)
+    valid = np.array([c * n_labels + lid for c, lid in valid_pairs], dtype=np.int64)
+    has_code = np.array([bool(t) for t in model.label_teachers])
+    s_idx, c_idx = np.nonzero(model.grid)
+    lids_used = model.grid[s_idx, c_idx]
+    unknown_mask = has_code[lids_used] & ~np.isin(c_idx.astype(np.int64) * n_labels + lids_used, valid)
+    unknown = pd.DataFrame({
+        'Hari': [model.days[model.slot_day[s]] for s in s_idx[unknown_mask]],
+        'Jam': [model.slot_label[s] for s in s_idx[unknown_mask]],
+        'Kelas': [model.classes[c] for c in c_idx[unknown_mask]],
+        'Isi Sel': [model.labels[l] for l in lids_used[unknown_mask]],
+    })
+
+    return {
+        'model': model,
+        'time_structure': time_df,
+        'day_time_structures': day_times,
+        'manual_schedule': {d: model.to_frame(d) for d in sheets},
+        'unknown': unknown,
+        'overwritten': overwritten,
+        'renamed_sheets': renamed,
+        'skipped_sheets': skipped,
+        'missing_classes': sorted(set(classes) - sheet_classes),
+        'extra_classes': sorted(sheet_classes - set(classes)),
+    }
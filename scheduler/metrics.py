@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# SKOR KUALITAS JADWAL (LAPORAN YAYASAN)
+# ==========================================
+# Semua metrik dihitung dari grid model yang dibentuk ulang menjadi tensor
+# (hari, jam pelajaran, kelas/guru), lalu direduksi dengan NumPy di sumbu
+# jam/hari. Tidak ada loop per sel, jadi satu siklus penuh 100 kelas selesai
+# dalam hitungan milidetik dan skor bisa diperbarui setiap kali sel berubah.
+#
+# Slot break dibuang dari sumbu jam, sehingga "jam ke-p" berarti jam
+# pelajaran ke-p hari itu. Sel kegiatan tetap bukan pelajaran.
+
+DEFAULT_MAX_DAILY = 6
+SCORECARD_COLUMNS = ['Metrik', 'Nilai', 'Keterangan']
+# Bobot skor penalti (lebih kecil = lebih baik), dipakai benchmark regresi
+PENALTY_WEIGHTS = {'total_gaps': 1.0, 'total_over_daily': 3.0, 'total_repeats': 2.0, 'total_last_class': 0.5}
+
+
+def day_slot_index(model, keep):
+    """Indeks slot (hari x posisi) untuk slot yang lolos mask `keep`, plus mask posisi valid."""
+    slots = np.flatnonzero(keep)
+    n_days = len(model.days)
+    counts = np.bincount(model.slot_day[slots], minlength=n_days)
+    width = int(counts.max()) if n_days and len(slots) else 0
+    pos = np.arange(len(slots)) - np.repeat(np.cumsum(counts) - counts, counts)
+    idx = np.zeros((n_days, width), dtype=np.int64)
+    valid = np.zeros((n_days, width), dtype=bool)
+    idx[model.slot_day[slots], pos] = slots
+    valid[model.slot_day[slots], pos] = True
+    return idx, valid, counts
+
+
+def _teacher_busy(model, idx, valid):
+    # (hari, jam, guru): guru mengajar di slot itu
+    return (model.teacher_slot[idx] > 0) & valid[:, :, None]
+
+
+def teacher_idle_gaps(model, idx=None, valid=None):
+    """Jam kosong guru (guru x hari) di antara jam mengajar pertama dan terakhir."""
+    if idx is None: idx, valid, _ = day_slot_index(model, ~model.slot_break)
+    busy = _teacher_busy(model, idx, valid)
+    width = busy.shape[1]
+    if not width or not busy.shape[2]: return np.zeros((len(model.teachers), len(model.days)), dtype=np.int32)
+    first = busy.argmax(axis=1)
+    last = width - 1 - busy[:, ::-1].argmax(axis=1)
+    p = np.arange(width)[None, :, None]
+    span = (p >= first[:, None, :]) & (p <= last[:, None, :]) & busy.any(axis=1)[:, None, :]
+    # Slot kegiatan tetap semua kelas (upacara) dan recess di jam pelajaran bukan jam kosong
+    skip = model.fixed_slot[idx] | (model.slot_recess[idx] > 0)
+    idle = span & ~busy & valid[:, :, None] & ~skip[:, :, None]
+    return idle.sum(axis=1).T.astype(np.int32)
+
+
+def quality_metrics(model, max_daily=DEFAULT_MAX_DAILY):
+    """Metrik kualitas jadwal dalam bentuk array (guru x hari / kelas x hari) + total."""
+    idx, valid, counts = day_slot_index(model, ~model.slot_break)
+    n_days = len(model.days)
+    busy = _teacher_busy(model, idx, valid)
+    daily = busy.sum(axis=1).T.astype(np.int32)                        # guru x hari
+
+    # Sel pelajaran = label bergurunya bukan kegiatan tetap; id mapel per label
+    has_teacher = np.array([bool(t) for t in model.label_teachers], dtype=bool)
+    subject_codes, subject_of = np.unique(np.array(model.label_subject, dtype=object).astype(str),
+                                          return_inverse=True)
+    cells = model.grid[idx]                                             # hari x jam x kelas
+    lesson = has_teacher[cells] & ~model.fixed[idx] & valid[:, :, None]
+    subjects = np.where(lesson, subject_of[cells] + 1, 0)
+
+    # Mapel berulang: jumlah "duduk" (deret jam berurutan) mapel yang sama lebih dari satu per hari
+    prev = np.zeros_like(subjects)
+    prev[:, 1:] = subjects[:, :-1]
+    starts = (subjects > 0) & (subjects != prev)
+    d_idx, _, c_idx = np.nonzero(starts)
+    n_classes, n_subjects = len(model.classes), len(subject_codes) + 1
+    keys = (d_idx * n_classes + c_idx) * n_subjects + subjects[starts]
+    runs = np.bincount(keys, minlength=n_days * n_classes * n_subjects).reshape(n_days, n_classes, n_subjects)
+    repeats = np.maximum(runs - 1, 0).sum(axis=2).T.astype(np.int32)   # kelas x hari
+
+    # Jam pelajaran terakhir tiap hari
+    last_pos = np.maximum(counts - 1, 0)
+    has_day = counts > 0
+    day_ids = np.arange(n_days)
+    last_class = (lesson[day_ids, last_pos] & has_day[:, None]).T      # kelas x hari
+    last_teacher = (busy[day_ids, last_pos] & has_day[:, None]).T      # guru x hari
+
+    gaps = teacher_idle_gaps(model, idx, valid)
+    return {
+        'max_daily': max_daily,
+        'teacher_gaps': gaps,
+        'teacher_daily': daily,
+        'over_daily': daily > max_daily,
+        'class_repeats': repeats,
+        'last_class': last_class,
+        'last_teacher': last_teacher,
+        'total_gaps': int(gaps.sum()),
+        'total_over_daily': int((daily > max_daily).sum()),
+        'total_repeats': int(repeats.sum()),
+        'total_last_class': int(last_class.sum()),
+        'total_last_teacher': int(last_teacher.sum()),
+    }
+
+
+def quality_penalty(metrics, weights=PENALTY_WEIGHTS):
+    """Satu angka penalti dari total metrik (lebih kecil = jadwal lebih baik)."""
+    return round(sum(w * metrics[key] for key, w in weights.items()), 1)
+
+
+def scorecard_frame(model, metrics):
+    """Ringkasan satu baris per metrik (Menu 3 dan sheet export)."""
+    active = metrics['teacher_daily'].sum(axis=1) > 0
+    n_active = int(active.sum())
+    class_days = len(model.classes) * len(model.days)
+    rows = [
+        ("Jam kosong guru", metrics['total_gaps'],
+         f"rata-rata {metrics['total_gaps'] / max(n_active, 1):.1f} per guru per siklus"),
+        (f"Hari guru > {metrics['max_daily']} JP", metrics['total_over_daily'],
+         f"{int(metrics['over_daily'].any(axis=1).sum())} dari {n_active} guru"),
+        ("Mapel berulang dalam sehari", metrics['total_repeats'],
+         f"{int((metrics['class_repeats'] > 0).sum())} dari {class_days} kelas-hari"),
+        ("Kelas belajar di jam terakhir", metrics['total_last_class'],
+         f"{metrics['total_last_class'] / max(class_days, 1):.0%} dari {class_days} kelas-hari"),
+        ("Guru mengajar di jam terakhir", metrics['total_last_teacher'],
+         f"{int(metrics['last_teacher'].any(axis=1).sum())} dari {n_active} guru"),
+    ]
+    return pd.DataFrame(rows, columns=SCORECARD_COLUMNS)
+
+
+def teacher_metrics_frame(model, metrics, teacher_names=None):
+    """Rincian per guru yang mengajar, urut dari jam kosong terbanyak."""
+    names = teacher_names or {}
+    daily = metrics['teacher_daily']
+    active = np.flatnonzero(daily.sum(axis=1) > 0)
+    df = pd.DataFrame({
+        'Guru': [model.teachers[t] for t in active],
+        'Nama': [names.get(model.teachers[t], "") for t in active],
+        'Jam Kosong': metrics['teacher_gaps'][active].sum(axis=1),
+        f"Hari > {metrics['max_daily']} JP": metrics['over_daily'][active].sum(axis=1),
+        'JP Maks/Hari': daily[active].max(axis=1) if len(active) else [],
+        'Jam Terakhir': metrics['last_teacher'][active].sum(axis=1),
+    })
+    return df.sort_values(['Jam Kosong', 'Guru'], ascending=[False, True], ignore_index=True)
+
+
+def class_metrics_frame(model, metrics):
+    """Rincian per kelas: mapel berulang dan jumlah hari jam terakhir terisi."""
+    return pd.DataFrame({
+        'Kelas': model.classes,
+        'Mapel Berulang': metrics['class_repeats'].sum(axis=1),
+        'Jam Terakhir': metrics['last_class'].sum(axis=1),
+    })
+
+
+def quality_frames(model, max_daily=DEFAULT_MAX_DAILY, teacher_names=None):
+    """(ringkasan, per guru, per kelas) untuk sheet 'Skor Kualitas'."""
+    metrics = quality_metrics(model, max_daily)
+    return (scorecard_frame(model, metrics), teacher_metrics_frame(model, metrics, teacher_names),
+            class_metrics_frame(model, metrics))
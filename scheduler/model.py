@@ -0,0 +1,441 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# KONSTANTA BERSAMA
+# ==========================================
+DAYS = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat"]
+
+# Siklus N minggu (jadwal minggu A/B): hari diberi akhiran minggu, mis. "Senin B"
+WEEK_NAMES = ["A", "B", "C", "D"]
+
+# Sel yang mengandung kata-kata ini tidak pernah dihitung bentrok
+SAFE_LIST = ["UPACARA", "CHAPEL", "ISTIRAHAT", "BREAK", "RECESS", "NO CLASS", "P5",
+             "FLAG CEREMONY", "DEVOTION", "SCOUT", "EXERCISE", "PRAMUKA"]
+
+# Pilihan kegiatan non-mapel di dropdown editor
+EVENT_OPTIONS = ["UPACARA", "CHAPEL", "RECESS", "PRAMUKA", "OLAH RAGA", "DEVOTION"]
+
+CODE_PATTERN = re.compile(r'\((.*?)\)')
+
+# Bitmask slot per hari disimpan di int64
+MAX_SLOTS_PER_DAY = 63
+
+# Label blok peminatan, mis. "BLOK A (BUD/SIT/ANI)": diajar paralel oleh beberapa
+# guru dan boleh muncul di banyak kelas pada jam yang sama tanpa dianggap bentrok
+BLOCK_PREFIX = "BLOK "
+
+
+# --- FUNGSI BANTUAN: PARSING ISI SEL ---
+def is_break_label(label):
+    label = str(label).upper()
+    return "BREAK" in label or "ISTIRAHAT" in label
+
+
+def is_empty_cell(val):
+    if val is None: return True
+    if isinstance(val, float) and np.isnan(val): return True
+    return isinstance(val, str) and not val.strip()
+
+
+def is_shared_label(val):
+    return isinstance(val, str) and val.strip().upper().startswith(BLOCK_PREFIX)
+
+
+def extract_teacher_codes(val):
+    # "BLOK A (BUD/SIT)" -> ["BUD", "SIT"], "MTK (BUD)" -> ["BUD"]
+    code = extract_teacher_code(val)
+    if code is None: return []
+    if is_shared_label(val):
+        return [part.strip() for part in code.split("/") if part.strip()]
+    return [code]
+
+
+def extract_teacher_code(val):
+    # "MTK (BUD)" -> "BUD". Kegiatan di SAFE_LIST tidak punya guru.
+    if not isinstance(val, str) or not val.strip(): return None
+    if any(safe in val.upper() for safe in SAFE_LIST): return None
+    match = CODE_PATTERN.search(val)
+    return match.group(1) if match else None
+
+
+def extract_subject_code(val):
+    # "MTK (BUD)" -> "MTK", "UPACARA" -> "UPACARA"
+    if not isinstance(val, str): return ""
+    return val.split("(")[0].strip().upper()
+
+
+def lesson_label(subject_code, teacher_code):
+    return f"{subject_code} ({teacher_code})"
+
+
+# --- FUNGSI BANTUAN: SIKLUS MINGGU ---
+def cycle_days(weeks=1, days=DAYS):
+    # 1 minggu -> DAYS apa adanya; 2 minggu -> "Senin A" ... "Jumat A", "Senin B" ... "Jumat B"
+    weeks = max(1, min(int(weeks or 1), len(WEEK_NAMES)))
+    if weeks == 1: return list(days)
+    return [f"{d} {WEEK_NAMES[w]}" for w in range(weeks) for d in days]
+
+
+def split_cycle_day(name):
+    # "Senin B" -> ("Senin", 1), "Senin" -> ("Senin", 0)
+    base, _, week = str(name).rpartition(" ")
+    if base and week in WEEK_NAMES: return base, WEEK_NAMES.index(week)
+    return str(name), 0
+
+
+def day_structures(days, time_df, day_times=None):
+    """[(hari, struktur waktu)] untuk ScheduleModel: struktur khusus hari (nama lengkap
+    "Jumat B" atau nama dasar "Jumat") didahulukan, selain itu struktur umum `time_df`."""
+    day_times = day_times or {}
+    return [(d, day_times.get(d, day_times.get(split_cycle_day(d)[0], time_df))) for d in days]
+
+
+# ==========================================
+# MODEL JADWAL (GRID INTEGER + INDEKS)
+# ==========================================
+class ScheduleModel:
+    """Jadwal satu siklus (1..N minggu) sebagai grid integer (slot x kelas).
+
+    Semua hari dalam siklus dipipihkan ke satu sumbu slot; `day_offsets[d]`
+    menunjuk slot pertama hari ke-d dan `day_week[d]` minggu ke berapa hari
+    itu berada. Siklus dua minggu hanya berarti sumbu slot dua kali lebih panjang.
+    Tiap hari boleh punya struktur waktu sendiri (Jumat lebih pendek, Senin
+    dengan blok upacara): jumlah slot per hari bebas dan offset menanganinya.
+    Isi sel disimpan sebagai id label, dan indeks `teacher_slot` / `teacher_day`
+    diperbarui setiap kali satu sel berubah sehingga pengecekan per langkah
+    tidak perlu memindai ulang seminggu.
+    """
+
+    def __init__(self, classes, day_structures):
+        # day_structures: list of (nama hari, DataFrame time_structure)
+        self.classes = list(classes)
+        self.class_ids = {c: i for i, c in enumerate(self.classes)}
+        self.days = [d for d, _ in day_structures]
+        self.day_ids = {d: i for i, d in enumerate(self.days)}
+        self.day_week = np.array([split_cycle_day(d)[1] for d in self.days], dtype=np.int16)
+
+        slot_day, slot_label, slot_time, slot_break, slot_jp, slot_break_no = [], [], [], [], [], []
+        offsets = [0]
+        for d, (day, time_df) in enumerate(day_structures):
+            if len(time_df) > MAX_SLOTS_PER_DAY:
+                raise ValueError(f"Hari {day} punya {len(time_df)} slot; maksimal {MAX_SLOTS_PER_DAY}.")
+            jp, breaks_seen = 0, 0
+            for _, row in time_df.iterrows():
+                label = str(row['Period'])
+                brk = str(row.get('Type', '')).upper() == 'BREAK' or is_break_label(label)
+                if brk:
+                    # Blok pembuka (sebelum JP pertama) tidak ikut dinomori: "break 1" di
+                    # aturan = break pertama setelah pelajaran, sama di setiap hari
+                    if jp: breaks_seen += 1
+                else:
+                    jp += 1
+                slot_day.append(d)
+                slot_label.append(label)
+                slot_time.append(row.get('Waktu', ''))
+                slot_break.append(brk)
+                slot_jp.append(0 if brk else jp)
+                slot_break_no.append(breaks_seen)
+            offsets.append(len(slot_label))
+
+        self.day_offsets = np.array(offsets, dtype=np.int32)
+        self.slot_day = np.array(slot_day, dtype=np.int16)
+        self.slot_label = slot_label
+        self.slot_time = slot_time
+        self.slot_break = np.array(slot_break, dtype=bool)
+        self.slot_jp = np.array(slot_jp, dtype=np.int16)          # JP ke-n dalam hari (0 = break)
+        # Jumlah break (setelah JP pertama) sebelum/di slot ini
+        self.slot_break_no = np.array(slot_break_no, dtype=np.int16)
+        self.slot_index = {(self.days[d], lab): s for s, (d, lab) in enumerate(zip(slot_day, slot_label))}
+
+        # Bitmask per hari: bit ke-i = slot ke-i dalam hari itu
+        self.slot_bit = np.array([s - offsets[d] for s, d in enumerate(slot_day)], dtype=np.int64)
+        self.day_break_mask = np.zeros(len(self.days), dtype=np.int64)
+        for s in np.flatnonzero(self.slot_break):
+            self.day_break_mask[self.slot_day[s]] |= 1 << int(self.slot_bit[s])
+
+        n_slots = len(slot_label)
+        self.grid = np.zeros((n_slots, len(self.classes)), dtype=np.int32)
+        # Sel kegiatan tetap (lihat scheduler.events): dikunci dari editor/solver, kebal cek bentrok
+        self.fixed = np.zeros(self.grid.shape, dtype=bool)
+        self.fixed_slot = np.zeros(n_slots, dtype=bool)     # semua kelas di slot ini tetap
+        self.fixed_rejected = 0
+
+        # Tabel label: id 0 = sel kosong
+        self.labels = [""]
+        self.label_ids = {"": 0}
+        self.label_teacher = [-1]          # guru utama (-1 = tanpa guru)
+        self.label_teachers = [()]         # semua guru label (blok bisa > 1)
+        self.label_shared = [False]
+        self.label_subject = [""]
+        self.label_recess = [False]
+        self.shared_count = {}             # (slot, id label blok) -> jumlah kelas
+
+        self.teachers = []
+        self.teacher_ids = {}
+        self.teacher_slot = np.zeros((n_slots, 0), dtype=np.int16)
+        self.teacher_day = np.zeros((0, len(self.days)), dtype=np.int16)
+        self.slot_recess = np.zeros(n_slots, dtype=np.int16)
+        self.class_busy = np.zeros((len(self.classes), len(self.days)), dtype=np.int64)
+        self.teacher_busy = np.zeros((0, len(self.days)), dtype=np.int64)
+
+    # --- Tabel guru & label ---
+    @property
+    def n_slots(self):
+        return len(self.slot_label)
+
+    @property
+    def n_weeks(self):
+        return int(self.day_week.max()) + 1 if len(self.days) else 1
+
+    def day_slots(self, day):
+        d = self.day_ids[day]
+        return range(self.day_offsets[d], self.day_offsets[d + 1])
+
+    def teacher_id(self, code):
+        if code in self.teacher_ids: return self.teacher_ids[code]
+        t = len(self.teachers)
+        self.teachers.append(code)
+        self.teacher_ids[code] = t
+        self.teacher_slot = np.hstack([self.teacher_slot, np.zeros((self.n_slots, 1), dtype=np.int16)])
+        self.teacher_day = np.vstack([self.teacher_day, np.zeros((1, len(self.days)), dtype=np.int16)])
+        self.teacher_busy = np.vstack([self.teacher_busy, np.zeros((1, len(self.days)), dtype=np.int64)])
+        return t
+
+    def register_teachers(self, codes):
+        # Inisial blok "BUD/SIT" = dua guru, bukan satu kode gabungan
+        codes = (part.strip() for code in codes for part in str(code).split("/"))
+        new = [c for c in dict.fromkeys(codes) if c and c not in self.teacher_ids]
+        if not new: return
+        for code in new:
+            self.teacher_ids[code] = len(self.teachers)
+            self.teachers.append(code)
+        self.teacher_slot = np.hstack([self.teacher_slot, np.zeros((self.n_slots, len(new)), dtype=np.int16)])
+        self.teacher_day = np.vstack([self.teacher_day, np.zeros((len(new), len(self.days)), dtype=np.int16)])
+        self.teacher_busy = np.vstack([self.teacher_busy, np.zeros((len(new), len(self.days)), dtype=np.int64)])
+
+    def intern(self, text):
+        if is_empty_cell(text): return 0
+        text = str(text)
+        if text in self.label_ids: return self.label_ids[text]
+        lid = len(self.labels)
+        teachers = tuple(self.teacher_id(code) for code in extract_teacher_codes(text))
+        self.labels.append(text)
+        self.label_ids[text] = lid
+        self.label_teacher.append(teachers[0] if teachers else -1)
+        self.label_teachers.append(teachers)
+        self.label_shared.append(is_shared_label(text))
+        self.label_subject.append(extract_subject_code(text))
+        self.label_recess.append("RECESS" in text.upper())
+        return lid
+
+    # --- Mutasi sel (O(1) per langkah) ---
+    def _index(self, s, lid, delta):
+        teachers = self.label_teachers[lid]
+        if self.label_shared[lid]:
+            # Blok paralel: guru dihitung sekali per slot, berapapun kelasnya
+            n = self.shared_count.get((s, lid), 0) + delta
+            if n: self.shared_count[(s, lid)] = n
+            else: self.shared_count.pop((s, lid), None)
+            if n != (1 if delta > 0 else 0): teachers = ()
+        for t in teachers:
+            d = self.slot_day[s]
+            self.teacher_slot[s, t] += delta
+            self.teacher_day[t, d] += delta
+            bit = 1 << int(self.slot_bit[s])
+            if self.teacher_slot[s, t] > 0:
+                self.teacher_busy[t, d] |= bit
+            else:
+                self.teacher_busy[t, d] &= ~bit
+        if self.label_recess[lid]:
+            self.slot_recess[s] += delta
+
+    def place(self, s, c, lid):
+        old = int(self.grid[s, c])
+        if old == lid: return old
+        if old: self._index(s, old, -1)
+        self.grid[s, c] = lid
+        if lid: self._index(s, lid, +1)
+        bit = 1 << int(self.slot_bit[s])
+        if lid:
+            self.class_busy[c, self.slot_day[s]] |= bit
+        else:
+            self.class_busy[c, self.slot_day[s]] &= ~bit
+        return old
+
+    def set_fixed(self, mask):
+        self.fixed = np.asarray(mask, dtype=bool).copy()
+        self.fixed_slot = self.fixed.all(axis=1) if len(self.classes) else np.zeros(self.n_slots, dtype=bool)
+
+    def set_cell(self, day, period, cls, text):
+        return self.place(self.slot_index[(day, str(period))], self.class_ids[cls], self.intern(text))
+
+    def cell(self, s, c):
+        return self.labels[self.grid[s, c]]
+
+    # --- Query ---
+    def teacher_of(self, s, c):
+        return self.label_teacher[self.grid[s, c]]
+
+    def teachers_free(self, s, lid):
+        # Semua guru label lid kosong di slot s (sebelum label ditempatkan)
+        if self.label_shared[lid] and (s, lid) in self.shared_count: return True
+        for t in self.label_teachers[lid]:
+            if self.teacher_slot[s, t] > 0: return False
+        return True
+
+    def teacher_free(self, s, t, c):
+        # Guru t kosong di slot s, tidak menghitung isi sel (s, c) itu sendiri
+        busy = self.teacher_slot[s, t]
+        if self.teacher_of(s, c) == t: busy -= 1
+        return busy <= 0
+
+    def is_conflict(self, s, c):
+        if self.fixed[s, c]: return False
+        teachers = self.label_teachers[self.grid[s, c]]
+        if not teachers or self.slot_break[s] or self.slot_recess[s] > 0: return False
+        return any(self.teacher_slot[s, t] > 1 for t in teachers)
+
+    def conflict_cells(self, day):
+        coords = set()
+        for s in self.day_slots(day):
+            if self.slot_break[s] or self.slot_recess[s] > 0 or self.fixed_slot[s]: continue
+            if not (self.teacher_slot[s] > 1).any(): continue
+            for c in range(len(self.classes)):
+                if self.is_conflict(s, c):
+                    coords.add((self.slot_label[s], self.classes[c]))
+        return coords
+
+    def teacher_counts(self):
+        totals = self.teacher_slot.sum(axis=0)
+        return {code: int(totals[t]) for t, code in enumerate(self.teachers)}
+
+    def teacher_week_counts(self):
+        # JP per guru per minggu siklus (guru x minggu), dari indeks teacher_day
+        weeks = np.zeros((len(self.teachers), self.n_weeks), dtype=np.int32)
+        for w in range(self.n_weeks):
+            weeks[:, w] = self.teacher_day[:, self.day_week == w].sum(axis=1)
+        return weeks
+
+    # --- Konversi dari/ke DataFrame editor ---
+    def apply_frame(self, day, df):
+        # Terapkan isi DataFrame satu hari; kembalikan daftar sel yang berubah.
+        # Sel kegiatan tetap tidak ikut diubah (jumlahnya dicatat di fixed_rejected).
+        changes = []
+        self.fixed_rejected = 0
+        for cls in self.classes:
+            if cls not in df.columns: continue
+            c = self.class_ids[cls]
+            for period, val in df[cls].items():
+                s = self.slot_index.get((day, str(period)))
+                if s is None: continue
+                lid = self.intern(val)
+                if self.fixed[s, c]:
+                    self.fixed_rejected += lid != self.grid[s, c]
+                    continue
+                old = self.place(s, c, lid)
+                if old != lid: changes.append((s, c, old, lid))
+        return changes
+
+    def to_frame(self, day):
+        slots = self.day_slots(day)
+        index = [self.slot_label[s] for s in slots]
+        lookup = np.array([None] + self.labels[1:], dtype=object)
+        df = pd.DataFrame(lookup[self.grid[slots.start:slots.stop]], index=index, columns=self.classes)
+        df.insert(0, 'Waktu', [self.slot_time[s] for s in slots])
+        return df
+
+    def time_frame(self, day):
+        # Struktur waktu satu hari (Period/Type/Waktu) seperti keluaran Menu 2
+        slots = self.day_slots(day)
+        return pd.DataFrame({
+            'Period': [self.slot_label[s] for s in slots],
+            'Type': ['BREAK' if self.slot_break[s] else 'Class' for s in slots],
+            'Waktu': [self.slot_time[s] for s in slots],
+        })
+
+    def empty_like(self):
+        # Model kosong dengan struktur slot, kelas dan tabel label yang sama
+        clone = object.__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        clone.labels = self.labels[:]
+        clone.label_ids = dict(self.label_ids)
+        clone.label_teacher = self.label_teacher[:]
+        clone.label_teachers = self.label_teachers[:]
+        clone.label_shared = self.label_shared[:]
+        clone.shared_count = {}
+        clone.label_subject = self.label_subject[:]
+        clone.label_recess = self.label_recess[:]
+        clone.teachers = self.teachers[:]
+        clone.teacher_ids = dict(self.teacher_ids)
+        clone.grid = np.zeros_like(self.grid)
+        clone.fixed = self.fixed.copy()
+        clone.teacher_slot = np.zeros_like(self.teacher_slot)
+        clone.teacher_day = np.zeros_like(self.teacher_day)
+        clone.slot_recess = np.zeros_like(self.slot_recess)
+        clone.class_busy = np.zeros_like(self.class_busy)
+        clone.teacher_busy = np.zeros_like(self.teacher_busy)
+        return clone
+
+    def copy(self):
+        clone = self.empty_like()
+        clone.grid[:] = self.grid
+        clone.teacher_slot[:] = self.teacher_slot
+        clone.teacher_day[:] = self.teacher_day
+        clone.slot_recess[:] = self.slot_recess
+        clone.shared_count = dict(self.shared_count)
+        clone.class_busy[:] = self.class_busy
+        clone.teacher_busy[:] = self.teacher_busy
+        return clone
+
+    def rebuild_indexes(self):
+        # Hitung ulang semua indeks dari grid sekaligus (vektor), dipakai saat memuat grid utuh
+        n_teachers = len(self.teachers)
+        self.teacher_slot = np.zeros((self.n_slots, n_teachers), dtype=np.int16)
+        self.shared_count = {}
+        s_idx, c_idx = np.nonzero(self.grid)
+        lids = self.grid[s_idx, c_idx]
+
+        shared = np.array(self.label_shared, dtype=bool)[lids]
+        primary = np.array(self.label_teacher, dtype=np.int64)[lids]
+        single = ~shared & (primary >= 0)
+        np.add.at(self.teacher_slot, (s_idx[single], primary[single]), 1)
+
+        pairs, counts = np.unique(np.stack([s_idx[shared], lids[shared]], axis=1), axis=0, return_counts=True)
+        for (s, lid), n in zip(pairs.tolist(), counts.tolist()):
+            self.shared_count[(s, lid)] = n
+            for t in self.label_teachers[lid]:
+                self.teacher_slot[s, t] += 1
+
+        starts = self.day_offsets[:-1]
+        bits = np.left_shift(np.int64(1), self.slot_bit)
+        self.teacher_day = np.add.reduceat(self.teacher_slot, starts, axis=0).T.astype(np.int16) \
+            if self.n_slots else np.zeros((n_teachers, len(self.days)), dtype=np.int16)
+        self.teacher_busy = np.zeros((n_teachers, len(self.days)), dtype=np.int64)
+        self.class_busy = np.zeros((len(self.classes), len(self.days)), dtype=np.int64)
+        for d in range(len(self.days)):
+            a, b = self.day_offsets[d], self.day_offsets[d + 1]
+            self.teacher_busy[:, d] = ((self.teacher_slot[a:b] > 0).T * bits[a:b]).sum(axis=1)
+            self.class_busy[:, d] = ((self.grid[a:b] != 0).T * bits[a:b]).sum(axis=1)
+        self.slot_recess = np.array(self.label_recess, dtype=np.int16)[self.grid].sum(axis=1).astype(np.int16)
+
+    @classmethod
+    def from_grid(cls, classes, day_structures, labels, grid, teachers=()):
+        # Bangun model dari tabel label + grid integer (mis. hasil file proyek)
+        model = cls(classes, day_structures)
+        model.register_teachers(teachers)
+        for text in labels[1:]:
+            model.intern(text)
+        model.grid = np.asarray(grid, dtype=np.int32).copy()
+        model.rebuild_indexes()
+        return model
+
+    @classmethod
+    def from_frames(cls, classes, time_df, frames, days=DAYS, day_times=None):
+        model = cls(classes, day_structures(days, time_df, day_times))
+        for day, df in frames.items():
+            if day in model.day_ids and isinstance(df, pd.DataFrame):
+                model.apply_frame(day, df)
+        return model
@@ -0,0 +1,105 @@
+import json
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# PROFILER PER TAHAP (RING BUFFER)
+# ==========================================
+# Setiap tahap (baca Excel, deteksi bentrok, styling, beban guru, export, ...)
+# dicatat: waktu (ms), memori yang dialokasikan (KB, via tracemalloc) dan ukuran
+# input. Hanya N catatan terakhir yang disimpan. Saat dimatikan, `stage()`
+# hanya yield sehingga biaya di jalur normal praktis nol.
+#
+# tracemalloc berlaku untuk seluruh proses (semua sesi Streamlit): dinyalakan
+# sekali dan tidak pernah dimatikan/di-reset per sesi (tetap jalan sampai proses
+# berhenti walau profiler dimatikan lagi). Memori tiap tahap
+# dihitung dari selisih dua snapshot, bukan dari peak global yang bisa
+# di-reset sesi lain.
+
+# Alokasi milik tracemalloc/importlib sendiri tidak ikut dihitung
+SNAPSHOT_FILTERS = (tracemalloc.Filter(False, tracemalloc.__file__),
+                    tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"))
+
+
+def _snapshot():
+    return tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+
+
+class Profiler:
+    """Pencatat waktu/memori per tahap; satu objek per sesi."""
+
+    def __init__(self, capacity=2000):
+        self.records = deque(maxlen=capacity)
+        self.enabled = False
+        self.run_id = 0
+        self.run_kind = ""
+
+    def set_enabled(self, on):
+        if on and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.enabled = on
+
+    def begin_run(self, kind="halaman"):
+        self.run_id += 1
+        self.run_kind = kind
+
+    @contextmanager
+    def stage(self, name, **sizes):
+        if not self.enabled:
+            yield
+            return
+        before = _snapshot()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            ms = (time.perf_counter() - started) * 1000
+            diffs = [d.size_diff for d in _snapshot().compare_to(before, 'filename')]
+            self.records.append({
+                'run': self.run_id,
+                'kind': self.run_kind,
+                'stage': name,
+                'ms': round(ms, 3),
+                # bersih (baru - dibebaskan) dan total pertumbuhan per file sumber
+                'alloc_kb': round(sum(diffs) / 1024, 1),
+                'grow_kb': round(sum(d for d in diffs if d > 0) / 1024, 1),
+                'sizes': sizes,
+                'ts': time.time(),
+            })
+
+    def frame(self):
+        return pd.DataFrame(list(self.records),
+                            columns=['run', 'kind', 'stage', 'ms', 'alloc_kb', 'grow_kb', 'sizes', 'ts'])
+
+    def last_run(self):
+        """Rincian tahap pada rerun terakhir yang punya catatan."""
+        df = self.frame()
+        if df.empty: return df
+        last = df[df['run'] == df['run'].max()].copy()
+        last['sizes'] = last['sizes'].map(lambda d: ", ".join(f"{k}={v}" for k, v in d.items()))
+        return last[['kind', 'stage', 'ms', 'alloc_kb', 'grow_kb', 'sizes']]
+
+    def summary(self):
+        """Persentil waktu per tahap atas seluruh isi buffer."""
+        df = self.frame()
+        if df.empty: return df
+        rows = []
+        for name, grp in df.groupby('stage', sort=False):
+            ms = grp['ms'].to_numpy()
+            p50, p90, p99 = np.percentile(ms, [50, 90, 99])
+            rows.append({'stage': name, 'n': len(ms), 'p50 ms': round(p50, 1), 'p90 ms': round(p90, 1),
+                         'p99 ms': round(p99, 1), 'max ms': round(ms.max(), 1),
+                         'rata2 alloc KB': round(grp['alloc_kb'].mean(), 1)})
+        return pd.DataFrame(rows).sort_values('p90 ms', ascending=False, ignore_index=True)
+
+    def to_json(self, extra=None):
+        # Untuk dilampirkan ke tiket support
+        return json.dumps({'meta': extra or {}, 'records': list(self.records)}, ensure_ascii=False, indent=1)
+
+    def clear(self):
+        self.records.clear()
@@ -0,0 +1,97 @@
+import io
+import json
+
+import numpy as np
+import pandas as pd
+
+from scheduler.events import DEFAULT_EVENTS, compile_events
+from scheduler.model import ScheduleModel, day_structures
+from scheduler.teachers import TeacherRegistry
+
+# ==========================================
+# FILE PROYEK (.npz + HEADER JSON)
+# ==========================================
+# Isi file:
+#   header  -> JSON (uint8) : versi, kelas, hari, guru, tabel label,
+#                             struktur waktu (umum + per hari), data mapel, teks aturan,
+#                             kegiatan tetap, registri guru (nama/kode urut id)
+#   grid    -> int32 (slot x kelas) : id label per sel
+# Grid disimpan apa adanya sehingga memuat proyek cukup satu np.load lalu
+# rebuild_indexes(), tanpa mem-parsing ulang teks sel.
+
+PROJECT_FORMAT = "edunexus-jadwal"
+PROJECT_VERSION = 1
+
+
+def _records(df):
+    return json.loads(df.to_json(orient='records')) if isinstance(df, pd.DataFrame) else []
+
+
+def save_project(model, data_subjects, time_structure, days_present, rules_text="", events_text=None, day_times=None,
+                 teacher_registry=None):
+    """Simpan proyek ke bytes (.npz terkompresi)."""
+    header = {
+        'format': PROJECT_FORMAT,
+        'version': PROJECT_VERSION,
+        'classes': model.classes,
+        'days': model.days,
+        'days_present': [d for d in model.days if d in days_present],
+        'teachers': model.teachers,
+        'labels': model.labels,
+        'time_structure': _records(time_structure),
+        'day_time_structures': {d: _records(df) for d, df in (day_times or {}).items()},
+        'data_subjects': _records(data_subjects),
+        'rules_text': rules_text,
+        'events_text': events_text,
+        'teacher_registry': {'names': teacher_registry.names, 'codes': teacher_registry.codes}
+                            if teacher_registry is not None else None,
+    }
+    raw = np.frombuffer(json.dumps(header, ensure_ascii=False).encode('utf-8'), dtype=np.uint8)
+    out = io.BytesIO()
+    np.savez_compressed(out, header=raw, grid=model.grid)
+    return out.getvalue()
+
+
+def _registry_from_subjects(data_subjects):
+    # Proyek lama tanpa registri: urutkan menurut Teacher ID agar id lama dipertahankan
+    if data_subjects.empty or 'Teacher Name' not in data_subjects.columns: return TeacherRegistry()
+    if 'Teacher ID' in data_subjects.columns: data_subjects = data_subjects.sort_values('Teacher ID', kind='stable')
+    return TeacherRegistry.from_pairs(data_subjects['Teacher Name'], data_subjects['Teacher Initials'])
+
+
+def load_project(data):
+    """Muat proyek dari bytes/berkas; kembalikan dict siap dimasukkan ke session_state."""
+    with np.load(io.BytesIO(data) if isinstance(data, (bytes, bytearray)) else data) as npz:
+        header = json.loads(npz['header'].tobytes().decode('utf-8'))
+        grid = npz['grid']
+    if header.get('format') != PROJECT_FORMAT:
+        raise ValueError("Bukan file proyek jadwal.")
+    if header.get('version', 0) > PROJECT_VERSION:
+        raise ValueError("File proyek dibuat oleh versi aplikasi yang lebih baru.")
+
+    time_df = pd.DataFrame(header['time_structure'])
+    day_times = {d: pd.DataFrame(rows) for d, rows in header.get('day_time_structures', {}).items()}
+    data_subjects = pd.DataFrame(header['data_subjects'])
+    saved = header.get('teacher_registry')
+    registry = TeacherRegistry.from_pairs(saved['names'], saved['codes']) if saved else \
+        _registry_from_subjects(data_subjects)
+    model = ScheduleModel.from_grid(
+        header['classes'], day_structures(header['days'], time_df, day_times),
+        header['labels'], grid, header['teachers']
+    )
+    # Mask kegiatan tetap dihitung ulang dari teksnya (tidak disimpan di file)
+    # Teks kosong = sengaja tanpa kegiatan tetap; default hanya untuk file tanpa kunci ini
+    events_text = header.get('events_text', DEFAULT_EVENTS)
+    if events_text is None: events_text = DEFAULT_EVENTS
+    compile_events(events_text).apply(model)
+    return {
+        'model': model,
+        'data_subjects': data_subjects,
+        'data_classes': header['classes'],
+        'teacher_registry': registry,
+        'time_structure': time_df,
+        'day_time_structures': day_times,
+        'manual_schedule': {d: model.to_frame(d) for d in header['days_present']},
+        'rules_text': header.get('rules_text', ""),
+        'events_text': events_text,
+    }
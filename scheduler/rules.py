@@ -0,0 +1,210 @@
+from scheduler.model import DAYS, WEEK_NAMES, split_cycle_day
+
+# ==========================================
+# BAHASA ATURAN (DSL) -> FUNGSI CEK PER LANGKAH
+# ==========================================
+# Satu aturan per baris, baris diawali '#' adalah komentar:
+#
+#   max consecutive * 2            -> maks 2 JP beruntun mapel yang sama di satu kelas
+#   max consecutive MTK 3          -> khusus mapel MTK
+#   max daily teacher * 6          -> guru maks 6 JP per hari
+#   max daily teacher BUD 4        -> khusus guru BUD
+#   only UPACARA at Senin 1        -> UPACARA hanya boleh di Senin jam ke-1
+#   only PRAMUKA at Jumat 7,8
+#   only PRAKARYA in week A        -> siklus A/B: PRAKARYA hanya di minggu A
+#   forbid PJOK after break 2      -> PJOK tidak boleh setelah break ke-2
+#
+# Setiap aturan dikompilasi menjadi fungsi check(model, s, c, lid) yang
+# menjawab "bolehkah label lid berada di sel (slot s, kelas c)?" hanya
+# dengan melihat tetangga sel dan indeks model, bukan memindai seminggu.
+
+RULES_EXAMPLE = """# Contoh aturan (hapus tanda # untuk mengaktifkan)
+# max consecutive * 2
+# max daily teacher * 6
+# only UPACARA at Senin 1
+# forbid PJOK after break 2
+"""
+
+_DAY_ALIASES = {
+    "MONDAY": "Senin", "TUESDAY": "Selasa", "WEDNESDAY": "Rabu",
+    "THURSDAY": "Kamis", "FRIDAY": "Jumat",
+}
+_DAY_ALIASES.update({d.upper(): d for d in DAYS})
+
+
+class RuleError(ValueError):
+    pass
+
+
+class Rule:
+    def __init__(self, text, check):
+        self.text = text
+        self.check = check
+
+    def __repr__(self):
+        return f"Rule({self.text!r})"
+
+
+class RuleSet:
+    """Kumpulan aturan terkompilasi yang dipakai solver dan layar pantau."""
+
+    def __init__(self, rules=()):
+        self.rules = list(rules)
+
+    def __len__(self):
+        return len(self.rules)
+
+    def __bool__(self):
+        return bool(self.rules)
+
+    def allows(self, model, s, c, lid):
+        for rule in self.rules:
+            if not rule.check(model, s, c, lid): return False
+        return True
+
+    def violated(self, model, s, c, lid):
+        return [rule.text for rule in self.rules if not rule.check(model, s, c, lid)]
+
+    def violations(self, model, day):
+        # {(period, kelas): [aturan yang dilanggar]} untuk sel terisi di satu hari
+        found = {}
+        if not self.rules: return found
+        for s in model.day_slots(day):
+            for c in range(len(model.classes)):
+                lid = model.grid[s, c]
+                if not lid: continue
+                broken = self.violated(model, s, c, lid)
+                if broken: found[(model.slot_label[s], model.classes[c])] = broken
+        return found
+
+
+# --- FUNGSI BANTUAN: PENCOCOKAN LABEL ---
+def _subject_matcher(target):
+    # '*' hanya mencocokkan mapel yang punya guru (bukan RECESS/UPACARA)
+    if target == "*":
+        return lambda model, lid: model.label_teacher[lid] >= 0
+    return lambda model, lid: model.label_subject[lid] == target
+
+
+def _parse_int(token, line_no):
+    try:
+        value = int(token)
+    except ValueError:
+        raise RuleError(f"Baris {line_no}: '{token}' bukan angka.")
+    if value < 0: raise RuleError(f"Baris {line_no}: angka tidak boleh negatif.")
+    return value
+
+
+# --- KOMPILER SETIAP JENIS ATURAN ---
+def _compile_max_consecutive(target, limit):
+    matches = _subject_matcher(target)
+
+    def check(model, s, c, lid):
+        if not lid or not matches(model, lid): return True
+        subject = model.label_subject[lid]
+        d = model.slot_day[s]
+        start, stop = model.day_offsets[d], model.day_offsets[d + 1]
+        run = 1
+        k = s - 1
+        while k >= start and not model.slot_break[k] and model.label_subject[model.grid[k, c]] == subject:
+            run += 1; k -= 1
+        k = s + 1
+        while k < stop and not model.slot_break[k] and model.label_subject[model.grid[k, c]] == subject:
+            run += 1; k += 1
+        return run <= limit
+    return check
+
+
+def _compile_max_daily_teacher(target, limit):
+    def check(model, s, c, lid):
+        t = model.label_teacher[lid]
+        if t < 0: return True
+        if target != "*" and model.teachers[t] != target: return True
+        load = model.teacher_day[t, model.slot_day[s]] + 1
+        if model.teacher_of(s, c) == t: load -= 1
+        return load <= limit
+    return check
+
+
+def _compile_only(target, days, periods):
+    matches = _subject_matcher(target)
+
+    def check(model, s, c, lid):
+        if not lid or not matches(model, lid): return True
+        # Di siklus A/B, "Senin" berarti Senin setiap minggu
+        if days is not None and split_cycle_day(model.days[model.slot_day[s]])[0] not in days: return False
+        return periods is None or model.slot_label[s] in periods
+    return check
+
+
+def _compile_only_week(target, weeks):
+    matches = _subject_matcher(target)
+
+    def check(model, s, c, lid):
+        if not lid or not matches(model, lid): return True
+        return model.day_week[model.slot_day[s]] in weeks
+    return check
+
+
+def _compile_forbid_after_break(target, nth):
+    matches = _subject_matcher(target)
+
+    def check(model, s, c, lid):
+        if not lid or not matches(model, lid): return True
+        return model.slot_break_no[s] < nth
+    return check
+
+
+def _parse_days(token, line_no):
+    if token == "*": return None
+    days = set()
+    for part in token.split(","):
+        day = _DAY_ALIASES.get(part.strip().upper())
+        if day is None: raise RuleError(f"Baris {line_no}: hari '{part}' tidak dikenal.")
+        days.add(day)
+    return days
+
+
+def _parse_weeks(token, line_no):
+    weeks = set()
+    for part in token.split(","):
+        name = part.strip().upper()
+        if name not in WEEK_NAMES: raise RuleError(f"Baris {line_no}: minggu '{part}' tidak dikenal (A-D).")
+        weeks.add(WEEK_NAMES.index(name))
+    return weeks
+
+
+def _parse_periods(token):
+    if token == "*": return None
+    return {p.strip() for p in token.split(",") if p.strip()}
+
+
+def compile_rule(line, line_no=1):
+    tokens = line.split()
+    words = [t.lower() for t in tokens]
+
+    if words[:2] == ["max", "consecutive"] and len(tokens) == 4:
+        check = _compile_max_consecutive(tokens[2].upper(), _parse_int(tokens[3], line_no))
+    elif words[:3] == ["max", "daily", "teacher"] and len(tokens) == 5:
+        target = tokens[3] if tokens[3] == "*" else tokens[3].upper()
+        check = _compile_max_daily_teacher(target, _parse_int(tokens[4], line_no))
+    elif words[0] == "only" and len(tokens) in (4, 5) and words[2] == "at":
+        periods = _parse_periods(tokens[4]) if len(tokens) == 5 else None
+        check = _compile_only(tokens[1].upper(), _parse_days(tokens[3], line_no), periods)
+    elif words[0] == "only" and len(tokens) == 5 and words[2:4] == ["in", "week"]:
+        check = _compile_only_week(tokens[1].upper(), _parse_weeks(tokens[4], line_no))
+    elif words[0] == "forbid" and words[2:4] == ["after", "break"] and len(tokens) == 5:
+        check = _compile_forbid_after_break(tokens[1].upper(), _parse_int(tokens[4], line_no))
+    else:
+        raise RuleError(f"Baris {line_no}: aturan '{line}' tidak dikenali.")
+    return Rule(" ".join(tokens), check)
+
+
+def compile_rules(text):
+    """Kompilasi teks aturan (satu per baris) menjadi RuleSet."""
+    rules = []
+    for line_no, raw in enumerate(str(text or "").splitlines(), start=1):
+        line = raw.split("#", 1)[0].strip()
+        if not line: continue
+        rules.append(compile_rule(line, line_no))
+    return RuleSet(rules)
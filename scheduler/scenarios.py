@@ -0,0 +1,100 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from scheduler.events import DEFAULT_EVENTS, compile_events
+from scheduler.metrics import teacher_idle_gaps
+from scheduler.model import DAYS, ScheduleModel, cycle_days, day_structures, split_cycle_day
+from scheduler.rules import compile_rules
+from scheduler.solver import solve
+from scheduler.timestructure import build_time_structure, end_of_day, parse_break_spec, parse_clock
+
+# ==========================================
+# MODE SKENARIO (WHAT-IF) STRUKTUR WAKTU
+# ==========================================
+# Setiap skenario dibangun dengan logika Menu 2, lalu diselesaikan dari nol
+# di proses terpisah. Data yang dikirim ke worker hanya DataFrame/teks biasa
+# (aturan dikompilasi ulang di worker karena closure tidak bisa di-pickle).
+
+
+def teacher_gaps(model):
+    """Jumlah jam kosong guru di antara jam mengajar pertama dan terakhir tiap hari."""
+    return int(teacher_idle_gaps(model).sum())
+
+
+def time_structure_from_config(config):
+    # config: {'Jam Masuk': "07:00", 'Durasi JP': 35, 'Total JP': 9, 'Break': "4:15, 6:30", 'Minggu': 1}
+    return build_time_structure(
+        parse_clock(config['Jam Masuk']), int(config['Durasi JP']), int(config['Total JP']),
+        parse_break_spec(config.get('Break', ""))
+    )
+
+
+def day_times_from_config(config):
+    # 'Per Hari' (opsional) menimpa config umum untuk hari tertentu, mis.
+    # {"Jumat": {"Total JP": 6}, "Senin": {"Break": "0:30, 4:15, 6:30"}}
+    day_times = {}
+    for day, override in (config.get('Per Hari') or {}).items():
+        if split_cycle_day(day)[0] not in DAYS:
+            raise ValueError(f"Hari '{day}' pada 'Per Hari' tidak dikenal.")
+        day_times[day] = time_structure_from_config({**config, **override})
+    return day_times
+
+
+def config_days(config):
+    # Kolom 'Minggu' (opsional): panjang siklus, 2 = jadwal minggu A/B
+    weeks = config.get('Minggu')
+    return cycle_days(1 if weeks is None or weeks != weeks else int(weeks))
+
+
+def prepare_model(classes, subjects, time_df, days=DAYS, events_text=DEFAULT_EVENTS, day_times=None):
+    """Model kosong berisi kegiatan tetap (default: RECESS di semua slot break), seperti grid awal Menu 3."""
+    model = ScheduleModel(classes, day_structures(days, time_df, day_times))
+    model.register_teachers(subjects['Teacher Initials'])
+    compile_events(events_text).apply(model)
+    return model
+
+
+def end_times(days, time_df, day_times=None):
+    """Jam pulang per hari: "13:50" jika semua sama, selain itu "13:50 (Jumat 11:00)"."""
+    by_base = {}
+    for d, df in day_structures(days, time_df, day_times):
+        by_base.setdefault(split_cycle_day(d)[0], {})[d] = end_of_day(df)
+    # Siklus A/B: "Jumat" cukup sekali jika jam pulangnya sama di semua minggu
+    ends = {}
+    for base, per_week in by_base.items():
+        ends.update({base: next(iter(per_week.values()))} if len(set(per_week.values())) == 1 else per_week)
+    values = list(ends.values())
+    common = max(values, key=values.count)
+    others = [f"{d} {end}" for d, end in ends.items() if end != common]
+    return f"{common} ({', '.join(others)})" if others else common
+
+
+def run_scenario(config, classes, subjects, rules_text="", seed=0, events_text=DEFAULT_EVENTS):
+    """Bangun struktur waktu dari `config`, selesaikan, dan kembalikan ringkasan."""
+    started = time.perf_counter()
+    time_df = time_structure_from_config(config)
+    days, day_times = config_days(config), day_times_from_config(config)
+    model = prepare_model(classes, subjects, time_df, days, events_text, day_times)
+
+    unassigned = solve(model, subjects, compile_rules(rules_text), seed=seed)
+    missing = sum(u['Missing'] for u in unassigned)
+    return {
+        'Skenario': config['Nama'],
+        'Layak': not unassigned,
+        'Pelajaran Gagal': len(unassigned),
+        'JP Tidak Terplot': missing,
+        'Jam Kosong Guru': teacher_gaps(model),
+        'Slot/Minggu': int((~model.slot_break).sum()) // model.n_weeks,
+        'Pulang': end_times(days, time_df, day_times),
+        'Seed': seed,
+        'Waktu Hitung (s)': round(time.perf_counter() - started, 2),
+    }
+
+
+def run_scenarios(configs, classes, subjects, rules_text="", seed=0, max_workers=None, events_text=DEFAULT_EVENTS):
+    """Jalankan banyak skenario paralel (satu proses per skenario)."""
+    if len(configs) <= 1:
+        return [run_scenario(cfg, classes, subjects, rules_text, seed, events_text) for cfg in configs]
+    with ProcessPoolExecutor(max_workers=max_workers or min(len(configs), 4)) as pool:
+        futures = [pool.submit(run_scenario, cfg, classes, subjects, rules_text, seed, events_text) for cfg in configs]
+        return [f.result() for f in futures]
@@ -0,0 +1,274 @@
+import argparse
+import hashlib
+import io
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from scheduler.events import DEFAULT_EVENTS, compile_events
+from scheduler.export import export_workbook
+from scheduler.rules import compile_rules
+from scheduler.scenarios import config_days, day_times_from_config, prepare_model, teacher_gaps, time_structure_from_config
+from scheduler.solver import format_unassigned, solve
+from scheduler.upload import read_template_workbook, subjects_from_template
+
+# ==========================================
+# LAYANAN HTTP PENJADWALAN (TANPA STREAMLIT)
+# ==========================================
+# Alur sama dengan aplikasi: template -> struktur waktu -> isi otomatis -> export.
+#
+#   POST /jobs               kirim pekerjaan (JSON, atau file template .xlsx mentah
+#                            dengan parameter waktu di query string)
+#   GET  /jobs               daftar pekerjaan
+#   GET  /jobs/<id>          status + ringkasan
+#   GET  /jobs/<id>/result   file Jadwal_Siap_Cetak.xlsx
+#   GET  /health
+#
+# Id pekerjaan = sha256 isi kiriman, jadi kiriman ulang yang identik tidak
+# diselesaikan dua kali. Solver berjalan di pool proses; server HTTP berbasis
+# thread sehingga polling tidak pernah menunggu solver.
+#
+# Contoh:
+#   python -m scheduler.service --port 8765 --workers 4
+#   curl -X POST --data-binary @Template.xlsx \
+#        "http://127.0.0.1:8765/jobs?jam_masuk=07:00&durasi_jp=35&total_jp=9&break=4:15,6:30&minggu=2"
+#
+# Struktur waktu per hari (JSON): "time": {..., "Per Hari": {"Jumat": {"Total JP": 6},
+#                                                            "Senin": {"Break": "0:30, 4:15"}}}
+
+DEFAULT_TIME = {'Jam Masuk': "07:00", 'Durasi JP': 35, 'Total JP': 9, 'Break': "4:15, 6:30"}
+QUERY_TIME_KEYS = {'jam_masuk': 'Jam Masuk', 'durasi_jp': 'Durasi JP', 'total_jp': 'Total JP', 'break': 'Break',
+                   'minggu': 'Minggu'}
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def run_job(job):
+    """Dijalankan di proses worker: selesaikan satu sekolah dan kembalikan (ringkasan, xlsx)."""
+    started = time.perf_counter()
+    subjects = pd.DataFrame(job['subjects'])
+    rules_text = job.get('rules') or ""
+    time_df = time_structure_from_config(job['time'])
+    classes = sorted(subjects['Class'].unique().tolist())
+    model = prepare_model(classes, subjects, time_df, config_days(job['time']), job.get('events', DEFAULT_EVENTS),
+                          day_times_from_config(job['time']))
+    unassigned = solve(model, subjects, compile_rules(rules_text), seed=job.get('seed', 0))
+
+    summary = {
+        'kelas': len(classes),
+        'minggu_per_siklus': model.n_weeks,
+        'guru': len(model.teachers),
+        'layak': not unassigned,
+        'pelajaran_gagal': len(unassigned),
+        'jp_tidak_terplot': sum(u['Missing'] for u in unassigned),
+        'gagal': format_unassigned(unassigned),
+        'seed': job.get('seed', 0),
+        'jam_kosong_guru': teacher_gaps(model),
+        'waktu_hitung_s': round(time.perf_counter() - started, 3),
+    }
+    return summary, export_workbook(model, model.days)
+
+
+def job_key(job):
+    # Hash isi yang sudah diparse (bukan byte file): file .xlsx yang disimpan ulang
+    # tanpa perubahan data tetap dianggap kiriman yang sama
+    canonical = json.dumps(job, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:32]
+
+
+class JobService:
+    """Antrian pekerjaan dalam proses + pool worker solver."""
+
+    def __init__(self, workers=2, keep=500):
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        self.workers = workers
+        self.keep = keep
+        self.jobs = OrderedDict()
+        self.futures = {}
+        self.lock = threading.Lock()
+
+    def submit(self, job):
+        """Kembalikan (id, True jika kiriman identik sudah ada)."""
+        key = job_key(job)
+        with self.lock:
+            entry = self.jobs.get(key)
+            if entry and entry['status'] != 'failed':
+                return key, True
+            entry = {'id': key, 'status': 'queued', 'submitted': time.time(), 'finished': None,
+                     'summary': None, 'error': None, 'result': None}
+            self.jobs[key] = entry
+            self._evict()
+        try:
+            future = self.pool.submit(run_job, job)
+        except Exception as e:
+            # Pool rusak / sudah ditutup: pekerjaan tidak boleh tertahan 'queued' selamanya
+            with self.lock:
+                entry['status'], entry['finished'] = 'failed', time.time()
+                entry['error'] = f"{type(e).__name__}: {e}"
+            return key, False
+        with self.lock:
+            self.futures[key] = future
+        # Di luar lock: callback langsung dipanggil di thread ini jika future sudah selesai
+        future.add_done_callback(lambda f, key=key: self._finish(key, f))
+        return key, False
+
+    def _finish(self, key, future):
+        with self.lock:
+            entry = self.jobs.get(key)
+            if entry is None: return
+            entry['finished'] = time.time()
+            self.futures.pop(key, None)
+            try:
+                entry['summary'], entry['result'] = future.result()
+                entry['status'] = 'done'
+            except Exception as e:
+                entry['status'] = 'failed'
+                entry['error'] = f"{type(e).__name__}: {e}"
+
+    def _evict(self):
+        # Buang pekerjaan selesai paling lama jika melebihi batas simpan
+        while len(self.jobs) > self.keep:
+            old = next((k for k, v in self.jobs.items() if v['status'] in ('done', 'failed')), None)
+            if old is None: break
+            del self.jobs[old]
+            self.futures.pop(old, None)
+
+    def status(self, key):
+        with self.lock:
+            entry = self.jobs.get(key)
+            if entry is None: return None
+            info = {k: v for k, v in entry.items() if k != 'result'}
+            future = self.futures.get(key)
+            if info['status'] == 'queued' and future is not None and future.running():
+                info['status'] = 'running'
+        info['queue'] = self.queue_length()
+        return info
+
+    def result(self, key):
+        """Kembalikan (status, xlsx) dalam satu lock; (None, None) jika pekerjaan tidak ada."""
+        with self.lock:
+            entry = self.jobs.get(key)
+            if entry is None: return None, None
+            return entry['status'], entry['result']
+
+    def queue_length(self):
+        return sum(1 for v in self.jobs.values() if v['status'] == 'queued')
+
+    def listing(self):
+        with self.lock:
+            return [{'id': k, 'status': v['status'], 'submitted': v['submitted']} for k, v in self.jobs.items()]
+
+    def shutdown(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+
+def parse_submission(body, content_type, query):
+    """Ubah request POST /jobs menjadi dict pekerjaan (bisa di-pickle ke worker)."""
+    params = {k: v[-1] for k, v in parse_qs(query).items()}
+    if content_type.startswith("application/json"):
+        payload = json.loads(body or b"{}")
+        if not payload.get('subjects'):
+            raise ValueError("Field 'subjects' (baris template) wajib diisi.")
+        subjects, rules_text = subjects_from_template(pd.DataFrame(payload['subjects'])), None
+        time_cfg, rules, seed = payload.get('time', {}), payload.get('rules'), payload.get('seed', 0)
+        events = payload.get('events', DEFAULT_EVENTS)
+    else:
+        if not body:
+            raise ValueError("Body kosong: kirim file template .xlsx atau JSON.")
+        subjects, rules_text = read_template_workbook(io.BytesIO(body))
+        time_cfg = {QUERY_TIME_KEYS[k]: v for k, v in params.items() if k in QUERY_TIME_KEYS}
+        rules, seed, events = params.get('rules'), params.get('seed', 0), params.get('events', DEFAULT_EVENTS)
+    # Template diparse di thread request: error format langsung kembali ke klien (400)
+    job = {
+        'subjects': json.loads(subjects.to_json(orient='records')),
+        'time': {**DEFAULT_TIME, **time_cfg},
+        'rules': rules if rules is not None else (rules_text or ""),
+        'seed': int(seed),
+        # "" = sengaja tanpa kegiatan tetap (bukan kembali ke default)
+        'events': DEFAULT_EVENTS if events is None else events,
+    }
+    time_structure_from_config(job['time'])
+    day_times_from_config(job['time'])
+    compile_events(job['events'])
+    return job
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    service = None  # diisi oleh make_server
+
+    def _send(self, code, payload=None, body=None, content_type="application/json"):
+        data = body if body is not None else json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        parts = [p for p in urlparse(self.path).path.split("/") if p]
+        if parts == ['health']:
+            return self._send(200, {'ok': True, 'workers': self.service.workers,
+                                    'antrian': self.service.queue_length()})
+        if parts == ['jobs']:
+            return self._send(200, self.service.listing())
+        if len(parts) == 2 and parts[0] == 'jobs':
+            info = self.service.status(parts[1])
+            return self._send(200, info) if info else self._send(404, {'error': "Pekerjaan tidak ditemukan."})
+        if len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'result':
+            status, data = self.service.result(parts[1])
+            if status is None:
+                return self._send(404, {'error': "Pekerjaan tidak ditemukan."})
+            if status != 'done' or data is None:
+                return self._send(409, {'error': f"Hasil pekerjaan belum tersedia ({status})."})
+            return self._send(200, body=data, content_type=XLSX_MIME)
+        self._send(404, {'error': "Alamat tidak dikenal."})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path.rstrip("/") != "/jobs":
+            return self._send(404, {'error': "Alamat tidak dikenal."})
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        try:
+            job = parse_submission(body, self.headers.get("Content-Type", ""), url.query)
+        except Exception as e:
+            return self._send(400, {'error': f"{type(e).__name__}: {e}"})
+        key, duplicate = self.service.submit(job)
+        self._send(200 if duplicate else 202, {'id': key, 'deduplicated': duplicate,
+                                               'status': self.service.status(key)['status']})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(host="127.0.0.1", port=8765, workers=2):
+    service = JobService(workers)
+    handler = type("Handler", (ServiceHandler,), {'service': service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server, service
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Layanan HTTP penjadwalan EDUNEXUS")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=2, help="jumlah proses solver")
+    args = parser.parse_args(argv)
+    server, service = make_server(args.host, args.port, args.workers)
+    print(f"Layanan jadwal aktif di http://{args.host}:{server.server_port} ({args.workers} worker)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
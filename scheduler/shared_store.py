@@ -0,0 +1,109 @@
+import sqlite3
+import time
+from contextlib import contextmanager
+
+# ==========================================
+# PENYIMPANAN BERSAMA (SQLite WAL) UNTUK BANYAK KOORDINATOR
+# ==========================================
+# Satu baris per sel (hari, jam, kelas) dengan nomor versi. Setiap commit
+# menaikkan versi global satu kali; sel yang ditulis mendapat versi itu.
+#   - Tulis: compare-and-set per sel (versi yang diharapkan harus sama).
+#   - Baca : sesi hanya menarik baris dengan versi > versi terakhir yang ia lihat.
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cells (
+    day        TEXT NOT NULL,
+    period     TEXT NOT NULL,
+    class      TEXT NOT NULL,
+    value      TEXT,
+    version    INTEGER NOT NULL,
+    updated_by TEXT,
+    updated_at REAL,
+    PRIMARY KEY (day, period, class)
+);
+CREATE INDEX IF NOT EXISTS cells_version ON cells(version);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO meta(key, value) VALUES ('version', 0);
+"""
+
+
+class SharedStore:
+    """Jadwal bersama di file SQLite; aman dipakai banyak sesi/proses sekaligus."""
+
+    def __init__(self, path, timeout=10.0):
+        self.path = path
+        self.timeout = timeout
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # Koneksi per operasi: aman lintas thread rerun Streamlit
+        conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        try:
+            conn.execute("PRAGMA synchronous=NORMAL")
+            yield conn
+        finally:
+            conn.close()
+
+    def head(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT value FROM meta WHERE key='version'").fetchone()[0]
+
+    def commit_cells(self, changes, editor=""):
+        """Tulis banyak sel dalam satu transaksi dengan compare-and-set.
+
+        `changes`: list of (day, period, kelas, nilai baru, versi yang diharapkan).
+        Versi 0 berarti sel belum pernah ditulis. Mengembalikan (versi baru,
+        daftar konflik [(day, period, kelas, nilai server, versi server)]).
+        Sel yang konflik tidak ditulis; sel lain tetap tersimpan.
+        """
+        conflicts = []
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                version = conn.execute("SELECT value FROM meta WHERE key='version'").fetchone()[0] + 1
+                now = time.time()
+                written = 0
+                for day, period, cls, value, expected in changes:
+                    key = (day, str(period), cls)
+                    cur = conn.execute(
+                        "UPDATE cells SET value=?, version=?, updated_by=?, updated_at=? "
+                        "WHERE day=? AND period=? AND class=? AND version=?",
+                        (value, version, editor, now, *key, expected))
+                    if cur.rowcount == 0 and expected == 0:
+                        cur = conn.execute(
+                            "INSERT OR IGNORE INTO cells(day, period, class, value, version, updated_by, updated_at) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?)", (*key, value, version, editor, now))
+                    if cur.rowcount == 0:
+                        row = conn.execute("SELECT value, version FROM cells WHERE day=? AND period=? AND class=?",
+                                           key).fetchone()
+                        conflicts.append((*key, *(row or (None, 0))))
+                    else:
+                        written += 1
+                if written:
+                    conn.execute("UPDATE meta SET value=? WHERE key='version'", (version,))
+                    conn.execute("COMMIT")
+                else:
+                    conn.execute("ROLLBACK")
+                    version -= 1
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return version, conflicts
+
+    def commit_cell(self, day, period, cls, value, expected, editor=""):
+        version, conflicts = self.commit_cells([(day, period, cls, value, expected)], editor)
+        return not conflicts, version, conflicts
+
+    def pull(self, since=0):
+        """Baris yang berubah sejak versi `since`: (rows, versi terbaru)."""
+        with self._connect() as conn:
+            conn.execute("BEGIN")
+            head = conn.execute("SELECT value FROM meta WHERE key='version'").fetchone()[0]
+            rows = conn.execute(
+                "SELECT day, period, class, value, version FROM cells WHERE version > ? AND version <= ?",
+                (since, head)).fetchall()
+            conn.execute("COMMIT")
+        return rows, head
@@ -0,0 +1,216 @@
+import random
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from scheduler.blocks import block_starts, place_block
+from scheduler.model import lesson_label
+
+
+# ==========================================
+# GENERATOR OTOMATIS (GREEDY ACAK)
+# ==========================================
+# Semua keacakan berasal dari satu random.Random(seed). Seed yang sama pada
+# data dan grid awal yang sama selalu menghasilkan jadwal yang sama, sehingga
+# hasil bisa diulang dan dibandingkan (lihat scheduler.benchmark).
+DEFAULT_SEED = 0
+
+
+def cycle_periods(subjects, weeks=1):
+    """Target JP per siklus tiap baris: 'Periods/Cycle' jika diisi, selain itu JP/minggu x jumlah minggu.
+
+    Mapel dua mingguan (rata-rata 1 JP/minggu, 2 JP di minggu A dan 0 di minggu B)
+    cukup diberi 'Periods/Cycle' = 2 pada siklus dua minggu.
+    """
+    periods = subjects['Periods/Week'].astype(int) * weeks
+    if 'Periods/Cycle' in subjects.columns:
+        per_cycle = pd.to_numeric(subjects['Periods/Cycle'], errors='coerce')
+        periods = per_cycle.fillna(periods).astype(int)
+    return periods
+
+
+def floating_rows(subjects):
+    """Mask baris yang targetnya per siklus ('Periods/Cycle' diisi); baris lain wajib rata tiap minggu."""
+    if 'Periods/Cycle' not in subjects.columns: return pd.Series(False, index=subjects.index)
+    return pd.to_numeric(subjects['Periods/Cycle'], errors='coerce').notna()
+
+
+def lesson_demands(model, subjects):
+    # Gabungkan baris data_subjects menjadi kebutuhan per (kelas, label) untuk satu siklus.
+    # 'Weekly' = JP yang wajib ada di SETIAP minggu, 'Floating' = JP per siklus yang
+    # boleh jatuh di minggu mana saja; Need = Weekly x jumlah minggu + Floating.
+    demands = {}
+    blocks = subjects['Block Length'] if 'Block Length' in subjects.columns else [1] * len(subjects)
+    for cls, name, code, ini, weekly, periods, floating, block in zip(
+            subjects['Class'].astype(str), subjects['Subject Name'], subjects['Subject Code'],
+            subjects['Teacher Initials'], subjects['Periods/Week'], cycle_periods(subjects, model.n_weeks),
+            floating_rows(subjects), blocks):
+        if cls not in model.class_ids: continue
+        lid = model.intern(lesson_label(code, ini))
+        key = (model.class_ids[cls], lid)
+        if key not in demands:
+            demands[key] = {'Class': cls, 'Subject Name': name, 'Need': 0, 'Weekly': 0, 'Floating': 0, 'Block': 1}
+        demands[key]['Need'] += int(periods)
+        if floating or model.n_weeks == 1:
+            demands[key]['Floating'] += int(periods)
+        else:
+            demands[key]['Weekly'] += int(weekly)
+        if not pd.isna(block):
+            demands[key]['Block'] = max(demands[key]['Block'], int(block))
+    return demands
+
+
+def week_excess(model, demands):
+    """JP yang menumpuk di satu minggu melebihi jatah mingguan (+ bagian mengambang); 0 = rata."""
+    slot_week = model.day_week[model.slot_day]
+    total = 0
+    for (c, lid), info in demands.items():
+        if not info.get('Weekly'): continue
+        counts = np.bincount(slot_week[model.grid[:, c] == lid], minlength=model.n_weeks)
+        total += max(int(np.maximum(counts - info['Weekly'], 0).sum()) - info.get('Floating', 0), 0)
+    return total
+
+
+def solve(model, subjects, rules=None, rng=None, seed=DEFAULT_SEED):
+    """Isi sel kosong pada model dengan pelajaran yang belum terplot.
+
+    Sel yang sudah diisi manual dipertahankan dan dihitung sebagai JP terplot.
+    Setiap kandidat dicek dengan indeks model (sel kosong, guru bebas) dan
+    aturan terkompilasi yang sama dengan layar pantau. Urutan acak ditentukan
+    `seed` (atau `rng` jika diberikan). Pada siklus A/B, JP/minggu dipenuhi di
+    setiap minggu; hanya baris 'Jam per Siklus' yang bebas berpindah minggu.
+    Mengembalikan daftar pelajaran yang masih kurang.
+    """
+    return solve_demands(model, lesson_demands(model, subjects), rules, rng, seed)
+
+
+def _week_parts(info, n_weeks):
+    # Bagian kebutuhan: (minggu, JP) untuk setiap minggu, lalu (None, JP) yang mengambang.
+    # Kebutuhan lama tanpa 'Weekly'/'Floating' dianggap mengambang seluruhnya.
+    weekly = info.get('Weekly', 0)
+    floating = info.get('Floating', info['Need'] - weekly * n_weeks)
+    parts = [(w, weekly) for w in range(n_weeks) if weekly > 0]
+    if floating > 0: parts.append((None, floating))
+    return parts
+
+
+def _missing(n_weeks, placed, parts):
+    # Sisa per bagian: kelebihan di suatu minggu ikut menutup bagian mengambang
+    weekly = {w: n for w, n in parts if w is not None}
+    missing = {w: max(n - placed[w], 0) for w, n in weekly.items()}
+    extra = sum(max(placed[w] - weekly.get(w, 0), 0) for w in range(n_weeks))
+    floating = sum(n for w, n in parts if w is None)
+    missing[None] = max(floating - extra, 0)
+    return missing
+
+
+def solve_demands(model, demands, rules=None, rng=None, seed=DEFAULT_SEED):
+    # demands: {(id kelas, id label): {'Class', 'Subject Name', 'Need', 'Weekly', 'Floating', 'Block'}}
+    rng = rng or random.Random(seed)
+    n_weeks = model.n_weeks
+    slot_week = model.day_week[model.slot_day]
+    placed = Counter()                              # (id kelas, id label, minggu) -> JP terplot
+    for c in range(len(model.classes)):
+        placed.update((c, int(lid), int(slot_week[s])) for s, lid in enumerate(model.grid[:, c]) if lid)
+
+    # Slot break dan slot yang seluruhnya kegiatan tetap bukan domain solver
+    open_slots = np.flatnonzero(~model.slot_break & ~model.fixed_slot)
+    week_slots = {w: open_slots[slot_week[open_slots] == w].tolist() for w in range(n_weeks)}
+    week_slots[None] = open_slots.tolist()
+    week_days = {w: [d for d in range(len(model.days)) if model.day_week[d] == w] for w in range(n_weeks)}
+    week_days[None] = list(range(len(model.days)))
+    missing = Counter()
+
+    def remaining(c, lid, w, parts):
+        return _missing(n_weeks, {k: placed[(c, lid, k)] for k in range(n_weeks)}, parts)[w]
+
+    # Blok peminatan (label bersama) dulu: diplot serentak di semua kelas peserta
+    shared = {}
+    for (c, lid), info in demands.items():
+        if model.label_shared[lid]: shared.setdefault(lid, []).append((c, info))
+    shared_order = list(shared.items())
+    rng.shuffle(shared_order)
+    for lid, members in shared_order:
+        _place_shared(model, lid, members, placed, week_slots, rules, rng, missing)
+
+    # Satu unit kerja per (minggu, kelas, mapel); bagian mengambang setelah semua minggu
+    # terisi rata agar JP per siklus hanya mengisi sisa, bukan menggeser jatah mingguan
+    weekly_items, floating_items = [], []
+    for (c, lid), info in demands.items():
+        if model.label_shared[lid]: continue
+        parts = _week_parts(info, n_weeks)
+        for w, _ in parts:
+            (floating_items if w is None else weekly_items).append((w, c, lid, info, parts))
+    rng.shuffle(weekly_items)
+    rng.shuffle(floating_items)
+    for w, c, lid, info, parts in weekly_items + floating_items:
+        need = remaining(c, lid, w, parts)
+        if need <= 0: continue
+
+        # Blok dulu (maks. satu blok per hari): geser bitmask di setiap hari minggu itu.
+        # Hanya sisa Need % Block yang boleh diplot sebagai JP tunggal.
+        length = info.get('Block', 1)
+        singles = need
+        if length > 1:
+            blocks, singles = divmod(need, length)
+            days = week_days[w][:]
+            rng.shuffle(days)
+            for d in days:
+                if blocks <= 0: break
+                starts = block_starts(model, d, c, lid, length)
+                rng.shuffle(starts)
+                for p in starts:
+                    if place_block(model, d, p, c, lid, length, rules):
+                        blocks -= 1
+                        need -= length
+                        placed[(c, lid, int(model.day_week[d]))] += length
+                        break
+
+        candidates = week_slots[w][:]
+        rng.shuffle(candidates)
+        for s in candidates:
+            if singles <= 0: break
+            if model.grid[s, c] or model.fixed[s, c]: continue
+            if not model.teachers_free(s, lid): continue
+            if rules and not rules.allows(model, s, c, lid): continue
+            model.place(s, c, lid)
+            placed[(c, lid, int(slot_week[s]))] += 1
+            need -= 1
+            singles -= 1
+        if need > 0: missing[(c, lid)] += need
+
+    unassigned = []
+    for (c, lid), info in demands.items():
+        if missing[(c, lid)] > 0:
+            unassigned.append({'Class': info['Class'], 'Subject Name': info['Subject Name'],
+                               'Label': model.labels[lid], 'Missing': missing[(c, lid)]})
+    return unassigned
+
+
+def _place_shared(model, lid, members, placed, week_slots, rules, rng, missing):
+    classes = [c for c, _ in members]
+    n_weeks = model.n_weeks
+    slot_week = model.day_week[model.slot_day]
+    # Bagian terbesar di antara kelas peserta (blok bersama = satu jadwal untuk semua)
+    parts = max((_week_parts(info, n_weeks) for _, info in members), key=lambda p: sum(n for _, n in p))
+    for w, _ in parts:
+        need = max(_missing(n_weeks, {k: placed[(c, lid, k)] for k in range(n_weeks)}, parts)[w] for c in classes)
+        candidates = week_slots[w][:]
+        rng.shuffle(candidates)
+        for s in candidates:
+            if need <= 0: break
+            if model.grid[s, classes].any() or model.fixed[s, classes].any(): continue
+            if not model.teachers_free(s, lid): continue
+            if rules and not all(rules.allows(model, s, c, lid) for c in classes): continue
+            for c in classes:
+                model.place(s, c, lid)
+                placed[(c, lid, int(slot_week[s]))] += 1
+            need -= 1
+        if need > 0:
+            for c in classes:
+                missing[(c, lid)] += need
+
+
+def format_unassigned(items):
+    return [f"{u['Subject Name']} - {u['Class']} (Missing {u['Missing']} slots)" for u in items]
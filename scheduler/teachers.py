@@ -0,0 +1,282 @@
+import re
+from difflib import SequenceMatcher
+
+import pandas as pd
+
+# ==========================================
+# REGISTRI GURU (ID TETAP + KODE UNIK)
+# ==========================================
+# Kode inisial lama ("BUD") bisa sama untuk dua orang berbeda. Registri
+# memberi setiap nama satu id integer dan satu kode tampilan yang dijamin
+# unik. Tabrakan diselesaikan deterministik: nama diurutkan per kelompok kode
+# dasar, nama pertama memegang kode dasar, sisanya mencoba kode alternatif
+# lalu kode dasar + angka.
+#
+# Kode tersimpan di sel jadwal, jadi registri disimpan di session/proyek dan
+# hanya diperluas: guru yang sudah terdaftar tidak pernah berganti id/kode
+# ketika upload berikutnya membawa guru baru.
+
+
+def name_key(name):
+    # Kunci identitas: huruf kecil, spasi dirapikan
+    return re.sub(r'\s+', ' ', str(name or "")).strip().casefold()
+
+
+def base_initials(full_name):
+    # Aturan lama create_initials: huruf pertama kata 1 + dua huruf kata 2
+    if not isinstance(full_name, str) or not full_name.strip(): return "???"
+    parts = full_name.strip().split()
+    if len(parts) >= 2:
+        return (parts[0][0] + parts[1][:2]).upper()
+    return parts[0][:3].upper()
+
+
+def _alternatives(full_name):
+    # Kandidat kode lain yang masih mudah dibaca, urutan tetap
+    parts = [re.sub(r'[^A-Za-z]', '', p) for p in str(full_name).split()]
+    parts = [p.upper() for p in parts if p]
+    if not parts: return
+    if len(parts) >= 3:
+        yield parts[0][0] + parts[1][0] + parts[2][0]
+        yield parts[0][0] + parts[-1][:2]
+    if len(parts) >= 2:
+        yield parts[0][:2] + parts[1][0]
+        yield parts[0][0] + parts[1][0] + parts[1][-1]
+        yield parts[0][0] + parts[-1][0] + parts[-1][1:3]
+    yield parts[0][:2] + parts[-1][-1]
+
+
+class TeacherRegistry:
+    """Pemetaan nama guru -> (id integer tetap, kode unik)."""
+
+    def __init__(self):
+        self.names = []        # id -> nama tampilan
+        self.codes = []        # id -> kode unik
+        self.by_key = {}       # name_key -> id
+        self.by_code = {}      # kode -> id
+
+    def __len__(self):
+        return len(self.names)
+
+    def _register(self, name, code):
+        tid = len(self.names)
+        self.names.append(str(name).strip())
+        self.codes.append(code)
+        self.by_key[name_key(name)] = tid
+        self.by_code[code] = tid
+        return tid
+
+    def _free_code(self, name, taken):
+        base = base_initials(name)
+        for code in _alternatives(name):
+            if code not in taken: return code
+        n = 2
+        while f"{base}{n}" in taken:
+            n += 1
+        return f"{base}{n}"
+
+    @classmethod
+    def build(cls, names):
+        """Registri dari semua nama sekaligus; hasil tidak bergantung urutan baris."""
+        return cls().extend(names)
+
+    def extend(self, names):
+        """Daftarkan nama yang belum ada; id dan kode guru lama tidak berubah."""
+        unique = {}
+        for name in names:
+            key = name_key(name)
+            if key and key not in unique and key not in self.by_key: unique[key] = str(name).strip()
+        ordered = sorted(unique.items())
+        if len(self):
+            # Pendatang baru diurutkan agar hasil tetap tidak bergantung urutan baris
+            for _, name in ordered:
+                self.add(name)
+            return self
+
+        groups = {}
+        for key, name in ordered:
+            groups.setdefault(base_initials(name), []).append(name)
+        # Kode dasar yang dipegang pemilik pertama tiap kelompok tidak boleh dipakai alternatif
+        taken = set(groups)
+        assigned = {}
+        for base, members in groups.items():
+            assigned[members[0]] = base
+            for name in members[1:]:
+                code = self._free_code(name, taken)
+                taken.add(code)
+                assigned[name] = code
+        for _, name in ordered:
+            self._register(name, assigned[name])
+        return self
+
+    @classmethod
+    def from_pairs(cls, names, codes):
+        """Bangun ulang dari pasangan nama/kode yang sudah ada (urutan = id, mis. dari file proyek)."""
+        registry = cls()
+        for name, code in zip(names, codes):
+            if name_key(name) in registry.by_key or not name_key(name): continue
+            if code in registry.by_code:
+                code = registry._free_code(name, set(registry.by_code))
+            registry._register(name, code)
+        return registry
+
+    def add(self, name):
+        """Id untuk nama; nama baru mendapat kode yang tidak mengubah kode lama."""
+        key = name_key(name)
+        if not key: return None
+        if key in self.by_key: return self.by_key[key]
+        code = base_initials(name)
+        if code in self.by_code:
+            code = self._free_code(name, set(self.by_code))
+        return self._register(name, code)
+
+    def id_of(self, name):
+        return self.by_key.get(name_key(name))
+
+    def code_of(self, name):
+        tid = self.id_of(name)
+        return None if tid is None else self.codes[tid]
+
+    def renamed(self):
+        """Guru yang kodenya berbeda dari inisial lama (karena tabrakan)."""
+        return [(self.names[t], base_initials(self.names[t]), self.codes[t])
+                for t in range(len(self)) if self.codes[t] != base_initials(self.names[t])]
+
+
+# ==========================================
+# DEDUPLIKASI NAMA GURU (BLOCKING INDEX)
+# ==========================================
+# "Dra. Siti Aminah", "Siti Aminah" dan "SITI AMINAH S.Pd" adalah orang yang
+# sama. Nama dinormalisasi (gelar depan/belakang dibuang, huruf kecil), lalu
+# dikelompokkan per kunci blok (4 huruf awal tiap token). Kemiripan hanya
+# dihitung antar nama dalam blok yang sama, bukan semua pasangan, sehingga
+# ribuan nama selesai dalam hitungan detik. Hasilnya hanya usulan: pengguna
+# yang memutuskan nama mana yang digabung.
+
+TITLE_WORDS = {'dr', 'dra', 'drs', 'ir', 'prof', 'h', 'hj', 'haji', 'hajah', 'kh', 'ust', 'ustadz',
+               'ustadzah', 'bu', 'ibu', 'pak', 'bapak', 'sdr', 'sdri'}
+DEGREE_WORDS = {'spd', 'spdi', 'mpd', 'mpdi', 'ssi', 'msi', 'skom', 'mkom', 'se', 'sh', 'mm', 'mt', 'sag',
+                'mag', 'ssos', 'sip', 'ss', 'sst', 'amd', 'apd', 'lc', 'ma', 'gr', 'sth', 'spsi', 'mhum'}
+NAME_ALIASES = {'moh': 'muhammad', 'muh': 'muhammad', 'mochammad': 'muhammad', 'mohammad': 'muhammad',
+                'muhamad': 'muhammad', 'mohamad': 'muhammad', 'moch': 'muhammad', 'mhd': 'muhammad'}
+DEGREE_PATTERN = re.compile(r'^[a-z]{1,3}(\.[a-z]{1,4})+\.?$')
+BLOCK_PREFIX_LEN = 4
+
+
+def normalize_name(name):
+    """Token nama tanpa gelar/sebutan, huruf kecil; urutan asli dipertahankan."""
+    tokens, fallback = [], []
+    for raw in re.split(r'[\s,]+', str(name or "").casefold()):
+        raw = raw.strip(".,;'\"()")
+        word = re.sub(r'[^a-z]', '', raw)
+        if not word: continue
+        fallback.append(word)
+        if word in TITLE_WORDS or word in DEGREE_WORDS or DEGREE_PATTERN.match(raw): continue
+        tokens.append(NAME_ALIASES.get(word, word))
+    # Nama yang seluruhnya "gelar" (mis. "Ma Lc") tetap dipakai apa adanya
+    return tuple(tokens or fallback)
+
+
+def _block_keys(tokens):
+    return {t[:BLOCK_PREFIX_LEN] for t in tokens if len(t) >= 3} or set(tokens)
+
+
+def _one_edit(a, b):
+    # True jika a dan b berbeda paling banyak satu huruf (ganti/sisip/hapus)
+    if abs(len(a) - len(b)) > 1: return False
+    if len(a) > len(b): a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b): return a[i + 1:] == b[i + 1:]
+    return a[i:] == b[i + 1:]
+
+
+def _token_match(a, b):
+    if a == b: return True
+    if len(a) == 1 or len(b) == 1: return a[0] == b[0]          # inisial: "M." = "Muhammad"
+    return min(len(a), len(b)) >= 6 and _one_edit(a, b)         # salah ketik satu huruf
+
+
+def same_person(tokens_a, tokens_b):
+    """Dua nama ternormalisasi dianggap orang yang sama jika setiap token nama yang
+    lebih pendek cocok dengan token berbeda di nama lain (sama persis, salah ketik
+    satu huruf, atau inisial) dan minimal satu token utuh sama persis."""
+    if len(tokens_a) > len(tokens_b): tokens_a, tokens_b = tokens_b, tokens_a
+    if len(tokens_a) < min(2, len(tokens_b)): return False
+    free = list(tokens_b)
+    exact = False
+    for a in tokens_a:
+        hit = next((b for b in free if a == b), None) or next((b for b in free if _token_match(a, b)), None)
+        if hit is None: return False
+        exact = exact or (a == hit and len(a) > 1)
+        free.remove(hit)
+    return exact
+
+
+def duplicate_name_groups(names, max_block=100):
+    """Kelompok nama yang kemungkinan orang yang sama: [(nama_kanonik, [(nama, skor)])]."""
+    counts = {}
+    for name in names:
+        name = str(name).strip()
+        if name_key(name): counts[name] = counts.get(name, 0) + 1
+
+    # Nama yang normalisasinya identik langsung satu entri
+    by_norm = {}
+    for name in sorted(counts):
+        tokens = normalize_name(name)
+        by_norm.setdefault(" ".join(sorted(tokens)), (tokens, []))[1].append(name)
+    keys = list(by_norm)
+
+    blocks = {}
+    for i, key in enumerate(keys):
+        for b in _block_keys(by_norm[key][0]):
+            blocks.setdefault(b, []).append(i)
+
+    parent = list(range(len(keys)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    seen = set()
+    for members in blocks.values():
+        # Blok raksasa (token sangat umum, mis. "siti") dilewati; pasangan aslinya
+        # tetap bertemu lewat token lain yang lebih jarang
+        if len(members) < 2 or len(members) > max_block: continue
+        for x, i in enumerate(members):
+            for j in members[x + 1:]:
+                if (i, j) in seen: continue
+                seen.add((i, j))
+                if find(i) != find(j) and same_person(by_norm[keys[i]][0], by_norm[keys[j]][0]):
+                    parent[find(j)] = find(i)
+
+    groups = {}
+    for i, key in enumerate(keys):
+        groups.setdefault(find(i), []).append(key)
+
+    result = []
+    for members in groups.values():
+        names_in_group = [n for key in members for n in by_norm[key][1]]
+        if len(names_in_group) < 2: continue
+        # Nama kanonik: paling sering muncul di file, bukan huruf kapital semua, tanpa gelar, lalu alfabet
+        canonical = min(names_in_group, key=lambda n: (-counts[n], n.isupper(),
+                                                       len(re.split(r'[\s,]+', n)) != len(normalize_name(n)), n))
+        target = " ".join(sorted(normalize_name(canonical)))
+        scored = []
+        for name in names_in_group:
+            if name == canonical: continue
+            norm = " ".join(sorted(normalize_name(name)))
+            scored.append((name, round(SequenceMatcher(None, norm, target).ratio(), 2)))
+        result.append((canonical, scored))
+    result.sort(key=lambda g: g[0])
+    return result
+
+
+def duplicate_name_frame(names):
+    """Usulan penggabungan untuk ditampilkan di Menu 1 (satu baris per nama yang digabung)."""
+    rows = [{'Gabung': True, 'Nama di File': name, 'Gabung ke': canonical, 'Kemiripan': score}
+            for canonical, members in duplicate_name_groups(names) for name, score in members]
+    return pd.DataFrame(rows, columns=['Gabung', 'Nama di File', 'Gabung ke', 'Kemiripan'])
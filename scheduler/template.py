@@ -0,0 +1,114 @@
+import tempfile
+
+from openpyxl import Workbook
+from openpyxl.styles import Font, PatternFill
+from openpyxl.utils import get_column_letter, quote_sheetname
+from openpyxl.workbook.defined_name import DefinedName
+from openpyxl.worksheet.datavalidation import DataValidation
+
+from scheduler.rules import RULES_EXAMPLE
+from scheduler.upload import RENAME_MAP, TEMPLATE_COLUMNS
+
+# ==========================================
+# TEMPLATE DATA SEKOLAH (MENU 1)
+# ==========================================
+# Daftar kelas, mapel dan guru ditulis sekali di sheet tersembunyi 'Daftar'
+# dan diberi nama (DAFTAR_KELAS, DAFTAR_MAPEL, ...). Sheet 'Data_Master'
+# hanya mendapat beberapa DataValidation selebar kolom yang merujuk nama itu,
+# bukan satu validasi per sel, sehingga template 1.000 baris tetap kecil dan
+# salah ketik kelas / JP bukan angka sudah ditolak Excel sebelum diupload.
+
+MASTER_SHEET = "Data_Master"
+LOOKUP_SHEET = "Daftar"
+TEMPLATE_HEADER = TEMPLATE_COLUMNS + ['Blok (JP)', 'Jam per Siklus']
+VALIDATED_ROWS = 1000
+HEADER_FILL = PatternFill(start_color='D9E1F2', end_color='D9E1F2', fill_type='solid')
+
+# (nama range, judul kolom di sheet Daftar, kolom template yang divalidasi, wajib dari daftar?)
+LOOKUP_LISTS = [
+    ('DAFTAR_KELAS', 'Kelas', 'Kelas', True),
+    ('DAFTAR_MAPEL', 'Mata Pelajaran', 'Mata Pelajaran', False),
+    ('DAFTAR_INISIAL_MAPEL', 'Inisial Mapel', 'Inisial Mapel', False),
+    ('DAFTAR_GURU', 'Nama Lengkap Guru', 'Nama Lengkap Guru', False),
+]
+# (kolom, min, maks, boleh kosong)
+NUMBER_RULES = [('Jam (JP)', 1, 40, False), ('Blok (JP)', 1, 4, True), ('Jam per Siklus', 0, 80, True)]
+
+
+def template_rows(subjects):
+    """Baris template (kolom Indonesia) dari data_subjects internal, mis. untuk diperbaiki lalu diupload ulang."""
+    back = {v: k for k, v in RENAME_MAP.items() if k in TEMPLATE_HEADER}
+    df = subjects.rename(columns=back)
+    return [[None if v != v else v for v in row]
+            for row in df.reindex(columns=TEMPLATE_HEADER).itertuples(index=False)]
+
+
+def _unique(values):
+    return sorted({str(v).strip() for v in values if v is not None and v == v and str(v).strip()})
+
+
+def _add_lookup(wb, ws, col, name, title, values):
+    ws.cell(row=1, column=col, value=title).font = Font(bold=True)
+    for i, value in enumerate(values, start=2):
+        ws.cell(row=i, column=col, value=value)
+    letter = get_column_letter(col)
+    ref = f"{quote_sheetname(LOOKUP_SHEET)}!${letter}$2:${letter}${max(len(values), 1) + 1}"
+    wb.defined_names[name] = DefinedName(name, attr_text=ref)
+
+
+def build_template_workbook(classes, rows=None, subjects=(), subject_codes=(), teachers=(),
+                            rules_text=RULES_EXAMPLE, validated_rows=VALIDATED_ROWS):
+    """Bangun file template (bytes) dengan dropdown kelas/mapel/guru dan validasi angka JP.
+
+    rows: baris awal (list sesuai TEMPLATE_HEADER). Daftar mapel/guru kosong = kolom itu bebas diisi.
+    """
+    wb = Workbook()
+    ws = wb.active
+    ws.title = MASTER_SHEET
+    ws.append(TEMPLATE_HEADER)
+    for cell in ws[1]:
+        cell.font = Font(bold=True)
+        cell.fill = HEADER_FILL
+    for row in rows or []:
+        ws.append(list(row))
+    ws.freeze_panes = "A2"
+    for i, width in enumerate([14, 28, 14, 32, 10, 10, 15], start=1):
+        ws.column_dimensions[get_column_letter(i)].width = width
+
+    lookup = wb.create_sheet(LOOKUP_SHEET)
+    lookup.sheet_state = 'hidden'
+    lists = {'DAFTAR_KELAS': _unique(classes), 'DAFTAR_MAPEL': _unique(subjects),
+             'DAFTAR_INISIAL_MAPEL': _unique(subject_codes), 'DAFTAR_GURU': _unique(teachers)}
+
+    last_row = max(validated_rows, len(rows or [])) + 1
+    for col, (name, title, target, strict) in enumerate(LOOKUP_LISTS, start=1):
+        _add_lookup(wb, lookup, col, name, title, lists[name])
+        if not lists[name]: continue
+        # Kelas wajib dari daftar (stop); mapel/guru baru masih boleh setelah peringatan
+        dv = DataValidation(type="list", formula1=name, allow_blank=True,
+                            errorStyle='stop' if strict else 'warning', showErrorMessage=True,
+                            errorTitle=f"{target} tidak dikenal",
+                            error=f"Pilih {target} dari daftar." if strict else
+                            f"{target} belum ada di daftar. Lanjutkan hanya jika memang data baru.",
+                            promptTitle=target, prompt=f"Pilih {target} dari daftar", showInputMessage=True)
+        letter = get_column_letter(TEMPLATE_HEADER.index(target) + 1)
+        dv.add(f"{letter}2:{letter}{last_row}")
+        ws.add_data_validation(dv)
+
+    for target, low, high, blank in NUMBER_RULES:
+        dv = DataValidation(type="whole", operator="between", formula1=str(low), formula2=str(high),
+                            allow_blank=blank, errorStyle='stop', showErrorMessage=True,
+                            errorTitle=f"{target} tidak valid", error=f"{target} harus bilangan bulat {low}-{high}.")
+        letter = get_column_letter(TEMPLATE_HEADER.index(target) + 1)
+        dv.add(f"{letter}2:{letter}{last_row}")
+        ws.add_data_validation(dv)
+
+    ws_rules = wb.create_sheet("Aturan")
+    ws_rules.append(['Aturan'])
+    for line in str(rules_text or "").splitlines():
+        ws_rules.append([line])
+
+    with tempfile.TemporaryFile() as tmp:
+        wb.save(tmp)
+        tmp.seek(0)
+        return tmp.read()
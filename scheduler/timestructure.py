@@ -0,0 +1,70 @@
+import datetime
+
+import pandas as pd
+
+
+# ==========================================
+# STRUKTUR WAKTU (LOGIKA MENU 2)
+# ==========================================
+def build_time_structure(start_time, jp_dur, total_jp, break_configs):
+    """Susun tabel Period/Type/Waktu dari jam masuk, durasi JP dan daftar break.
+
+    `break_configs`: list of {'after': jam ke-n, 'duration': menit}. after = 0 berarti
+    blok pembuka sebelum jam ke-1 (mis. upacara Senin), dicatat sebagai BREAK 0 agar
+    BREAK 1, 2, ... tetap break yang sama di hari dengan dan tanpa blok pembuka.
+    Dua break di posisi yang sama ditolak (ValueError): label jamnya akan bentrok.
+    """
+    schedule = []
+    curr = datetime.datetime.combine(datetime.date.today(), start_time)
+    break_configs = sorted(break_configs, key=lambda x: x['after'])
+    positions = [b['after'] for b in break_configs]
+    for after in sorted({p for p in positions if positions.count(p) > 1}):
+        where = "sebelum jam ke-1" if after == 0 else f"setelah jam ke-{after}"
+        raise ValueError(f"Ada dua break {where}; gabungkan durasinya menjadi satu break.")
+
+    break_counter = 1
+    for found in (b for b in break_configs if b['after'] == 0):
+        end_br = curr + datetime.timedelta(minutes=found['duration'])
+        schedule.append({'Period': 'BREAK 0', 'Type': 'BREAK',
+                         'Waktu': f"{curr.strftime('%H:%M')} - {end_br.strftime('%H:%M')}"})
+        curr = end_br
+    for i in range(1, total_jp+1):
+        end = curr + datetime.timedelta(minutes=jp_dur)
+        schedule.append({'Period': str(i), 'Type': 'Class', 'Waktu': f"{curr.strftime('%H:%M')} - {end.strftime('%H:%M')}"})
+        curr = end
+
+        found = next((b for b in break_configs if b['after'] == i), None)
+        if found:
+            end_br = curr + datetime.timedelta(minutes=found['duration'])
+            schedule.append({'Period': f'BREAK {break_counter}', 'Type': 'BREAK', 'Waktu': f"{curr.strftime('%H:%M')} - {end_br.strftime('%H:%M')}"})
+            curr = end_br
+            break_counter += 1
+
+    return pd.DataFrame(schedule)
+
+
+def parse_break_spec(text):
+    # "4:15, 8:30" -> [{'after': 4, 'duration': 15}, {'after': 8, 'duration': 30}]
+    configs = []
+    for part in str(text or "").split(","):
+        part = part.strip()
+        if not part: continue
+        after, _, duration = part.partition(":")
+        configs.append({'after': int(after), 'duration': int(duration or 15)})
+    return configs
+
+
+def parse_clock(text):
+    hour, _, minute = str(text).strip().partition(":")
+    return datetime.time(int(hour), int(minute or 0))
+
+
+def day_capacity(time_df):
+    """Jumlah JP (slot pelajaran) dalam satu struktur waktu."""
+    if time_df is None or time_df.empty: return 0
+    return int((time_df['Type'].astype(str).str.upper() != 'BREAK').sum())
+
+
+def end_of_day(time_df):
+    if time_df.empty: return ""
+    return str(time_df['Waktu'].iloc[-1]).split("-")[-1].strip()
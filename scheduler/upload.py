@@ -0,0 +1,82 @@
+import pandas as pd
+
+from scheduler.teachers import TeacherRegistry
+
+# ==========================================
+# BACA TEMPLATE DATA SEKOLAH (MENU 1)
+# ==========================================
+# Dipakai oleh app.py (upload) dan layanan HTTP (scheduler.service), sehingga
+# kedua jalur menghasilkan data_subjects yang sama persis.
+
+TEMPLATE_COLUMNS = ['Kelas', 'Mata Pelajaran', 'Inisial Mapel', 'Nama Lengkap Guru', 'Jam (JP)']
+RENAME_MAP = {'Kelas': 'Class', 'Mata Pelajaran': 'Subject Name', 'Inisial Mapel': 'Subject Code',
+              'Nama Lengkap Guru': 'Teacher Name', 'Inisial Guru': 'Teacher Initials', 'Jam (JP)': 'Periods/Week',
+              'Blok (JP)': 'Block Length', 'Jam per Siklus': 'Periods/Cycle'}
+
+
+def _excel_rows(index, limit=10):
+    # Index DataFrame -> nomor baris Excel (baris 1 = judul kolom)
+    rows = [str(i + 2) for i in index[:limit]]
+    return ", ".join(rows) + (f" (+{len(index) - limit} lagi)" if len(index) > limit else "")
+
+
+def _check_whole(df_up, col, required):
+    # Kolom angka: laporkan baris yang bukan bilangan bulat, jangan gagal diam-diam
+    if col not in df_up.columns: return
+    raw = df_up[col]
+    values = pd.to_numeric(raw, errors='coerce')
+    bad = values.isna() if required else values.isna() & raw.notna() & (raw.astype(str).str.strip() != "")
+    bad |= values.notna() & (values % 1 != 0)
+    if bad.any():
+        raise ValueError(f"Kolom '{col}' harus bilangan bulat. Periksa baris {_excel_rows(df_up.index[bad])}.")
+    df_up[col] = values
+
+
+def subjects_from_template(df_up, name_merges=None, registry=None):
+    """Ubah sheet template (kolom Indonesia) menjadi data_subjects internal.
+
+    name_merges: {nama di file: nama kanonik} hasil dedup nama guru yang disetujui pengguna.
+    registry: TeacherRegistry sesi/proyek; guru baru ditambahkan tanpa mengubah kode guru lama.
+    """
+    if not all(col in df_up.columns for col in TEMPLATE_COLUMNS):
+        raise ValueError("Format kolom salah! Gunakan template yang disediakan.")
+    # Baris bermapel tapi tanpa kelas/guru dilaporkan, bukan dibuang diam-diam
+    incomplete = df_up['Mata Pelajaran'].notna() & df_up[['Kelas', 'Nama Lengkap Guru']].isna().any(axis=1)
+    if incomplete.any():
+        raise ValueError(f"Kelas atau Nama Lengkap Guru kosong di baris {_excel_rows(df_up.index[incomplete])}.")
+    df_up = df_up.dropna(subset=['Kelas', 'Mata Pelajaran', 'Nama Lengkap Guru']).copy()
+    _check_whole(df_up, 'Jam (JP)', required=True)
+    _check_whole(df_up, 'Blok (JP)', required=False)
+    _check_whole(df_up, 'Jam per Siklus', required=False)
+    df_up['Nama Lengkap Guru'] = df_up['Nama Lengkap Guru'].astype(str).str.strip()
+    df_up = df_up[df_up['Nama Lengkap Guru'] != ""]
+    if name_merges:
+        df_up['Nama Lengkap Guru'] = df_up['Nama Lengkap Guru'].replace(name_merges)
+    # Kode guru unik per orang (tabrakan inisial diselesaikan oleh registri)
+    registry = (TeacherRegistry() if registry is None else registry).extend(df_up['Nama Lengkap Guru'])
+    df_up['Inisial Guru'] = df_up['Nama Lengkap Guru'].map(registry.code_of)
+    df_up['Teacher ID'] = df_up['Nama Lengkap Guru'].map(registry.id_of).astype(int)
+    df_up = df_up.rename(columns=RENAME_MAP)
+
+    df_up['Class'] = df_up['Class'].astype(str)
+    df_up['Periods/Week'] = df_up['Periods/Week'].astype(int)
+    # Kolom 'Blok (JP)' opsional (template lama): 1 = JP tunggal, 2 = double period, dst.
+    if 'Block Length' not in df_up.columns: df_up['Block Length'] = 1
+    df_up['Block Length'] = df_up['Block Length'].fillna(1).astype(int).clip(lower=1)
+    # Kolom 'Jam per Siklus' opsional: target JP untuk seluruh siklus A/B (kosong = JP x jumlah minggu)
+    if 'Periods/Cycle' in df_up.columns:
+        df_up['Periods/Cycle'] = pd.to_numeric(df_up['Periods/Cycle'], errors='coerce')
+    return df_up
+
+
+def read_template_workbook(path_or_file, name_merges=None, registry=None):
+    """Baca file template: kembalikan (data_subjects, teks aturan atau None)."""
+    xls = pd.ExcelFile(path_or_file)
+    subjects = subjects_from_template(pd.read_excel(xls, sheet_name=0), name_merges, registry)
+    rules_text = None
+    # Sheet 'Aturan' (opsional) berisi aturan jadwal, satu per baris
+    if 'Aturan' in xls.sheet_names:
+        df_rules = pd.read_excel(xls, sheet_name='Aturan')
+        if 'Aturan' in df_rules.columns:
+            rules_text = "\n".join(df_rules['Aturan'].dropna().astype(str))
+    return subjects, rules_text
@@ -0,0 +1,31 @@
+import pytest
+
+from scheduler.benchmark import synthetic_school
+from scheduler.model import cycle_days
+from scheduler.scenarios import prepare_model, time_structure_from_config
+
+TIME_CONFIG = {'Jam Masuk': "07:00", 'Durasi JP': 35, 'Total JP': 8, 'Break': "4:15"}
+
+
+@pytest.fixture
+def school():
+    # 6 kelas (7A..9B), 12 mapel, beban guru <= 24 JP/minggu
+    return synthetic_school(classes=6, grades=3)
+
+
+@pytest.fixture
+def time_config():
+    # 5 hari x 8 JP, break 15 menit setelah jam ke-4, pulang 11:55
+    return dict(TIME_CONFIG)
+
+
+@pytest.fixture
+def time_df(time_config):
+    return time_structure_from_config(time_config)
+
+
+@pytest.fixture
+def school_model(school, time_df):
+    # Grid kosong 1 minggu untuk `school`, break sudah terisi RECESS
+    classes = sorted(school['Class'].unique())
+    return prepare_model(classes, school, time_df, cycle_days(1), "RECESS at * break")
@@ -0,0 +1,37 @@
+import pytest
+from streamlit.testing.v1 import AppTest
+
+
+@pytest.fixture
+def app(school, time_df):
+    # Menu 3 dengan data sekolah sintetis; layar pertama = editor hari Senin, semua kelas
+    at = AppTest.from_file("../app.py", default_timeout=60)
+    at.session_state['data_subjects'] = school
+    at.session_state['data_classes'] = sorted(school['Class'].unique().tolist())
+    at.session_state['time_structure'] = time_df
+    at.run()
+    menu = at.sidebar.radio[0]
+    menu.set_value(menu.options[2]).run()
+    assert not at.exception
+    return at
+
+
+def _edit(at, row, cls, text):
+    # Isi state data_editor seperti setelah pengguna memilih dropdown, lalu jalankan ulang
+    at.session_state['editor_Senin_all'] = {'edited_rows': {row: {cls: text}}, 'added_rows': [], 'deleted_rows': []}
+    at.run()
+    assert not at.exception
+
+
+def test_pending_edit_applied_once_and_undoable(app):
+    model = app.session_state['schedule_model']
+    cls = model.classes[0]
+    label = next(lab for lab in model.labels[1:] if lab.startswith("MTK"))
+    _edit(app, 0, cls, label)
+    s, c = model.slot_index[("Senin", "1")], 0
+    assert model.labels[model.grid[s, c]] == label
+    assert app.session_state['manual_schedule']['Senin'].iat[0, 1] == label
+    assert len(app.session_state['edit_journal']) == 1
+    next(b for b in app.button if "Undo" in b.label).click().run()
+    assert not app.exception and model.grid[s, c] == 0
+    assert app.session_state['manual_schedule']['Senin'].iat[0, 1] is None
@@ -0,0 +1,43 @@
+import pandas as pd
+
+from scheduler.benchmark import anonymize_subjects, compare, load_corpus, run_benchmark
+
+BASE = {'placement': 0.98, 'score': 300.0, 'seconds': 0.01, 'deterministic': True, 'week_excess': 0,
+        'hashes': ["a", "b"]}
+
+
+def test_anonymize_aliases_each_block_teacher():
+    subjects = pd.DataFrame([
+        {'Class': "XI-1", 'Subject Code': "FIS", 'Teacher Name': "Budi Santoso, S.Pd.", 'Teacher Initials': "BUD"},
+        {'Class': "XI-1", 'Subject Code': "EKO", 'Teacher Name': "Siti Aminah", 'Teacher Initials': "SIT"},
+        {'Class': "XI-1", 'Subject Code': "BLOK A", 'Teacher Name': "Budi Santoso, S.Pd., Siti Aminah",
+         'Teacher Initials': "BUD/SIT"},
+    ])
+    df = anonymize_subjects(subjects, seed=3)
+    bud, sit = df['Teacher Initials'][:2]
+    assert df['Teacher Initials'][2] == f"{bud}/{sit}"
+    assert df['Teacher Name'][2] == f"{df['Teacher Name'][0]}, {df['Teacher Name'][1]}"
+    assert not df['Teacher Name'].str.contains("Budi|Siti").any()
+
+
+def test_compare_statuses():
+    results = {
+        'sama': dict(BASE),
+        'lambat': dict(BASE, seconds=1.0),
+        'turun': dict(BASE, placement=0.90),
+        'beda': dict(BASE, hashes=["a", "c"]),
+        'minggu': dict(BASE, week_excess=4),
+        'baru': dict(BASE),
+    }
+    baseline = {name: BASE for name in results if name != 'baru'}
+    status = {name: s for name, s, _ in compare(results, baseline)}
+    assert status == {'sama': "OK", 'lambat': "OK", 'turun': "REGRESI", 'beda': "BERUBAH",
+                      'minggu': "REGRESI", 'baru': "BARU"}
+    # Waktu hanya dicek jika diminta (baseline dari mesin yang sama)
+    assert dict((n, s) for n, s, _ in compare(results, baseline, check_time=True))['lambat'] == "REGRESI"
+
+
+def test_benchmark_is_deterministic():
+    case = next(c for c in load_corpus() if 'sintetis' in c)
+    result = run_benchmark([case], seeds=(0, 1))[case['nama']]
+    assert result['deterministic'] and len(result['hashes']) == 2
@@ -0,0 +1,16 @@
+from scheduler.blocks import block_starts, place_block, split_block_cells
+from scheduler.solver import lesson_demands, solve
+
+
+def test_blocks_are_contiguous(school, school_model):
+    solve(school_model, school, seed=0)
+    assert split_block_cells(school_model, lesson_demands(school_model, school)) == set()
+
+
+def test_block_starts_skip_breaks_and_busy_cells(school_model):
+    lid = school_model.intern("IPA (IPA1)")
+    # Hari: JP 1-4, BREAK 1, JP 5-8 -> blok 2 JP tidak boleh melewati posisi 4 (break)
+    assert block_starts(school_model, 0, 0, lid, 2) == [0, 1, 2, 5, 6, 7]
+    assert place_block(school_model, 0, 1, 0, lid, 2)
+    assert block_starts(school_model, 0, 0, lid, 2) == [5, 6, 7]
+    assert 2 not in block_starts(school_model, 0, 1, lid, 2)   # guru IPA1 sibuk di jam 2-3
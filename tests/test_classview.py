@@ -0,0 +1,17 @@
+from scheduler.classview import class_grade, class_window, group_classes_by_grade
+
+
+def test_class_grade():
+    assert [class_grade(c) for c in ["Kelas 7A", "X IPA 1", "12-B", "XI-2", "Guru"]] == ["7", "X", "12", "XI", "Lainnya"]
+
+
+def test_group_classes_by_grade_keeps_order():
+    classes = ["8A", "7A", "X IPA 1", "8B", "7B"]
+    assert group_classes_by_grade(classes) == {"8": ["8A", "8B"], "7": ["7A", "7B"], "X": ["X IPA 1"]}
+
+
+def test_class_window():
+    classes = [f"K{i}" for i in range(1, 13)]
+    assert class_window(classes, 1, 5) == classes[:5]
+    assert class_window(classes, 11, 5) == ["K11", "K12"]
+    assert class_window(classes, 13, 5) == []
@@ -0,0 +1,48 @@
+import random
+import time
+
+import numpy as np
+
+from scheduler.electives import clash_cost, dsatur, reduce_colors, relabel_colors, tabucol
+
+
+def _proper(weights, colors):
+    return clash_cost(weights, colors) == 0
+
+
+def _cycle(n):
+    w = np.zeros((n, n), dtype=np.int64)
+    for i in range(n):
+        w[i, (i + 1) % n] = w[(i + 1) % n, i] = 1
+    return w
+
+
+def test_dsatur_is_proper():
+    rng = np.random.default_rng(0)
+    w = np.triu(rng.integers(0, 2, (30, 30)), 1)
+    w = w + w.T
+    colors = dsatur(w)
+    assert _proper(w, colors)
+    assert int(dsatur(_cycle(6)).max()) + 1 == 2      # siklus genap: 2 warna
+    assert int(dsatur(_cycle(7)).max()) + 1 == 3      # siklus ganjil: 3 warna
+
+
+def test_tabucol_repairs_coloring():
+    w = _cycle(9)
+    start = np.zeros(9, dtype=np.int32)
+    colors, cost = tabucol(w, start, 3, time.perf_counter() + 2.0, random.Random(0))
+    assert cost == 0 and _proper(w, colors)
+
+
+def test_relabel_colors():
+    assert relabel_colors(np.array([5, 2, 5, 9])).tolist() == [1, 0, 1, 2]
+
+
+def test_reduce_colors_respects_limit():
+    w = _cycle(7)
+    for minimize in (True, False):
+        assert int(reduce_colors(w, seed=0, time_budget=0.2, minimize=minimize).max()) + 1 == 3
+        # Batas 2 warna untuk siklus ganjil: dipaksa muat dengan satu sisi bentrok
+        colors = reduce_colors(w, 2, seed=0, time_budget=0.2, minimize=minimize)
+        assert int(colors.max()) + 1 == 2 and clash_cost(w, colors) == 1
+    assert len(reduce_colors(np.zeros((0, 0), dtype=np.int64))) == 0
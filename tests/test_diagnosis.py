@@ -0,0 +1,53 @@
+import pandas as pd
+
+from scheduler.diagnosis import diagnose
+from scheduler.rules import compile_rules
+from scheduler.scenarios import prepare_model
+from scheduler.solver import solve
+
+
+def _subjects(rows):
+    return pd.DataFrame(rows, columns=['Class', 'Subject Name', 'Subject Code', 'Teacher Initials', 'Periods/Week'])
+
+
+def test_feasible_instance(school, time_df):
+    subjects = school[school['Subject Code'].isin(["MTK", "BIN", "IPA"])]
+    model = prepare_model(sorted(subjects['Class'].unique()), subjects, time_df)
+    result = diagnose(model, subjects, time_budget=2.0)
+    assert result['feasible'] and result['core'] == []
+
+
+def test_overloaded_teacher_is_the_core(time_df):
+    # BUD mengajar 3 kelas x 15 JP = 45 JP, kapasitas seminggu 40 slot
+    rows = [[cls, "Matematika", "MTK", "BUD", 15] for cls in ("7A", "7B", "7C")]
+    rows += [[cls, "IPA", "IPA", f"T{cls}", 4] for cls in ("7A", "7B", "7C")]
+    subjects = _subjects(rows)
+    model = prepare_model(["7A", "7B", "7C"], subjects, time_df)
+    unassigned = solve(model, subjects, seed=0)
+    assert unassigned
+    result = diagnose(model.empty_like(), subjects, unassigned=unassigned, time_budget=5.0)
+    assert not result['feasible']
+    assert result['teachers'] == ["BUD"]
+    assert all("MTK (BUD)" in text for text in result['core'])
+    assert "Guru BUD" in result['reason']
+
+
+def test_rule_in_core(time_df):
+    # Hanya Senin jam 1-2, padahal MTK butuh 3 JP
+    subjects = _subjects([["7A", "Matematika", "MTK", "BUD", 3], ["7A", "IPA", "IPA", "SIT", 2]])
+    rules = compile_rules("only MTK at Senin 1,2\nmax consecutive * 3")
+    model = prepare_model(["7A"], subjects, time_df)
+    result = diagnose(model, subjects, rules, time_budget=5.0)
+    assert not result['feasible'] and result['minimal']
+    assert sorted(result['core']) == ["7A: MTK (BUD) (3 JP)", "Aturan: only MTK at Senin 1,2"]
+
+
+def test_event_in_core(time_df):
+    # 40 slot - 4 slot kegiatan = 36 < 37 JP; tanpa salah satu kegiatan (38 slot) jadwal muat
+    subjects = _subjects([["7A", "Matematika", "MTK", "BUD", 20], ["7A", "IPA", "IPA", "SIT", 17]])
+    events = "RECESS at * break\nUPACARA at Senin 1,2\nPRAMUKA at Selasa 1,2"
+    model = prepare_model(["7A"], subjects, time_df, events_text=events)
+    result = diagnose(model, subjects, time_budget=5.0)
+    assert not result['feasible'] and result['minimal']
+    assert sorted(result['events']) == ["PRAMUKA Selasa - 7A (2 JP)", "UPACARA Senin - 7A (2 JP)"]
+    assert len(result['core']) == 4
@@ -0,0 +1,37 @@
+import pandas as pd
+
+from scheduler.electives import block_electives, blocks_to_subject_rows, merge_block_rows
+from scheduler.model import DAYS, ScheduleModel, day_structures
+
+
+def _result(blocks):
+    return {'blocks': [{'Blok': b, 'Mapel': [f"Mapel {b}"], 'Guru': ["Budi", "Siti"], 'Inisial': ["BUD", "SIT"],
+                        'JP': 2, 'Kelas': ["XI-1", "XI-2"]} for b in blocks]}
+
+
+def test_block_electives_separates_shared_students():
+    picks = {'S1': ["Fisika", "Ekonomi"], 'S2': ["Fisika", "Biologi"], 'S3': ["Ekonomi", "Sosiologi"],
+             'S4': ["Biologi", "Sosiologi"]}
+    choices = pd.DataFrame([(s, "XI-1", m) for s, ms in picks.items() for m in ms], columns=['Siswa', 'Kelas', 'Mapel'])
+    result = block_electives(choices, seed=0, time_budget=1.0)
+    assert result['clashes'] == 0
+    block_of = result['assignment']
+    for ms in picks.values():
+        assert block_of[ms[0]] != block_of[ms[1]]
+    assert len(result['blocks']) == 2
+
+
+def test_rebuilt_blocks_replace_old_rows():
+    subjects = pd.DataFrame([{'Class': "XI-1", 'Subject Code': "MTK", 'Teacher Initials': "BUD"},
+                             {'Class': "XI-1", 'Subject Code': "BLOK A", 'Teacher Initials': "ANI"}])
+    subjects = merge_block_rows(subjects, blocks_to_subject_rows(_result("ABC"), "XI-"), "XI-")
+    # Susun ulang dengan penanda sama: blok C lama hilang, tidak ada baris ganda
+    subjects = merge_block_rows(subjects, blocks_to_subject_rows(_result("AB"), "XI-"), "XI-")
+    assert sorted(subjects['Subject Code'].unique()) == ["BLOK A", "BLOK XI-A", "BLOK XI-B", "MTK"]
+    assert len(subjects) == 2 + 2 * 2
+
+
+def test_block_initials_register_each_teacher(time_df):
+    model = ScheduleModel(["XI-1"], day_structures(DAYS, time_df))
+    model.register_teachers(blocks_to_subject_rows(_result("A"))['Teacher Initials'])
+    assert model.teachers == ["BUD", "SIT"]
@@ -0,0 +1,53 @@
+import pytest
+
+from scheduler.eventlog import EventLog
+from scheduler.history import cell_diffs
+from scheduler.model import DAYS, ScheduleModel, day_structures
+
+
+@pytest.fixture
+def model(time_df):
+    model = ScheduleModel(["7A", "7B"], day_structures(DAYS, time_df))
+    model.register_teachers(["BUD", "SIT"])
+    return model
+
+
+def test_event_log_replays_any_point(model, tmp_path):
+    log = EventLog(str(tmp_path / "log.db"), snapshot_every=3)
+    slots = [s for s in model.day_slots("Selasa") if not model.slot_break[s]]
+    grids = [model.grid.copy()]
+    for i, s in enumerate(slots[:7]):
+        lid = model.intern("MTK (BUD)" if i % 2 else "IPA (SIT)")
+        cells = cell_diffs(model, [(s, i % 2, model.place(s, i % 2, lid), lid)])
+        log.append(model, cells, editor="alice")
+        grids.append(model.grid.copy())
+    assert log.head() == 7
+    for seq in (0, 2, 3, 5, 7):
+        state = log.state_at(seq)
+        labels = [[state.labels[l] for l in row] for row in state.grid]
+        assert labels == [[model.labels[l] for l in row] for row in grids[seq]]
+    events = log.events(cls="7B")
+    assert len(events) == 3 and set(events['Oleh']) == {"alice"}
+
+
+def test_epoch_snapshot_replaces_structure(model, time_df, tmp_path):
+    log = EventLog(str(tmp_path / "log.db"))
+    s = model.day_slots("Senin")[0]
+    lid = model.intern("MTK (BUD)")
+    log.append(model, cell_diffs(model, [(s, 0, model.place(s, 0, lid), lid)]))
+
+    # Grid baru dengan kelas lain (mis. proyek dibuka): tidak bisa diturunkan dari event sel
+    other = ScheduleModel(["8A"], day_structures(DAYS, time_df))
+    other.set_cell("Selasa", "2", "8A", "IPA (SIT)")
+    seq = log.start_epoch(other, editor="bob", action="Buka proyek")
+    assert seq == 2 and log.head() == 2
+    other.set_cell("Selasa", "3", "8A", "MTK (BUD)")
+    log.append(other, [("Selasa", "3", "8A", None, "MTK (BUD)")])
+
+    before = log.state_at(1)
+    assert before.classes == ["7A", "7B"] and before.cell(s, 0) == "MTK (BUD)"
+    after = log.state_at()
+    assert after.classes == ["8A"]
+    assert after.cell(after.slot_index[("Selasa", "2")], 0) == "IPA (SIT)"
+    assert after.cell(after.slot_index[("Selasa", "3")], 0) == "MTK (BUD)"
+    assert log.events(limit=3)['Aksi'].tolist() == ["edit", "Buka proyek", "edit"]
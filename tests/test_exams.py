@@ -0,0 +1,11 @@
+from scheduler.exams import schedule_exams
+
+
+def test_exams_without_clashes(school):
+    load = school.groupby('Teacher Initials')['Periods/Week'].sum().to_dict()
+    result = schedule_exams(school, load, days=5, sessions_per_day=3, seed=0, time_budget=1.0)
+    assert result['clashes'] == 0
+    assert result['sessions'] <= result['max_sessions']
+    # Satu kelas tidak pernah punya dua ujian di sesi yang sama
+    per_session = result['schedule'].assign(Kelas=result['schedule']['Kelas'].str.split(", ")).explode('Kelas')
+    assert not per_session.duplicated(['Hari Ke', 'Sesi', 'Kelas']).any()
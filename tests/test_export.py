@@ -0,0 +1,53 @@
+import io
+
+from openpyxl import load_workbook
+
+from scheduler.export import conflict_formula, export_workbook, period_axis, safe_sheet_name
+from scheduler.model import DAYS, ScheduleModel, day_structures
+
+
+def _model(time_df):
+    model = ScheduleModel(["XI-1", "XI-2", "XI-3"], day_structures(DAYS, time_df))
+    for cls in ("XI-1", "XI-2"):
+        model.set_cell("Senin", "1", cls, "BLOK A (BUD/SIT)")
+    model.set_cell("Senin", "1", "XI-3", "MTK (BUD)")
+    return model
+
+
+def test_conflict_rule_treats_blocks_as_one_activity():
+    formula = conflict_formula("C2", "$C2:$E2")
+    # Sel blok tidak ikut COUNTIF pelajaran; blok dicek per guru lewat token "/INI/"
+    assert '$C2:$E2,"<>BLOK *"' in formula
+    assert 'FIND("/"&MID(C2&"()"' in formula and 'SUBSTITUTE(SUBSTITUTE($C2:$E2,"(","/"),")","/")' in formula
+
+
+def test_day_sheet_carries_conflict_rule(time_df):
+    wb = load_workbook(io.BytesIO(export_workbook(_model(time_df), ["Senin"])))
+    rules = [rule for cf in wb["Senin"].conditional_formatting for rule in cf.rules]
+    assert rules[0].formula == [conflict_formula("C2", "$C2:$E2")]
+    assert [c.value for c in wb["Senin"][2]][2:] == ["BLOK A (BUD/SIT)", "BLOK A (BUD/SIT)", "MTK (BUD)"]
+
+
+def test_safe_sheet_name_strips_invalid_chars_and_dedupes():
+    used = {"senin"}
+    assert safe_sheet_name("Senin", used) == "Senin (2)"
+    assert safe_sheet_name("Kelas XI/IPA:1", used) == "Kelas XI-IPA-1"
+    long = safe_sheet_name("Guru " + "X" * 40, used)
+    assert len(long) == 31 and len(safe_sheet_name("Guru " + "X" * 40, used)) == 31
+    assert len(used) == 5
+
+
+def test_teacher_and_class_sheets(time_df):
+    model = _model(time_df)
+    periods = period_axis(model, ["Senin", "Selasa"])
+    assert periods == [model.slot_label[s] for s in model.day_slots("Senin")]
+    data = export_workbook(model, ["Senin", "Selasa"], teacher_sheets=True, class_sheets=True,
+                           teacher_names={"BUD": "Budi Santoso"})
+    wb = load_workbook(io.BytesIO(data))
+    assert wb.sheetnames == ["Senin", "Selasa", "Guru BUD", "Guru SIT", "Kelas XI-1", "Kelas XI-2", "Kelas XI-3"]
+    bud = wb["Guru BUD"]
+    assert [c.value for c in bud[1]] == ["Budi Santoso (BUD)", "Senin", "Selasa"]
+    # Blok (2 kelas) dan MTK jatuh di jam yang sama -> satu sel berisi tiga baris
+    assert bud["B2"].value.split("\n") == ["XI-1: BLOK A (BUD/SIT)", "XI-2: BLOK A (BUD/SIT)", "XI-3: MTK (BUD)"]
+    assert bud["C2"].value is None and wb["Guru SIT"]["A1"].value == "SIT"
+    assert [c.value for c in wb["Kelas XI-3"]["B"]][:2] == ["Senin", "MTK (BUD)"]
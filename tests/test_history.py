@@ -0,0 +1,67 @@
+import numpy as np
+
+from scheduler.events import compile_events
+from scheduler.history import EditJournal
+from scheduler.scenarios import prepare_model
+from scheduler.solver import solve
+
+
+def test_undo_redo_round_trip(school, time_df):
+    model = prepare_model(sorted(school['Class'].unique()), school, time_df)
+    journal = EditJournal()
+    s, lid = model.day_slots("Senin")[0], model.intern("MTK (BUD)")
+    journal.record(model, [(s, 0, model.place(s, 0, lid), lid)], "edit")
+    edited = model.grid.copy()
+
+    solve(model, school, seed=0)
+    solved = model.grid.copy()
+    journal.record_grid(model, edited, "Isi otomatis")
+    assert len(journal) == 2
+
+    label, days, cells = journal.undo(model)
+    assert label == "Isi otomatis" and np.array_equal(model.grid, edited)
+    journal.redo(model)
+    assert np.array_equal(model.grid, solved)
+
+    journal.undo(model)
+    journal.undo(model)
+    assert model.grid[s, 0] == 0 and not journal.can_undo and journal.can_redo
+    journal.record(model, [(s, 1, model.place(s, 1, lid), lid)], "baru")
+    assert not journal.can_redo
+
+
+def test_undo_fixed_events_restores_mask(school, time_df):
+    model = prepare_model(sorted(school['Class'].unique()), school, time_df)
+    journal = EditJournal()
+    s = model.slot_index[("Senin", "1")]
+    lid = model.intern("MTK (BUD)")
+    journal.record(model, [(s, 0, model.place(s, 0, lid), lid)], "edit")
+    mask = model.fixed.copy()
+
+    before = model.fixed.copy()
+    changes = compile_events("RECESS at * break\nUPACARA at Senin 1").apply(model)
+    journal.record(model, changes, "Kegiatan tetap", fixed_before=before)
+    assert model.fixed[s].all() and model.cell(s, 0) == "UPACARA"
+
+    label, days, _ = journal.undo(model)
+    assert label == "Kegiatan tetap" and days == ["Senin"]
+    assert np.array_equal(model.fixed, mask) and not model.fixed_slot[s]
+    assert model.cell(s, 0) == "MTK (BUD)"
+    journal.redo(model)
+    assert model.fixed_slot[s] and model.cell(s, 1) == "UPACARA"
+
+
+def test_rebase_drops_steps_overwritten_from_outside(school, time_df):
+    model = prepare_model(sorted(school['Class'].unique()), school, time_df)
+    journal = EditJournal()
+    lid = model.intern("MTK (BUD)")
+    for period in ("1", "2", "3"):
+        s = model.slot_index[("Selasa", period)]
+        journal.record(model, [(s, 0, model.place(s, 0, lid), lid)], f"jam {period}")
+    journal.undo(model)
+    journal.redo(model)
+
+    # Jam 2 ditimpa koordinator lain: undo jam 1-2 akan menimpa nilainya, jam 3 tetap sah
+    journal.rebase([("Selasa", "2", model.classes[0], "MTK (BUD)", "IPA (SIT)")])
+    assert len(journal) == 1 and not journal.can_redo
+    assert journal.undo(model)[0] == "jam 3"
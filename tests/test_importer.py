@@ -0,0 +1,46 @@
+import io
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from scheduler.events import compile_events
+from scheduler.export import export_workbook
+from scheduler.importer import import_schedule_workbook
+from scheduler.model import ScheduleModel, cycle_days, day_structures
+
+SUBJECTS = pd.DataFrame([{'Class': "7A", 'Subject Code': "MTK", 'Teacher Initials': "BUD"}])
+
+
+def _workbook(time_df, rename=None, copy=None):
+    model = ScheduleModel(["7A"], day_structures(cycle_days(2), time_df))
+    model.set_cell("Senin A", "1", "7A", "MTK (BUD)")
+    model.set_cell("Senin B", "2", "7A", "MTK (BUD)")
+    wb = load_workbook(io.BytesIO(export_workbook(model, model.days)))
+    if copy: wb.copy_worksheet(wb[copy]).title = copy.split()[0]
+    if rename: wb[rename].title = rename.split()[0]
+    out = io.BytesIO()
+    wb.save(out)
+    out.seek(0)
+    return out
+
+
+def test_plain_day_sheet_is_week_a(time_df):
+    imported = import_schedule_workbook(_workbook(time_df, rename="Senin A"), ["7A"], SUBJECTS, time_df)
+    model = imported['model']
+    assert imported['renamed_sheets'] == {"Senin": "Senin A"} and not imported['skipped_sheets']
+    assert model.n_weeks == 2 and "Senin A" in imported['manual_schedule']
+    assert model.cell(model.slot_index[("Senin A", "1")], 0) == "MTK (BUD)"
+
+
+def test_plain_day_sheet_skipped_when_week_a_exists(time_df):
+    imported = import_schedule_workbook(_workbook(time_df, copy="Senin A"), ["7A"], SUBJECTS, time_df)
+    assert imported['skipped_sheets'] == ["Senin"] and not imported['renamed_sheets']
+    assert set(imported['manual_schedule']) == set(cycle_days(2))
+
+
+def test_cells_under_fixed_events_are_reported(time_df):
+    events = compile_events("RECESS at * break\nUPACARA at Senin 1")
+    imported = import_schedule_workbook(_workbook(time_df), ["7A"], SUBJECTS, time_df, events)
+    report = imported['overwritten']
+    assert report.to_dict('records') == [{'Hari': "Senin A", 'Jam': "1", 'Kelas': "7A",
+                                          'Isi File': "MTK (BUD)", 'Kegiatan Tetap': "UPACARA"}]
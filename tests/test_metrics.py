@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from scheduler.metrics import class_metrics_frame, quality_frames, quality_metrics, quality_penalty, teacher_idle_gaps
+from scheduler.model import DAYS, ScheduleModel, day_structures
+
+
+@pytest.fixture
+def model(time_df):
+    # Senin: 7A MTK-IPA-MTK di jam 1-3, 7B IPA di jam 8 (jam terakhir)
+    model = ScheduleModel(["7A", "7B"], day_structures(DAYS, time_df))
+    for period, text in (("1", "MTK (BUD)"), ("2", "IPA (SIT)"), ("3", "MTK (BUD)")):
+        model.set_cell("Senin", period, "7A", text)
+    model.set_cell("Senin", "8", "7B", "IPA (SIT)")
+    return model
+
+
+def test_quality_metrics(model):
+    metrics = quality_metrics(model, max_daily=1)
+    bud, sit = model.teachers.index("BUD"), model.teachers.index("SIT")
+    # BUD kosong di jam 2; SIT kosong di jam 3-7 (break bukan jam pelajaran)
+    assert metrics['teacher_gaps'][[bud, sit], 0].tolist() == [1, 5]
+    assert metrics['teacher_gaps'][:, 1:].sum() == 0
+    assert metrics['teacher_daily'][[bud, sit], 0].tolist() == [2, 2]
+    assert metrics['class_repeats'][:, 0].tolist() == [1, 0]
+    assert metrics['last_class'][:, 0].tolist() == [False, True]
+    assert metrics['total_over_daily'] == 2 and metrics['total_last_teacher'] == 1
+    assert quality_penalty(metrics) == 6 * 1.0 + 2 * 3.0 + 1 * 2.0 + 1 * 0.5
+    assert np.array_equal(teacher_idle_gaps(model), metrics['teacher_gaps'])
+
+
+def test_fixed_slot_is_not_a_gap(model):
+    model.set_cell("Senin", "2", "7B", "UPACARA")
+    model.set_cell("Senin", "2", "7A", "UPACARA")
+    fixed = np.zeros_like(model.fixed)
+    fixed[model.slot_index[("Senin", "2")]] = True
+    model.set_fixed(fixed)
+    metrics = quality_metrics(model)
+    # Jam 2 upacara semua kelas: bukan jam kosong BUD, MTK 7A tetap dua kali duduk
+    assert metrics['teacher_gaps'][model.teachers.index("BUD"), 0] == 0
+    assert metrics['class_repeats'][0, 0] == 1
+
+
+def test_quality_frames(model):
+    summary, teachers, classes = quality_frames(model, max_daily=1, teacher_names={"SIT": "Siti"})
+    assert summary['Nilai'].tolist() == [6, 2, 1, 1, 1]
+    assert teachers[['Guru', 'Nama', 'Jam Kosong']].values.tolist() == [["SIT", "Siti", 5], ["BUD", "", 1]]
+    assert classes.equals(class_metrics_frame(model, quality_metrics(model, max_daily=1)))
+    assert classes.set_index('Kelas').loc["7B", 'Jam Terakhir'] == 1
@@ -0,0 +1,37 @@
+import json
+
+import numpy as np
+
+from scheduler.profiler import Profiler
+
+
+def test_disabled_profiler_records_nothing():
+    prof = Profiler()
+    with prof.stage("bentrok", rows=10):
+        pass
+    assert prof.frame().empty and prof.last_run().empty and prof.summary().empty
+
+
+def test_stage_records_memory_per_run():
+    prof = Profiler(capacity=3)
+    prof.set_enabled(True)
+    prof.begin_run("halaman")
+    with prof.stage("baca", rows=2):
+        kept = np.ones(256 * 1024, dtype=np.uint8)       # 256 KB tetap hidup setelah tahap
+    with prof.stage("sementara"):
+        np.ones(256 * 1024, dtype=np.uint8)              # dibebaskan lagi sebelum tahap selesai
+    baca, sementara = prof.records
+    assert baca['alloc_kb'] >= 250 and baca['grow_kb'] >= baca['alloc_kb']
+    assert sementara['alloc_kb'] < 50
+    assert kept.sum() == 256 * 1024
+    prof.begin_run("export")
+    for _ in range(2):
+        with prof.stage("export"):
+            pass
+    # Ring buffer hanya menyimpan 3 catatan terakhir; last_run() hanya rerun terbaru
+    assert len(prof.records) == 3
+    assert prof.last_run()['stage'].tolist() == ["export", "export"]
+    assert prof.summary().set_index('stage').loc["export", 'n'] == 2
+    assert json.loads(prof.to_json({'versi': 1}))['meta'] == {'versi': 1}
+    prof.clear()
+    assert prof.frame().empty
@@ -0,0 +1,48 @@
+import io
+
+import numpy as np
+import pytest
+
+from scheduler.events import DEFAULT_EVENTS, compile_events
+from scheduler.export import export_workbook
+from scheduler.importer import import_schedule_workbook
+from scheduler.project import load_project, save_project
+from scheduler.scenarios import prepare_model
+from scheduler.solver import solve
+from scheduler.teachers import TeacherRegistry
+
+EVENTS = DEFAULT_EVENTS + "UPACARA at Senin 1\n"
+
+
+@pytest.fixture
+def solved(school, time_df):
+    classes = sorted(school['Class'].unique())
+    model = prepare_model(classes, school, time_df, events_text=EVENTS)
+    solve(model, school, seed=0)
+    return model
+
+
+def test_project_round_trip(solved, school, time_df):
+    registry = TeacherRegistry.build(school['Teacher Name'])
+    data = save_project(solved, school, time_df, solved.days, "", EVENTS, teacher_registry=registry)
+    project = load_project(data)
+    assert np.array_equal(project['model'].grid, solved.grid)
+    assert np.array_equal(project['model'].fixed, solved.fixed)
+    assert project['teacher_registry'].codes == registry.codes
+    assert project['events_text'] == EVENTS
+
+
+def test_project_keeps_empty_events_text(solved, school, time_df):
+    project = load_project(save_project(solved.empty_like(), school, time_df, solved.days, "", ""))
+    assert project['events_text'] == ""
+    assert not project['model'].fixed.any()
+
+
+def test_import_restores_fixed_mask(solved, school, time_df):
+    assert solved.fixed.sum() > 0
+    data = export_workbook(solved, solved.days)
+    imported = import_schedule_workbook(io.BytesIO(data), solved.classes, school, time_df, compile_events(EVENTS))
+    model = imported['model']
+    assert np.array_equal(model.fixed, solved.fixed)
+    assert imported['unknown'].empty
+    assert [model.labels[l] for l in model.grid.ravel()] == [solved.labels[l] for l in solved.grid.ravel()]
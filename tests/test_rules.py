@@ -0,0 +1,64 @@
+import pytest
+
+from scheduler.model import DAYS, ScheduleModel, day_structures
+from scheduler.rules import RuleError, compile_rules
+
+
+@pytest.fixture
+def model(time_df):
+    model = ScheduleModel(["7A", "7B"], day_structures(DAYS, time_df))
+    model.register_teachers(["BUD", "SIT"])
+    return model
+
+
+def _slots(model, day):
+    return [s for s in model.day_slots(day) if not model.slot_break[s]]
+
+
+def test_comments_and_blank_lines_skipped():
+    rules = compile_rules("# komentar\n\nmax consecutive * 2  # sisa baris\n")
+    assert [r.text for r in rules.rules] == ["max consecutive * 2"]
+
+
+@pytest.mark.parametrize("text", ["max consecutive", "only MTK at Minggu 1", "only MTK in week E",
+                                  "max daily teacher * dua", "larang MTK"])
+def test_invalid_rules_raise(text):
+    with pytest.raises(RuleError):
+        compile_rules(text)
+
+
+def test_max_consecutive(model):
+    rules = compile_rules("max consecutive MTK 2")
+    lid = model.intern("MTK (BUD)")
+    s1, s2, s3 = _slots(model, "Senin")[:3]
+    model.place(s1, 0, lid)
+    model.place(s2, 0, lid)
+    assert not rules.allows(model, s3, 0, lid)
+    assert rules.allows(model, s3, 1, lid)
+    assert rules.allows(model, s3, 0, model.intern("IPA (SIT)"))
+
+
+def test_max_daily_teacher(model):
+    rules = compile_rules("max daily teacher BUD 2")
+    mtk, ipa = model.intern("MTK (BUD)"), model.intern("IPA (BUD)")
+    slots = _slots(model, "Selasa")
+    model.place(slots[0], 0, mtk)
+    model.place(slots[1], 1, ipa)
+    assert not rules.allows(model, slots[2], 0, mtk)
+    assert rules.allows(model, _slots(model, "Rabu")[0], 0, mtk)
+
+
+def test_only_at_day_and_period(model):
+    rules = compile_rules("only PRAMUKA at Jumat 7,8")
+    lid = model.intern("PRAMUKA (SIT)")
+    allowed = {(model.days[model.slot_day[s]], model.slot_label[s])
+               for s in range(model.n_slots) if rules.allows(model, s, 0, lid)}
+    assert allowed == {("Jumat", "7"), ("Jumat", "8")}
+
+
+def test_violations_reports_cells(model):
+    rules = compile_rules("only UPACARA at Senin 1")
+    lid = model.intern("UPACARA (BUD)")
+    s = _slots(model, "Selasa")[0]
+    model.place(s, 0, lid)
+    assert rules.violations(model, "Selasa") == {(model.slot_label[s], "7A"): ["only UPACARA at Senin 1"]}
@@ -0,0 +1,27 @@
+from scheduler.scenarios import (config_days, day_times_from_config, end_times, run_scenario, run_scenarios,
+                                 time_structure_from_config)
+
+
+def test_end_times_per_day(time_config):
+    config = {**time_config, 'Minggu': 2, 'Per Hari': {'Jumat': {'Total JP': 6}, 'Senin B': {'Total JP': 9}}}
+    ends = end_times(config_days(config), time_structure_from_config(config), day_times_from_config(config))
+    assert ends == "11:55 (Senin B 12:30, Jumat 10:45)"
+    assert end_times(config_days(time_config), time_structure_from_config(time_config)) == "11:55"
+
+
+def test_scenario_summary(school, time_config):
+    classes = sorted(school['Class'].unique())
+    short_friday = {**time_config, 'Nama': "Jumat pendek", 'Total JP': 9, 'Per Hari': {'Jumat': {'Total JP': 6}}}
+    result = run_scenario(short_friday, classes, school, seed=0)
+    assert result['Skenario'] == "Jumat pendek" and result['Seed'] == 0
+    assert result['Slot/Minggu'] == 4 * 9 + 6
+    assert result['Pulang'] == "12:30 (Jumat 10:45)"
+    assert result['Layak'] == (result['JP Tidak Terplot'] == 0)
+
+
+def test_scenarios_keep_input_order(school, time_config):
+    classes = sorted(school['Class'].unique())
+    configs = [{**time_config, 'Nama': name, 'Total JP': jp} for name, jp in (("A", 8), ("B", 9))]
+    results = run_scenarios(configs, classes, school, max_workers=2)
+    assert [r['Skenario'] for r in results] == ["A", "B"]
+    assert [r['Slot/Minggu'] for r in results] == [40, 45]
@@ -0,0 +1,99 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from scheduler.service import JobService, make_server, parse_submission
+from scheduler.template import build_template_workbook
+
+ROWS = [["7A", "Matematika", "MTK", "Budi Santoso", 4, 1, None],
+        ["7A", "IPA", "IPA", "Siti Aminah", 3, 1, None],
+        ["7B", "Matematika", "MTK", "Budi Santoso", 4, 1, None]]
+JSON_ROWS = [{'Kelas': r[0], 'Mata Pelajaran': r[1], 'Inisial Mapel': r[2], 'Nama Lengkap Guru': r[3],
+              'Jam (JP)': r[4]} for r in ROWS]
+
+
+@pytest.fixture(scope="module")
+def server():
+    server, service = make_server(port=0, workers=1)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+    service.shutdown()
+
+
+def _request(url, data=None, content_type="application/json"):
+    req = urllib.request.Request(url, data=data, headers={"Content-Type": content_type})
+    try:
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            return resp.status, resp.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+def test_parse_submission_from_workbook():
+    body = build_template_workbook(["7A", "7B"], ROWS)
+    job = parse_submission(body, "application/octet-stream", "total_jp=6&minggu=2&seed=3")
+    assert job['time']['Total JP'] == "6" and job['time']['Minggu'] == "2" and job['seed'] == 3
+    assert {r['Class'] for r in job['subjects']} == {"7A", "7B"}
+
+
+@pytest.mark.parametrize("body, content_type, query", [
+    (b"", "application/octet-stream", ""),
+    (b"{}", "application/json", ""),
+    (json.dumps({'subjects': JSON_ROWS, 'events': "UPACARA di Senin"}).encode(), "application/json", ""),
+    (json.dumps({'subjects': JSON_ROWS, 'time': {'Per Hari': {'Sabtu': {}}}}).encode(), "application/json", ""),
+    (json.dumps({'subjects': [dict(JSON_ROWS[0], **{'Jam (JP)': "dua"})]}).encode(), "application/json", ""),
+])
+def test_parse_submission_rejects(body, content_type, query):
+    with pytest.raises(ValueError):
+        parse_submission(body, content_type, query)
+
+
+def test_empty_events_kept():
+    job = parse_submission(json.dumps({'subjects': JSON_ROWS, 'events': ""}).encode(), "application/json", "")
+    assert job['events'] == ""
+
+
+def test_bad_submission_is_400(server):
+    status, body = _request(f"{server}/jobs", b"{}")
+    assert status == 400 and "subjects" in json.loads(body)['error']
+    assert _request(f"{server}/jobs/tidak-ada")[0] == 404
+
+
+def test_identical_submission_deduplicated(server):
+    payload = json.dumps({'subjects': JSON_ROWS, 'seed': 1}).encode()
+    status, body = _request(f"{server}/jobs", payload)
+    first = json.loads(body)
+    assert status == 202 and not first['deduplicated']
+    status, body = _request(f"{server}/jobs", payload)
+    second = json.loads(body)
+    assert status == 200 and second['deduplicated'] and second['id'] == first['id']
+
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        info = json.loads(_request(f"{server}/jobs/{first['id']}")[1])
+        if info['status'] in ("done", "failed"): break
+        time.sleep(0.2)
+    assert info['status'] == "done", info
+    assert info['summary']['kelas'] == 2 and info['summary']['seed'] == 1
+    status, data = _request(f"{server}/jobs/{first['id']}/result")
+    assert status == 200 and data[:2] == b"PK"
+
+
+def test_pool_failure_marks_job_failed():
+    service = JobService(workers=1)
+    service.shutdown()
+    job = parse_submission(json.dumps({'subjects': JSON_ROWS}).encode(), "application/json", "")
+    key, duplicate = service.submit(job)
+    info = service.status(key)
+    assert not duplicate and info['status'] == "failed" and "RuntimeError" in info['error']
+    assert service.result(key) == ("failed", None)
+    assert service.result("tidak-ada") == (None, None)
+    # Kiriman ulang pekerjaan gagal dicoba lagi, bukan dianggap duplikat
+    assert service.submit(job) == (key, False)
@@ -0,0 +1,24 @@
+from scheduler.shared_store import SharedStore
+
+
+def test_shared_store_compare_and_set(tmp_path):
+    path = str(tmp_path / "bersama.db")
+    alice, bob = SharedStore(path), SharedStore(path)
+    ok, version, _ = alice.commit_cell("Senin", "1", "7A", "MTK (BUD)", 0, "alice")
+    assert ok and version == 1
+    # Bob masih melihat sel sebagai belum pernah ditulis (versi 0): ditolak
+    ok, version, conflicts = bob.commit_cell("Senin", "1", "7A", "IPA (SIT)", 0, "bob")
+    assert not ok and version == 1
+    assert conflicts == [("Senin", "1", "7A", "MTK (BUD)", 1)]
+    ok, version, _ = bob.commit_cell("Senin", "1", "7A", "IPA (SIT)", 1, "bob")
+    assert ok and version == 2
+
+
+def test_shared_store_partial_commit_and_pull(tmp_path):
+    store = SharedStore(str(tmp_path / "bersama.db"))
+    store.commit_cell("Senin", "1", "7A", "MTK (BUD)", 0)
+    version, conflicts = store.commit_cells([("Senin", "1", "7A", "X", 0), ("Senin", "2", "7A", "IPA (SIT)", 0)])
+    assert version == 2 and len(conflicts) == 1
+    rows, head = store.pull(since=1)
+    assert head == 2 and rows == [("Senin", "2", "7A", "IPA (SIT)", 2)]
+    assert store.pull(since=2) == ([], 2)
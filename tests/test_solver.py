@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from scheduler.model import cycle_days
+from scheduler.rules import compile_rules
+from scheduler.scenarios import prepare_model
+from scheduler.solver import lesson_demands, solve
+
+
+def _model(subjects, time_df, events_text="RECESS at * break"):
+    classes = sorted(subjects['Class'].unique())
+    return prepare_model(classes, subjects, time_df, cycle_days(1), events_text)
+
+
+def _teacher_clashes(model):
+    # Jumlah slot di mana satu guru tercatat di lebih dari satu kelas
+    return int((model.teacher_slot > 1).sum())
+
+
+def test_solve_places_everything_without_clashes(school, time_df):
+    model = _model(school, time_df)
+    unassigned = solve(model, school, seed=0)
+    need = sum(info['Need'] for info in lesson_demands(model, school).values())
+    missing = sum(u['Missing'] for u in unassigned)
+    assert missing / need < 0.05
+    assert _teacher_clashes(model) == 0
+
+
+def test_solve_is_deterministic_per_seed(school, time_df):
+    grids = [_model(school, time_df) for _ in range(3)]
+    for model, seed in zip(grids, (0, 0, 1)):
+        solve(model, school, seed=seed)
+    assert np.array_equal(grids[0].grid, grids[1].grid)
+    assert not np.array_equal(grids[0].grid, grids[2].grid)
+
+
+def test_manual_cells_are_kept(school, time_df):
+    model = _model(school, time_df)
+    row = school.iloc[0]
+    lid = model.intern(f"{row['Subject Code']} ({row['Teacher Initials']})")
+    c = model.classes.index(row['Class'])
+    model.place(0, c, lid)
+    solve(model, school, seed=0)
+    assert model.grid[0, c] == lid
+    assert int((model.grid[:, c] == lid).sum()) <= int(row['Periods/Week'])
+
+
+@pytest.mark.parametrize("text", ["max consecutive * 2", "forbid PJOK after break 1", "max daily teacher * 4"])
+def test_rules_respected(school, time_df, text):
+    model = _model(school, time_df)
+    rules = compile_rules(text)
+    solve(model, school, rules, seed=0)
+    for day in model.days:
+        assert not rules.violations(model, day)
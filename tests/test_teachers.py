@@ -0,0 +1,50 @@
+import pandas as pd
+
+from scheduler.teachers import TeacherRegistry, duplicate_name_groups, normalize_name, same_person
+from scheduler.upload import subjects_from_template
+
+NAMES = ["Bima Santika", "Budi Santoso", "Ani Lestari", "Andi Lesmana"]
+
+
+def _template(names):
+    return pd.DataFrame({'Kelas': "7A", 'Mata Pelajaran': "IPA", 'Inisial Mapel': "IPA",
+                         'Nama Lengkap Guru': names, 'Jam (JP)': 2})
+
+
+def test_build_codes_unique_and_order_independent():
+    a = TeacherRegistry.build(NAMES)
+    b = TeacherRegistry.build(list(reversed(NAMES)))
+    assert len(set(a.codes)) == len(NAMES)
+    assert [a.code_of(n) for n in NAMES] == [b.code_of(n) for n in NAMES]
+
+
+def test_extend_keeps_existing_ids_and_codes():
+    registry = TeacherRegistry.build(NAMES)
+    before = {n: (registry.id_of(n), registry.code_of(n)) for n in NAMES}
+    # "Bayu Santoso" berebut kode dasar BSA dengan "Bima Santika"
+    registry.extend(NAMES + ["Bayu Santoso", "Aan Lesmana"])
+    assert {n: (registry.id_of(n), registry.code_of(n)) for n in NAMES} == before
+    assert len(set(registry.codes)) == len(registry) == 6
+
+
+def test_upload_with_session_registry_is_stable():
+    registry = TeacherRegistry()
+    first = subjects_from_template(_template(NAMES), registry=registry)
+    second = subjects_from_template(_template(["Bayu Santoso"] + NAMES), registry=registry)
+    old = first.set_index('Teacher Name')[['Teacher Initials', 'Teacher ID']]
+    new = second.set_index('Teacher Name').loc[old.index, ['Teacher Initials', 'Teacher ID']]
+    assert old.equals(new)
+
+
+def test_from_pairs_preserves_ids():
+    registry = TeacherRegistry.build(NAMES)
+    registry.add("Bayu Santoso")
+    copy = TeacherRegistry.from_pairs(registry.names, registry.codes)
+    assert copy.names == registry.names and copy.codes == registry.codes
+
+
+def test_duplicate_names_grouped():
+    assert normalize_name("Dra. Siti Aminah, S.Pd") == ('siti', 'aminah')
+    assert same_person(normalize_name("M. Rizki Pratama"), normalize_name("Muhammad Rizki Pratama"))
+    groups = duplicate_name_groups(["Siti Aminah", "Dra. Siti Aminah", "SITI AMINAH S.Pd", "Siti Rahma"])
+    assert len(groups) == 1 and len(groups[0][1]) == 2
@@ -0,0 +1,32 @@
+import io
+
+from openpyxl import load_workbook
+
+from scheduler.template import LOOKUP_SHEET, MASTER_SHEET, build_template_workbook, template_rows
+from scheduler.upload import read_template_workbook
+
+
+def test_validation_is_range_wide_and_uses_named_lists():
+    data = build_template_workbook(["7B", "7A", "7A"], subjects=["MTK"], validated_rows=50)
+    wb = load_workbook(io.BytesIO(data))
+    assert wb[LOOKUP_SHEET].sheet_state == 'hidden'
+    assert wb.defined_names["DAFTAR_KELAS"].attr_text == "'Daftar'!$A$2:$A$3"
+    assert [c.value for c in wb[LOOKUP_SHEET]["A"]] == ["Kelas", "7A", "7B"]
+    # Satu validasi per kolom (bukan per sel); daftar guru/inisial kosong = kolom bebas
+    rules = {str(dv.sqref): dv for dv in wb[MASTER_SHEET].data_validations.dataValidation}
+    assert set(rules) == {"A2:A51", "B2:B51", "E2:E51", "F2:F51", "G2:G51"}
+    assert rules["A2:A51"].formula1 == "DAFTAR_KELAS" and rules["A2:A51"].errorStyle == 'stop'
+    assert rules["B2:B51"].errorStyle == 'warning'
+    assert (rules["E2:E51"].formula1, rules["E2:E51"].formula2, rules["E2:E51"].allow_blank) == ("1", "40", False)
+
+
+def test_template_round_trip(school):
+    rows = template_rows(school)
+    data = build_template_workbook(school['Class'], rows=rows, validated_rows=10)
+    wb = load_workbook(io.BytesIO(data))
+    # Validasi diperluas sampai baris data terakhir walau lebih dari validated_rows
+    assert {str(dv.sqref) for dv in wb[MASTER_SHEET].data_validations.dataValidation} >= {f"A2:A{len(rows) + 1}"}
+    subjects, rules_text = read_template_workbook(io.BytesIO(data))
+    cols = ['Class', 'Subject Name', 'Subject Code', 'Teacher Name', 'Periods/Week', 'Block Length']
+    assert subjects[cols].reset_index(drop=True).equals(school[cols].reset_index(drop=True))
+    assert rules_text
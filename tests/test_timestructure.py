@@ -0,0 +1,54 @@
+import datetime
+
+import pytest
+
+from scheduler.events import compile_events
+from scheduler.model import DAYS, ScheduleModel, day_structures
+from scheduler.rules import compile_rules
+from scheduler.timestructure import build_time_structure, day_capacity, parse_break_spec
+
+START = datetime.time(7, 0)
+
+
+def _model(time_df):
+    # Senin punya blok pembuka 30 menit sebelum jam ke-1
+    monday = build_time_structure(START, 35, 8, parse_break_spec("0:30, 4:15"))
+    return ScheduleModel(["7A"], day_structures(DAYS, time_df, {'Senin': monday}))
+
+
+def test_opening_break_is_break_zero(time_df):
+    monday = build_time_structure(START, 35, 8, parse_break_spec("0:30, 4:15"))
+    assert list(monday['Period'][:2]) == ['BREAK 0', '1']
+    assert 'BREAK 1' in set(monday['Period'])
+    assert day_capacity(monday) == day_capacity(time_df) == 8
+
+
+def test_break_numbering_same_on_every_day(time_df):
+    model = _model(time_df)
+    by_day = {}
+    for s in range(model.n_slots):
+        if model.slot_jp[s]: by_day.setdefault(model.days[model.slot_day[s]], []).append(int(model.slot_break_no[s]))
+    # JP 1-4 sebelum break 1, JP 5-8 sesudahnya, termasuk hari Senin
+    assert all(nos == [0] * 4 + [1] * 4 for nos in by_day.values())
+
+
+def test_forbid_after_break_rule_consistent(time_df):
+    model = _model(time_df)
+    rules = compile_rules("forbid PJOK after break 1")
+    lid = model.intern("PJOK (PJK1)")
+    allowed = {(model.days[model.slot_day[s]], int(model.slot_jp[s])) for s in range(model.n_slots)
+               if model.slot_jp[s] and rules.allows(model, s, 0, lid)}
+    assert allowed == {(d, jp) for d in DAYS for jp in range(1, 5)}
+
+
+def test_event_targets_opening_break(time_df):
+    model = _model(time_df)
+    compile_events("UPACARA at Senin break0").apply(model)
+    fixed = [model.slot_label[s] for s in range(model.n_slots) if model.fixed[s, 0]]
+    assert fixed == ['BREAK 0']
+
+
+@pytest.mark.parametrize("spec", ["0:30, 0:15, 4:15", "4:15, 4:10"])
+def test_duplicate_break_position_rejected(spec):
+    with pytest.raises(ValueError, match="dua break"):
+        build_time_structure(START, 35, 8, parse_break_spec(spec))